@@ -0,0 +1,196 @@
+# analytics.py
+"""
+Ausentismo por departamento y mes, precalculado.
+
+Las solicitudes APROBADAS se reparten por mes (reports.split_by_month) y se
+acumulan en celdas (departamento, año, mes) -> días y empleados de
+vacaciones. Se arma en una sola pasada la primera vez que se consulta y
+después se mantiene con cada aprobación o desaprobación (el repositorio
+avisa con on_approval_change), así las consultas recorren solo los meses
+pedidos y no todas las solicitudes.
+"""
+from instrumentation import instrumented
+from records import Status
+from reports import read_period, split_by_month
+
+# departamento de las solicitudes cuyo empleado no está cargado
+NO_DEPARTMENT = "(no department)"
+
+
+def iter_periods(first_period, last_period):
+    """
+    Genera los (year, month) entre first_period y last_period, ambos incluidos.
+    """
+    year, month = first_period
+    while (year, month) <= last_period:
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+class AbsenceAggregates:
+    """
+    Días de vacaciones aprobados y cantidad de empleados de vacaciones por
+    (departamento, año, mes), más el total de todos los departamentos.
+    """
+
+    def __init__(self, employees, vacations, holidays=None):
+        self._employees = employees
+        self._vacations = vacations
+        self._holidays = holidays
+        # (departamento en minúsculas o None para el total, year, month)
+        #   -> [días, {employee_id: tramos en el mes}]
+        self._cells = {}
+        self._names = {}
+        self._built = False
+
+    @instrumented(rows=lambda args, result: len(args[0]._cells))
+    def build(self):
+        """
+        Arma las celdas recorriendo una vez las solicitudes aprobadas y se
+        suscribe a los cambios de aprobación del repositorio.
+        """
+        self._cells = {}
+        self._names = {}
+        for vacation in self._vacations.with_status(Status.APPROVED):
+            self.apply(vacation, 1)
+        if not self._built:
+            self._vacations.on_approval_change(self.apply)
+            self._built = True
+
+    def _department(self, employee_id):
+        employee = self._employees.get(employee_id)
+        name = employee.department.strip() if employee else ""
+        name = name or NO_DEPARTMENT
+        key = name.lower()
+        self._names.setdefault(key, name)
+        return key
+
+    def apply(self, vacation, sign):
+        """
+        Suma (sign=1) o resta (sign=-1) una solicitud aprobada.
+        """
+        department = self._department(vacation.employee_id)
+        employee_id = vacation.employee_id
+        for year, month, days in split_by_month(vacation, self._holidays):
+            for key in ((department, year, month), (None, year, month)):
+                cell = self._cells.get(key)
+                if cell is None:
+                    if sign < 0:
+                        continue
+                    cell = self._cells[key] = [0.0, {}]
+                cell[0] += sign * days
+                on_leave = cell[1]
+                count = on_leave.get(employee_id, 0) + sign
+                if count > 0:
+                    on_leave[employee_id] = count
+                else:
+                    on_leave.pop(employee_id, None)
+                if not on_leave:
+                    # sin nadie de vacaciones la celda vuelve a cero exacto
+                    del self._cells[key]
+
+    def _ensure_built(self):
+        if not self._built:
+            self.build()
+
+    def departments(self):
+        self._ensure_built()
+        return sorted(self._names.values(), key=str.lower)
+
+    def monthly(self, first_period, last_period, department=None):
+        """
+        [(year, month, días, empleados de vacaciones), ...] para cada mes
+        del rango (con ceros donde no hubo vacaciones). Sin department es
+        el total de la empresa.
+        """
+        self._ensure_built()
+        key = department.strip().lower() if department else None
+        rows = []
+        for year, month in iter_periods(first_period, last_period):
+            cell = self._cells.get((key, year, month))
+            if cell is None:
+                rows.append((year, month, 0.0, 0))
+            else:
+                rows.append((year, month, round(cell[0], 2), len(cell[1])))
+        return rows
+
+    def by_department(self, first_period, last_period):
+        """
+        [(departamento, días, pico de empleados de vacaciones en un mes), ...]
+        del rango, de mayor a menor cantidad de días.
+        """
+        self._ensure_built()
+        periods = list(iter_periods(first_period, last_period))
+        rows = []
+        for key, name in self._names.items():
+            days = 0.0
+            peak = 0
+            for year, month in periods:
+                cell = self._cells.get((key, year, month))
+                if cell is not None:
+                    days += cell[0]
+                    peak = max(peak, len(cell[1]))
+            if peak:
+                rows.append((name, round(days, 2), peak))
+        rows.sort(key=lambda row: (-row[1], row[0].lower()))
+        return rows
+
+
+def _read_range():
+    first_period = read_period("Enter first month (YYYY-MM): ")
+    if first_period is None:
+        return None
+    last_period = read_period("Enter last month (YYYY-MM): ")
+    if last_period is None:
+        return None
+    if last_period < first_period:
+        print("Last month cannot be before first month.")
+        return None
+    return first_period, last_period
+
+
+def view_absence_trend(aggregates):
+    """
+    Días de vacaciones y empleados de vacaciones por mes, de un
+    departamento o de toda la empresa.
+    """
+    period_range = _read_range()
+    if period_range is None:
+        return
+    department = input("Department (Enter for all): ").strip()
+    if department:
+        names = {name.lower(): name for name in aggregates.departments()}
+        if department.lower() not in names:
+            print("No approved vacations found for that department.")
+            return
+        department = names[department.lower()]
+
+    rows = aggregates.monthly(*period_range, department=department or None)
+    print(f"\nAbsence trend - {department or 'all departments'}")
+    print(f"{'Month':<8} {'Days off':>10} {'On leave':>9}")
+    print("-" * 29)
+    for year, month, days, on_leave in rows:
+        print(f"{year}-{month:02} {days:>10} {on_leave:>9}")
+    print("-" * 29)
+    total = round(sum(row[2] for row in rows), 2)
+    print(f"{'Total':<8} {total:>10} {max(row[3] for row in rows):>9} (peak)")
+
+
+def view_absence_by_department(aggregates):
+    """
+    Días de vacaciones por departamento en un rango de meses.
+    """
+    period_range = _read_range()
+    if period_range is None:
+        return
+
+    rows = aggregates.by_department(*period_range)
+    if not rows:
+        print("No approved vacations found for that period.")
+        return
+    months = len(list(iter_periods(*period_range)))
+    print(f"\n{'Department':<25} {'Days off':>10} {'Per month':>10} {'Peak on leave':>14}")
+    print("-" * 62)
+    for department, days, peak in rows:
+        print(f"{department:<25} {days:>10} {round(days / months, 2):>10} {peak:>14}")
+    print("-" * 62)
@@ -0,0 +1,158 @@
+# auth.py
+"""
+Usuarios y contraseñas con hash (PBKDF2-HMAC-SHA256 de hashlib).
+
+La columna password de users.csv guarda:
+    pbkdf2_sha256$<iteraciones>$<salt base64>$<hash base64>
+
+Migración única desde contraseñas en texto plano (las que ya tienen hash
+se dejan igual):
+    python auth.py migrate [--users users.csv] [--iterations 600000]
+"""
+import argparse
+import base64
+import hashlib
+import hmac
+import os
+
+from utils import USER_CSV_HEADER, atomic_write_csv, load_users
+
+HASH_SCHEME = "pbkdf2_sha256"
+# costo del hash: subirlo hace cada login (sin caché) más lento y un
+# ataque de diccionario proporcionalmente más caro
+PBKDF2_ITERATIONS = 600_000
+SALT_BYTES = 16
+
+
+def _b64encode(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def hash_password(password, iterations=PBKDF2_ITERATIONS, salt=None):
+    """
+    Retorna el texto a guardar en la columna password.
+    """
+    if salt is None:
+        salt = os.urandom(SALT_BYTES)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    return f"{HASH_SCHEME}${iterations}${_b64encode(salt)}${_b64encode(digest)}"
+
+
+def is_hashed(stored):
+    return stored.startswith(HASH_SCHEME + "$")
+
+
+def verify_password(password, stored):
+    """
+    Compara la contraseña con el valor guardado (hash o, si el archivo aún
+    no se migró, texto plano) en tiempo constante.
+    """
+    if not is_hashed(stored):
+        return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+    try:
+        _, iterations, salt, expected = stored.split("$")
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"),
+                                     base64.b64decode(salt), int(iterations))
+        return hmac.compare_digest(digest, base64.b64decode(expected))
+    except ValueError:
+        # hash mal formado en el CSV
+        return False
+
+
+class UserStore:
+    """
+    Usuarios indexados por username (se construye una vez al cargar).
+
+    Las verificaciones correctas quedan en caché durante el proceso como
+    un HMAC de la contraseña con una llave aleatoria del proceso (nunca la
+    contraseña misma), así que repetir el login no vuelve a pagar PBKDF2.
+    """
+
+    def __init__(self, users=None):
+        self._by_username = {}
+        self._cache_key = os.urandom(32)
+        self._verified = {}
+        self.plaintext_count = 0
+        for user in users or []:
+            # si el CSV trae usernames repetidos, gana el primero
+            if user['username'] not in self._by_username:
+                self._by_username[user['username']] = user
+                if not is_hashed(user['password']):
+                    self.plaintext_count += 1
+
+    def __contains__(self, username):
+        return username in self._by_username
+
+    def __len__(self):
+        return len(self._by_username)
+
+    def __iter__(self):
+        return iter(self._by_username.values())
+
+    def get(self, username):
+        return self._by_username.get(username)
+
+    def _cache_token(self, password):
+        return hmac.new(self._cache_key, password.encode("utf-8"), hashlib.sha256).digest()
+
+    def verify(self, username, password):
+        """
+        Retorna el usuario si la contraseña es correcta, si no None.
+        """
+        user = self._by_username.get(username)
+        if user is None:
+            return None
+
+        stored = user['password']
+        token = self._cache_token(password)
+        cached = self._verified.get(username)
+        if cached is not None and cached[0] == stored and hmac.compare_digest(cached[1], token):
+            return user
+
+        if not verify_password(password, stored):
+            return None
+        self._verified[username] = (stored, token)
+        return user
+
+
+def migrate_users_file(path, iterations=PBKDF2_ITERATIONS):
+    """
+    Reemplaza las contraseñas en texto plano de users.csv por su hash
+    (escritura atómica). Retorna cuántas se migraron o None si falla.
+    """
+    users = load_users(path)
+    migrated = 0
+    for user in users:
+        if not is_hashed(user['password']):
+            user['password'] = hash_password(user['password'], iterations)
+            migrated += 1
+
+    if migrated == 0:
+        print("All passwords are already hashed.")
+        return 0
+
+    try:
+        atomic_write_csv(path, USER_CSV_HEADER, users)
+    except Exception as e:
+        print(f"Error while saving users: {e}")
+        return None
+    print(f"Passwords hashed: {migrated} ({iterations} PBKDF2 iterations)")
+    return migrated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Password hashing for users.csv.")
+    parser.add_argument("command", choices=["migrate"],
+                        help="hash every plaintext password in the users file")
+    parser.add_argument("--users", default="users.csv", help="users CSV file")
+    parser.add_argument("--iterations", type=int, default=PBKDF2_ITERATIONS,
+                        help="PBKDF2 iterations")
+    args = parser.parse_args()
+
+    if args.iterations < 1:
+        parser.error("--iterations must be at least 1")
+    migrate_users_file(args.users, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
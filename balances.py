@@ -0,0 +1,82 @@
+# balances.py
+from array import array
+from datetime import datetime
+
+from pagination import PAGE_SIZE, paginate
+from vacations import DAYS_PER_MONTH, MIN_MONTHS_FOR_VACATION, full_months_between
+
+
+def compute_balances(employees, vacations, today=None):
+    """
+    Calcula el saldo de todos los empleados en una sola pasada por los
+    empleados. Devuelve columnas paralelas (una posición por empleado):
+    employee_id, months, accrued, used, available y eligible.
+
+    - used: días APROBADOS según el libro del repositorio
+      (vacations.used_days), sin recorrer las solicitudes
+    - months: meses completos desde hire_date (full_months_between); 0 si
+      la fecha es inválida o futura
+    - eligible: 1 si months >= MIN_MONTHS_FOR_VACATION
+    """
+    if today is None:
+        today = datetime.today().date()
+
+    employee_ids = []
+    months = array('i')
+    used = array('d')
+    for e in employees:
+        employee_ids.append(e.employee_id)
+        months.append(full_months_between(e.hire_date, today) if e.hire_date is not None else 0)
+        used.append(vacations.used_days(e.employee_id))
+
+    accrued = array('d', [m * DAYS_PER_MONTH for m in months])
+    available = array('d', [max(a - u, 0) for a, u in zip(accrued, used)])
+    eligible = bytearray(m >= MIN_MONTHS_FOR_VACATION for m in months)
+
+    return {
+        'employee_id': employee_ids,
+        'months': months,
+        'accrued': accrued,
+        'used': used,
+        'available': available,
+        'eligible': eligible,
+    }
+
+
+def iter_balance_rows(employees, balances):
+    """
+    Une los empleados con las columnas de compute_balances, fila a fila.
+    """
+    for idx, e in enumerate(employees):
+        yield {
+            'employee_id': e.employee_id,
+            'full_name': e.full_name,
+            'department': e.department,
+            'hire_date': e.hire_date_text,
+            'months_worked': balances['months'][idx],
+            'accrued_days': balances['accrued'][idx],
+            'used_days': balances['used'][idx],
+            'available_days': balances['available'][idx],
+            'eligible': "YES" if balances['eligible'][idx] else "NO",
+        }
+
+
+def view_all_balances(employees, vacations, page_size=PAGE_SIZE):
+    """
+    Muestra el saldo de vacaciones de todos los empleados en una tabla
+    paginada (las filas se formatean a medida que se muestran).
+    """
+    if not employees:
+        print("\nNo hay empleados registrados.\n")
+        return
+
+    balances = compute_balances(employees, vacations)
+    lines = (
+        f"{row['employee_id']:<10} {row['full_name']:<25} {row['department']:<15} "
+        f"{row['months_worked']:>6} {row['accrued_days']:>8.2f} {row['used_days']:>8.2f} "
+        f"{row['available_days']:>8.2f} {row['eligible']:>9}"
+        for row in iter_balance_rows(employees, balances)
+    )
+    header = (f"{'ID':<10} {'Nombre completo':<25} {'Área':<15} {'Meses':>6} "
+              f"{'Acum.':>8} {'Usados':>8} {'Disp.':>8} {'Elegible':>9}")
+    paginate(lines, "Vacation balances", header, 100, page_size)
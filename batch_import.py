@@ -0,0 +1,350 @@
+# batch_import.py
+"""
+Importación no interactiva de solicitudes de vacaciones desde un JSONL,
+una solicitud por línea:
+
+    {"employee_id": "123", "start_date": "2026-03-02", "end_date": "2026-03-06"}
+
+Cada solicitud se valida con las mismas reglas que la opción 4 del menú
+(antigüedad, días sin domingos ni festivos, saldo, cruces con otras
+solicitudes del empleado). El saldo y los cruces son acumulativos dentro
+del lote: lo aceptado en líneas anteriores cuenta para las siguientes.
+Las aceptadas quedan en PENDING; si el departamento supera
+MAX_CONCURRENT_ABSENCES se acepta igual con un aviso en el resultado.
+
+    python batch_import.py solicitudes.jsonl [--results batch_results.csv]
+"""
+import argparse
+import csv
+import json
+import time
+from datetime import datetime
+
+from concurrency import transaction
+from intervals import IntervalIndex
+from records import DATE_FORMAT, Status, VacationRequest, parse_date
+from storage import STORAGE_BACKENDS, open_storage
+from vacations import (
+    MAX_CONCURRENT_ABSENCES,
+    MIN_MONTHS_FOR_VACATION,
+    calculate_accrued_days,
+    department_peak_absences,
+    load_holidays,
+    validate_vacation_dates,
+)
+
+BATCH_CHUNK_SIZE = 1000
+BATCH_RESULT_HEADER = [
+    'line',
+    'employee_id',
+    'start_date',
+    'end_date',
+    'days_requested',
+    'result',
+    'reason',
+]
+
+
+def iter_request_chunks(path, chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Lee el JSONL de forma perezosa y entrega listas de
+    (número de línea, texto) de a chunk_size líneas no vacías.
+    """
+    chunk = []
+    with open(path, "r", encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            chunk.append((line_number, line))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def parse_request(line):
+    """
+    Convierte una línea del JSONL en (employee_id, start_date, end_date).
+    Lanza ValueError con el motivo si la línea no es válida.
+    """
+    try:
+        data = json.loads(line)
+    except ValueError:
+        raise ValueError("Invalid JSON.")
+    if not isinstance(data, dict):
+        raise ValueError("Each line must be a JSON object.")
+
+    fields = []
+    for name in ('employee_id', 'start_date', 'end_date'):
+        value = data.get(name)
+        if value is None or str(value).strip() == "":
+            raise ValueError(f"Missing field: {name}.")
+        fields.append(str(value).strip())
+
+    employee_id, start_str, end_str = fields
+    try:
+        start_date = parse_date(start_str)
+        end_date = parse_date(end_str)
+    except ValueError:
+        raise ValueError("Invalid date format. Please use YYYY-MM-DD.")
+    return employee_id, start_date, end_date
+
+
+class BatchValidator:
+    """
+    Valida solicitudes en orden llevando el saldo restante de cada
+    empleado (saldo del repositorio menos lo aceptado en el lote) y los
+    intervalos aceptados que aún no están en el repositorio.
+    """
+
+    def __init__(self, employees, vacations, holidays, today=None):
+        self.employees = employees
+        self.vacations = vacations
+        self.holidays = holidays
+        self.today = today or datetime.today().date()
+        self.remaining = {}
+        self.seen_keys = set()
+        self.accepted_by_employee = {}
+        self.accepted_by_department = {}
+
+    def chunk_saved(self):
+        """
+        Llamar después de guardar las aceptadas del bloque en el
+        repositorio: desde ahí sus intervalos salen de los índices.
+        """
+        self.seen_keys.clear()
+        self.accepted_by_employee.clear()
+        self.accepted_by_department.clear()
+
+    def chunk_discarded(self):
+        """
+        Llamar si las aceptadas del bloque no se pudieron guardar: se
+        olvidan junto con los saldos, que se recalculan del repositorio.
+        """
+        self.chunk_saved()
+        self.remaining.clear()
+
+    def _remaining_balance(self, employee):
+        if employee.employee_id in self.remaining:
+            return self.remaining[employee.employee_id]
+        available, months, _, _ = calculate_accrued_days(employee, self.today, self.vacations)
+        if months < MIN_MONTHS_FOR_VACATION:
+            # se recuerda como no elegible (None) para no recalcular
+            available = None
+        self.remaining[employee.employee_id] = available
+        return available
+
+    def check(self, employee_id, start_date, end_date):
+        """
+        Retorna (VacationRequest, días, aviso o None) si se acepta y
+        (None, días, motivo) si se rechaza.
+        """
+        employee = self.employees.get(employee_id)
+        if employee is None:
+            return None, 0, "Employee not found."
+
+        available = self._remaining_balance(employee)
+        if available is None:
+            return None, 0, "Less than 6 full months of work."
+
+        days_requested, error = validate_vacation_dates(start_date, end_date, available,
+                                                        self.holidays)
+        if error is not None:
+            return None, days_requested, error
+
+        key = (employee_id, start_date, end_date)
+        existing = self.vacations.get(key)
+        if key in self.seen_keys or (existing is not None
+                                     and existing.status is not Status.REJECTED):
+            return None, days_requested, "Duplicate request."
+
+        batch_intervals = self.accepted_by_employee.setdefault(employee_id, [])
+        if (self.vacations.overlapping(employee_id, start_date, end_date)
+                or any(start_date <= end and start <= end_date for start, end in batch_intervals)):
+            return None, days_requested, "Overlaps another request of the employee."
+
+        department = employee.department.strip().lower()
+        department_batch = self.accepted_by_department.get(department)
+        if department_batch is None:
+            department_batch = self.accepted_by_department[department] = IntervalIndex()
+        extra = [(start, end) for start, end, other_id
+                 in department_batch.overlapping(start_date, end_date)
+                 if other_id != employee_id]
+        absences = department_peak_absences(employee, self.vacations, start_date, end_date, extra)
+        warning = None
+        if absences > MAX_CONCURRENT_ABSENCES:
+            warning = (f"Warning: {absences} employees from {employee.department} "
+                       f"away at the same time (limit: {MAX_CONCURRENT_ABSENCES}).")
+
+        self.seen_keys.add(key)
+        self.remaining[employee_id] = available - days_requested
+        batch_intervals.append((start_date, end_date))
+        department_batch.add(start_date, end_date, (start_date, end_date, employee_id))
+        record = VacationRequest(
+            employee.employee_id,
+            employee.full_name,
+            start_date,
+            end_date,
+            float(days_requested),
+            Status.PENDING,
+        )
+        return record, days_requested, warning
+
+
+def import_requests(input_path, results_path, employees, vacations, journal=None,
+                    holidays=None, chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Procesa el JSONL por bloques: valida cada bloque, guarda las
+    solicitudes aceptadas de una vez (primero el journal, después el
+    repositorio) y escribe el resultado de cada línea en results_path. Si
+    el bloque no se pudo guardar sus aceptadas quedan como FAILED.
+    Retorna (aceptadas, rechazadas, fallidas) o None si no se pudo leer
+    la entrada.
+    """
+    validator = BatchValidator(employees, vacations, holidays)
+    accepted_total = 0
+    rejected_total = 0
+    failed_total = 0
+
+    try:
+        # con journal, todo el lote se valida y escribe con el bloqueo
+        # tomado: otro operador espera en vez de intercalar cambios que el
+        # validador no vio
+        with open(results_path, "w", newline="", encoding="utf-8") as results_file, \
+                transaction(journal):
+            writer = csv.writer(results_file)
+            writer.writerow(BATCH_RESULT_HEADER)
+
+            for chunk in iter_request_chunks(input_path, chunk_size):
+                accepted = []
+                result_rows = []
+                for line_number, line in chunk:
+                    try:
+                        employee_id, start_date, end_date = parse_request(line)
+                    except ValueError as e:
+                        result_rows.append([line_number, "", "", "", "", "REJECTED", str(e)])
+                        continue
+
+                    record, days_requested, reason = validator.check(employee_id, start_date,
+                                                                     end_date)
+                    row = [line_number, employee_id, start_date.strftime(DATE_FORMAT),
+                           end_date.strftime(DATE_FORMAT), days_requested]
+                    if record is None:
+                        result_rows.append(row + ["REJECTED", reason])
+                    else:
+                        row += ["ACCEPTED", reason or ""]
+                        accepted.append((record, row))
+                        result_rows.append(row)
+
+                saved = _save_chunk([record for record, _ in accepted], vacations, journal)
+                if saved is None:
+                    validator.chunk_discarded()
+                    for _, row in accepted:
+                        row[5:] = ["FAILED", "Could not save the request."]
+                    failed_total += len(accepted)
+                    saved = []
+                else:
+                    validator.chunk_saved()
+                    if len(saved) < len(accepted):
+                        # la base ya tenía una solicitud activa con esa llave
+                        # (la guardó otro proceso después de validar)
+                        saved_ids = {id(record) for record in saved}
+                        for record, row in accepted:
+                            if id(record) not in saved_ids:
+                                row[5:] = ["REJECTED", "Duplicate request."]
+                    rejected_total += len(accepted) - len(saved)
+                writer.writerows(result_rows)
+                accepted_total += len(saved)
+                rejected_total += len(result_rows) - len(accepted)
+
+    except FileNotFoundError:
+        print(f"The requests file was not found: {input_path}")
+        return None
+    except UnicodeDecodeError:
+        print("Encoding error. Make sure the requests file is valid UTF-8 JSONL.")
+        return None
+
+    return accepted_total, rejected_total, failed_total
+
+
+def _save_chunk(records, vacations, journal):
+    """
+    Guarda las aceptadas de un bloque: con journal, primero las entradas
+    (si no se pueden escribir no se toca el repositorio). Retorna las
+    guardadas o None si no se guardó nada.
+    """
+    if not records:
+        return []
+    if journal is not None and not journal.append_many(
+            "add_vacation", ({'record': v.to_row()} for v in records)):
+        return None
+    try:
+        return vacations.add_many(records)
+    except Exception as e:
+        # SQLite: la transacción del bloque se deshace entera
+        print(f"Error while saving requests: {e}")
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Import vacation requests from a JSONL file without the interactive menu."
+    )
+    parser.add_argument("input", help="JSONL file with one request per line")
+    parser.add_argument("--results", default="batch_results.csv",
+                        help="CSV file with the result of each line")
+    parser.add_argument("--chunk-size", type=int, default=BATCH_CHUNK_SIZE,
+                        help="requests validated and saved together")
+    parser.add_argument("--backend", choices=STORAGE_BACKENDS, default="csv")
+    parser.add_argument("--db", default="vacations.db", help="SQLite database file")
+    parser.add_argument("--users", default="users.csv")
+    parser.add_argument("--employees", default="employees.csv")
+    parser.add_argument("--vacations", default="vacations.csv")
+    parser.add_argument("--holidays", default="holidays.csv")
+    parser.add_argument("--journal", default="journal.jsonl")
+    parser.add_argument("--snapshot", default="data.snapshot")
+    args = parser.parse_args()
+
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    storage = open_storage(
+        args.backend,
+        args.users,
+        args.employees,
+        args.vacations,
+        args.db,
+        journal_path=args.journal,
+        snapshot_path=args.snapshot,
+    )
+    try:
+        _, employees, vacations = storage.load()
+        holidays = load_holidays(args.holidays)
+
+        started = time.perf_counter()
+        counts = import_requests(args.input, args.results, employees, vacations,
+                                 storage.journal, holidays, args.chunk_size)
+        elapsed = time.perf_counter() - started
+        if counts is None:
+            return
+
+        accepted, rejected, failed = counts
+        total = accepted + rejected + failed
+        rate = total / elapsed if elapsed > 0 else 0.0
+        print("\nBatch import summary")
+        print(f"Requests processed: {total}")
+        print(f"Accepted (PENDING): {accepted}")
+        print(f"Rejected: {rejected}")
+        if failed:
+            print(f"Failed (not saved): {failed}")
+        print(f"Elapsed: {elapsed:.3f} s ({rate:,.0f} requests/second)")
+        print(f"Results written to: {args.results}")
+        if accepted:
+            storage.vacations_changed()
+    finally:
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# benchmarks/bench_loaders.py
+"""
+Compara los loaders fila a fila con los de fastload.py: la carga
+completa a registros y el parseo solo a columnas (load_columns).
+Los CSV salen del generador de benchmarks/synthetic.py.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_loaders [filas]
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import write_employees, write_users, write_vacations
+from employees import EMPLOYEE_CSV_HEADER, load_data_employees
+from fastload import (
+    load_columns,
+    load_data_employees_fast,
+    load_users_fast,
+    load_vacations_fast,
+)
+from utils import USER_CSV_HEADER, load_users
+from vacations import VACATION_CSV_HEADER, load_vacations
+
+DEFAULT_ROWS = 1_000_000
+
+
+def timed(loader, path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        records = loader(path)
+        elapsed = time.perf_counter() - start
+    return elapsed, len(records)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    rng = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {name: os.path.join(tmp, f"{name}.csv")
+                 for name in ("employees", "vacations", "users")}
+        employees = write_employees(paths["employees"], rows, rng)
+        write_vacations(paths["vacations"], rows, employees, rng=rng)
+        write_users(paths["users"], rows, rng)
+
+        cases = [
+            ("employees", EMPLOYEE_CSV_HEADER, load_data_employees, load_data_employees_fast),
+            ("vacations", VACATION_CSV_HEADER, load_vacations, load_vacations_fast),
+            ("users", USER_CSV_HEADER, load_users, load_users_fast),
+        ]
+        print(f"{'file':<10} {'rows':>10} {'csv.reader (s)':>15} {'fastload (s)':>13} "
+              f"{'speedup':>8} {'columns (s)':>12} {'speedup':>8}")
+        for name, header, loader, fast_loader in cases:
+            path = paths[name]
+            slow, slow_count = timed(loader, path)
+            fast, fast_count = timed(fast_loader, path)
+            columns, columns_count = timed(
+                lambda p: load_columns(p, header, name)[0][0], path)
+            if not slow_count == fast_count == columns_count:
+                print(f"Row count mismatch on {name}: "
+                      f"{slow_count} vs {fast_count} vs {columns_count}")
+            print(f"{name:<10} {fast_count:>10} {slow:>15.3f} {fast:>13.3f} "
+                  f"{slow / fast:>7.2f}x {columns:>12.3f} {slow / columns:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+# benchmarks/load_test.py
+"""
+Prueba de carga del servicio HTTP (service.py).
+
+Sin --url genera datos sintéticos en un directorio temporal, levanta el
+servicio en un subproceso y lo ataca con N conexiones keep-alive en
+paralelo. La mezcla de operaciones es mayormente lectura (búsqueda por ID,
+saldo, historial, listado de pendientes) con una fracción de escrituras
+(nuevas solicitudes y decisiones). Mide peticiones por segundo y las
+latencias p50/p95/p99 por operación, y guarda un JSON con el commit.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.load_test [--rows 100k] [--connections 50] [--requests 20000]
+    python -m benchmarks.load_test --url http://127.0.0.1:8080 --user admin --password ...
+"""
+import argparse
+import asyncio
+import base64
+import csv
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from benchmarks.suite import git_commit, quiet
+from benchmarks.synthetic import REFERENCE_DATE, generate_dataset, rows_for
+
+DEFAULT_ROWS = "100k"
+DEFAULT_CONNECTIONS = 50
+DEFAULT_REQUESTS = 20000
+DEFAULT_WRITE_RATIO = 0.05
+DEFAULT_OUTPUT = "load_results.json"
+SERVER_START_TIMEOUT = 120
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Client:
+    """
+    Conexión HTTP/1.1 keep-alive mínima (una petición a la vez).
+    """
+
+    def __init__(self, host, port, authorization):
+        self.host = host
+        self.port = port
+        self.authorization = authorization
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method, path, payload=None):
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        head = (f"{method} {path} HTTP/1.1\r\n"
+                f"Host: {self.host}\r\n"
+                f"Authorization: {self.authorization}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n")
+        self.writer.write(head.encode("latin-1") + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by the server")
+        status = int(status_line.split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        await self.reader.readexactly(length)
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class Workload:
+    """
+    Genera la siguiente operación: (nombre, método, ruta, cuerpo).
+    """
+
+    def __init__(self, employee_ids, pending, write_ratio, seed=7):
+        self.rng = random.Random(seed)
+        self.employee_ids = employee_ids
+        self.pending = pending
+        self.write_ratio = write_ratio
+        self.next_day = 0
+
+    def next(self):
+        rng = self.rng
+        if rng.random() < self.write_ratio:
+            if self.pending and rng.random() < 0.5:
+                employee_id, start, end = self.pending.pop()
+                return ("decide", "POST", "/requests/decision",
+                        {'employee_id': employee_id, 'start_date': start, 'end_date': end,
+                         'decision': rng.choice(["APPROVED", "REJECTED"])})
+            # fechas lejanas y distintas para no chocar con los datos generados
+            start = REFERENCE_DATE + timedelta(days=3 * 365 + self.next_day)
+            self.next_day += 3
+            return ("create", "POST", "/requests",
+                    {'employee_id': rng.choice(self.employee_ids),
+                     'start_date': start.isoformat(), 'end_date': start.isoformat()})
+
+        employee_id = rng.choice(self.employee_ids)
+        choice = rng.random()
+        if choice < 0.4:
+            return "employee", "GET", f"/employees/{employee_id}", None
+        if choice < 0.7:
+            return "balance", "GET", f"/employees/{employee_id}/balance", None
+        if choice < 0.9:
+            return "history", "GET", f"/employees/{employee_id}/requests", None
+        return "pending", "GET", "/requests?status=PENDING&limit=20", None
+
+
+async def run_load(host, port, authorization, workload, connections, total):
+    latencies = {}
+    errors = {}
+    remaining = [total]
+
+    async def worker():
+        client = Client(host, port, authorization)
+        await client.connect()
+        try:
+            while remaining[0] > 0:
+                remaining[0] -= 1
+                name, method, path, payload = workload.next()
+                start = time.perf_counter()
+                status = await client.request(method, path, payload)
+                latencies.setdefault(name, []).append(time.perf_counter() - start)
+                if status >= 500 or status in (400, 401, 404, 405):
+                    errors[name] = errors.get(name, 0) + 1
+        finally:
+            client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+    return elapsed, latencies, errors
+
+
+def summarize(elapsed, latencies, errors):
+    all_latencies = sorted(value for values in latencies.values() for value in values)
+    count = len(all_latencies)
+
+    def stats(values):
+        values = sorted(values)
+        return {
+            'requests': len(values),
+            'p50_ms': round(percentile(values, 0.50) * 1000, 3),
+            'p95_ms': round(percentile(values, 0.95) * 1000, 3),
+            'p99_ms': round(percentile(values, 0.99) * 1000, 3),
+        }
+
+    summary = stats(all_latencies) if count else {'requests': 0}
+    summary.update({
+        'elapsed_s': round(elapsed, 3),
+        'requests_per_s': round(count / elapsed, 1) if elapsed > 0 else None,
+        'errors': sum(errors.values()),
+        'operations': {name: dict(stats(values), errors=errors.get(name, 0))
+                       for name, values in sorted(latencies.items())},
+    })
+    return summary
+
+
+def print_summary(summary):
+    print(f"\nRequests: {summary['requests']} in {summary['elapsed_s']} s "
+          f"({summary['requests_per_s']} req/s), errors: {summary['errors']}")
+    print(f"{'operation':<10} {'requests':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    print("-" * 50)
+    for name, op in summary['operations'].items():
+        print(f"{name:<10} {op['requests']:>9} {op['p50_ms']:>9} {op['p95_ms']:>9} {op['p99_ms']:>9}")
+    print("-" * 50)
+    print(f"{'all':<10} {summary['requests']:>9} {summary.get('p50_ms', '-'):>9} "
+          f"{summary.get('p95_ms', '-'):>9} {summary.get('p99_ms', '-'):>9}")
+
+
+def read_test_data(paths, limit=5000):
+    """
+    IDs de empleados y solicitudes PENDING para armar las peticiones, y el
+    primer usuario admin para autenticarse.
+    """
+    with open(paths["employees"], encoding="utf-8") as file:
+        employee_ids = [row['employee_id'] for row in csv.DictReader(file)]
+    pending = []
+    with open(paths["vacations"], encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            if row['approval_status'] == "PENDING" and len(pending) < limit:
+                pending.append((row['employee_id'], row['vacations_start_date'],
+                                row['vacations_end_date']))
+    with open(paths["users"], encoding="utf-8") as file:
+        admin = next(row for row in csv.DictReader(file) if row['role'] == "admin")
+    return employee_ids, pending, (admin['username'], admin['password'])
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, process, timeout=SERVER_START_TIMEOUT):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("the service exited during startup")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("the service did not start in time")
+
+
+def start_service(directory, paths, port):
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    command = [
+        sys.executable, os.path.join(repo_root, "service.py"),
+        "--port", str(port),
+        "--users", paths["users"],
+        "--employees", paths["employees"],
+        "--vacations", paths["vacations"],
+        "--holidays", paths["holidays"],
+        "--journal", os.path.join(directory, "journal.jsonl"),
+        "--snapshot", os.path.join(directory, "data.snapshot"),
+    ]
+    process = subprocess.Popen(command, cwd=directory, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port, process)
+    except RuntimeError:
+        process.kill()
+        raise
+    return process
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for the HTTP service.")
+    parser.add_argument("--rows", default=DEFAULT_ROWS,
+                        help="synthetic vacation rows: 1k, 100k, 1m or a number")
+    parser.add_argument("--connections", type=int, default=DEFAULT_CONNECTIONS)
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument("--write-ratio", type=float, default=DEFAULT_WRITE_RATIO,
+                        help="fraction of requests that create or decide a request")
+    parser.add_argument("--url", help="test a running service instead of starting one")
+    parser.add_argument("--user", help="admin username (with --url)")
+    parser.add_argument("--password", help="admin password (with --url)")
+    parser.add_argument("--data", help="directory with the CSV files used by --url "
+                        "(employee IDs and pending requests)", default=".")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON results file")
+    args = parser.parse_args()
+
+    if args.connections < 1 or args.requests < 1:
+        parser.error("--connections and --requests must be at least 1")
+    if not 0 <= args.write_ratio <= 1:
+        parser.error("--write-ratio must be between 0 and 1")
+    if args.url and not (args.user and args.password):
+        parser.error("--url needs --user and --password")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        process = None
+        if args.url:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port or 80
+            paths = {name: os.path.join(args.data, f"{name}.csv")
+                     for name in ("employees", "vacations", "users")}
+            employee_ids, pending, _ = read_test_data(paths)
+            credentials = (args.user, args.password)
+            rows = None
+        else:
+            rows = rows_for(args.rows)
+            print(f"Generating {rows} synthetic rows...")
+            with quiet():
+                paths = generate_dataset(tmp, rows)
+            employee_ids, pending, credentials = read_test_data(paths)
+            host, port = "127.0.0.1", free_port()
+            print("Starting the service...")
+            process = start_service(tmp, paths, port)
+
+        token = base64.b64encode(":".join(credentials).encode("utf-8")).decode("ascii")
+        workload = Workload(employee_ids, pending, args.write_ratio)
+        try:
+            elapsed, latencies, errors = asyncio.run(
+                run_load(host, port, f"Basic {token}", workload, args.connections, args.requests))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    summary = summarize(elapsed, latencies, errors)
+    print_summary(summary)
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': sys.platform,
+        'rows': rows,
+        'connections': args.connections,
+        'write_ratio': args.write_ratio,
+        'results': summary,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+        file.write("\n")
+    print(f"Results written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+# benchmarks/suite.py
+"""
+Suite de tiempos sobre datos sintéticos (benchmarks/synthetic.py).
+
+Por cada tamaño genera los CSV en un directorio temporal y mide cada
+caso varias veces; guarda un JSON con el commit, la versión de Python y
+el mejor tiempo / promedio de cada caso, para comparar entre commits.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.suite [--sizes 1k,100k,1m] [--repeat 3] [--output bench_results.json]
+    python -m benchmarks.suite --only load_vacations,save_vacations
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import REFERENCE_DATE, generate_dataset, rows_for
+from employees import load_data_employees, save_data_employees
+from fastload import load_data_employees_fast, load_vacations_fast
+from reports import export_approved_reports
+from repository import EmployeeRepository, VacationRepository
+from search import EmployeeSearchIndex
+from vacations import (
+    calculate_accrued_days,
+    count_days_excluding_sundays,
+    load_holidays,
+    load_vacations,
+    save_vacations,
+)
+
+DEFAULT_SIZES = "1k,100k"
+DEFAULT_REPEAT = 3
+DEFAULT_OUTPUT = "bench_results.json"
+
+
+@contextlib.contextmanager
+def quiet():
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+@contextlib.contextmanager
+def working_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Dataset:
+    """
+    Archivos generados y datos cargados una vez, compartidos por los casos
+    que no miden la carga.
+    """
+
+    def __init__(self, directory, rows):
+        with quiet():
+            self.paths = generate_dataset(directory, rows)
+            self.employees = EmployeeRepository(load_data_employees_fast(self.paths["employees"]))
+            self.vacations = VacationRepository(load_vacations_fast(self.paths["vacations"]),
+                                                self.employees)
+            self.holidays = load_holidays(self.paths["holidays"])
+        self.search_index = EmployeeSearchIndex(self.employees)
+        self.directory = directory
+        self.output_directory = os.path.join(directory, "out")
+        os.makedirs(self.output_directory, exist_ok=True)
+
+
+# cada caso: (nombre, función(dataset) -> filas procesadas)
+
+def bench_load_data_employees(data):
+    return len(load_data_employees(data.paths["employees"]))
+
+
+def bench_load_data_employees_fast(data):
+    return len(load_data_employees_fast(data.paths["employees"]))
+
+
+def bench_load_vacations(data):
+    return len(load_vacations(data.paths["vacations"]))
+
+
+def bench_load_vacations_fast(data):
+    return len(load_vacations_fast(data.paths["vacations"]))
+
+
+def bench_calculate_accrued_days(data):
+    count = 0
+    for employee in data.employees:
+        calculate_accrued_days(employee, REFERENCE_DATE, data.vacations)
+        count += 1
+    return count
+
+
+def bench_count_days_excluding_sundays(data):
+    count = 0
+    for v in data.vacations:
+        count_days_excluding_sundays(v.start_date, v.end_date, data.holidays)
+        count += 1
+    return count
+
+
+def bench_export_approved_report(data):
+    # el año completo de la fecha de referencia: 12 archivos mensuales
+    year = REFERENCE_DATE.year - 1
+    with working_directory(data.output_directory):
+        counts = export_approved_reports(data.vacations, data.employees,
+                                         (year, 1), (year, 12), data.holidays)
+    return sum(counts.values())
+
+
+def bench_save_data_employees(data):
+    save_data_employees(os.path.join(data.output_directory, "employees.csv"), data.employees)
+    return len(data.employees)
+
+
+def bench_save_vacations(data):
+    save_vacations(os.path.join(data.output_directory, "vacations.csv"), data.vacations)
+    return len(data.vacations)
+
+
+# prefijos, palabras completas y con errores de tipeo
+SEARCH_QUERIES = ["ma", "mateo", "garcia sales", "rodrigez", "recruter", "cust serv",
+                  "sebastian flor", "matoe garcai"]
+
+
+def bench_build_search_index(data):
+    return len(EmployeeSearchIndex(data.employees))
+
+
+def bench_search_employees(data):
+    for _ in range(10):
+        for query in SEARCH_QUERIES:
+            data.search_index.search(query)
+    return 10 * len(SEARCH_QUERIES)
+
+
+BENCHMARKS = [
+    ("load_data_employees", bench_load_data_employees),
+    ("load_data_employees_fast", bench_load_data_employees_fast),
+    ("load_vacations", bench_load_vacations),
+    ("load_vacations_fast", bench_load_vacations_fast),
+    ("calculate_accrued_days", bench_calculate_accrued_days),
+    ("count_days_excluding_sundays", bench_count_days_excluding_sundays),
+    ("export_approved_report", bench_export_approved_report),
+    ("save_data_employees", bench_save_data_employees),
+    ("save_vacations", bench_save_vacations),
+    ("build_search_index", bench_build_search_index),
+    ("search_employees", bench_search_employees),
+]
+
+
+def run_benchmark(function, data, repeat):
+    runs = []
+    items = 0
+    for _ in range(repeat):
+        with quiet():
+            start = time.perf_counter()
+            items = function(data)
+            runs.append(time.perf_counter() - start)
+    best = min(runs)
+    return {
+        'items': items,
+        'runs_s': [round(run, 6) for run in runs],
+        'best_s': round(best, 6),
+        'mean_s': round(statistics.mean(runs), 6),
+        'items_per_s': round(items / best, 1) if best > 0 else None,
+    }
+
+
+def run_suite(sizes, repeat=DEFAULT_REPEAT, only=None):
+    """
+    Corre los casos para cada tamaño. Retorna la lista de resultados.
+    """
+    results = []
+    selected = [(name, function) for name, function in BENCHMARKS
+                if only is None or name in only]
+    for size in sizes:
+        rows = rows_for(size)
+        with tempfile.TemporaryDirectory() as tmp:
+            data = Dataset(tmp, rows)
+            for name, function in selected:
+                result = run_benchmark(function, data, repeat)
+                result.update({'size': size, 'rows': rows, 'benchmark': name})
+                results.append(result)
+                print(f"{size:>6} {name:<30} best {result['best_s']:>9.4f} s  "
+                      f"mean {result['mean_s']:>9.4f} s  ({result['items']} items)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite on synthetic data.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help="comma separated: 1k, 100k, 1m or row counts")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--only", help="comma separated benchmark names")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON results file")
+    args = parser.parse_args()
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    only = None
+    if args.only:
+        only = {name.strip() for name in args.only.split(",")}
+        unknown = only - {name for name, _ in BENCHMARKS}
+        if unknown:
+            parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    sizes = [size.strip().lower() for size in args.sizes.split(",") if size.strip()]
+
+    results = run_suite(sizes, args.repeat, only)
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': sys.platform,
+        'repeat': args.repeat,
+        'results': results,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+        file.write("\n")
+    print(f"Results written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+# benchmarks/synthetic.py
+"""
+Generador de datos sintéticos con el formato de los CSV de la aplicación.
+
+Para N filas se generan:
+- vacations.csv: N solicitudes
+- employees.csv: N // 4 empleados (mínimo 10; ~4 solicitudes por empleado)
+- users.csv: N // 100 usuarios (mínimo 10)
+- holidays.csv: festivos fijos de cada año del rango
+
+Distribuciones:
+- antigüedad exponencial (media ~4 años), con ~5% de ingresos recientes
+  que aún no cumplen los 6 meses
+- inicios concentrados en diciembre, julio-agosto y semana santa; la
+  mayoría empieza lunes
+- duraciones de 1 a 15 días hábiles, sobre todo 5 y 10
+- estado según la fecha: las pasadas casi todas APPROVED, las futuras
+  mitad PENDING
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.synthetic 100k --out data_100k [--seed 42]
+"""
+import argparse
+import os
+import random
+from datetime import date, timedelta
+
+from employees import EMPLOYEE_CSV_HEADER
+from utils import USER_CSV_HEADER
+from vacations import HOLIDAY_CSV_HEADER, VACATION_CSV_HEADER, count_days_excluding_sundays
+
+# fecha "de hoy" de los datos: fija para que el mismo seed genere siempre
+# los mismos archivos
+REFERENCE_DATE = date(2026, 1, 1)
+FIRST_YEAR = 2018
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+FIRST_NAMES = ["Ana", "Luis", "María", "Carlos", "Laura", "Jorge", "Sofía", "Andrés",
+               "Valentina", "Diego", "Camila", "Juan", "Daniela", "Felipe", "Paula",
+               "Santiago", "Natalia", "Mateo", "Isabella", "Sebastián"]
+LAST_NAMES = ["García", "Rodríguez", "Martínez", "López", "González", "Pérez", "Sánchez",
+              "Ramírez", "Torres", "Flórez", "Rivera", "Gómez", "Díaz", "Vargas", "Castro",
+              "Ortiz", "Rojas", "Moreno", "Jiménez", "Herrera"]
+# (departamento, peso, cargos)
+DEPARTMENTS = [
+    ("Operations", 22, ["Operator", "Supervisor", "Coordinator"]),
+    ("Sales", 18, ["Sales Rep", "Account Manager"]),
+    ("IT", 12, ["Developer", "Analyst", "Support"]),
+    ("Customer Service", 14, ["Agent", "Team Lead"]),
+    ("Finance", 8, ["Accountant", "Analyst"]),
+    ("HR", 5, ["Recruiter", "HR Analyst"]),
+    ("Logistics", 12, ["Driver", "Warehouse Assistant", "Planner"]),
+    ("Marketing", 6, ["Designer", "Marketing Analyst"]),
+    ("Legal", 3, ["Lawyer"]),
+]
+# peso relativo de cada mes como inicio de vacaciones
+MONTH_WEIGHTS = [6, 4, 6, 8, 5, 9, 12, 10, 4, 6, 5, 15]
+# días hábiles pedidos y su peso
+LENGTHS = [1, 2, 3, 4, 5, 6, 10, 12, 15]
+LENGTH_WEIGHTS = [8, 8, 6, 3, 25, 10, 25, 8, 7]
+# (mes, día, descripción)
+FIXED_HOLIDAYS = [(1, 1, "New Year"), (5, 1, "Labor Day"), (7, 20, "Independence Day"),
+                  (8, 7, "Battle of Boyacá"), (12, 8, "Immaculate Conception"),
+                  (12, 25, "Christmas")]
+
+
+def rows_for(size):
+    """
+    Convierte "1k", "100k", "1m" o un entero en número de filas.
+    """
+    text = str(size).strip().lower()
+    if text in SIZES:
+        return SIZES[text]
+    return int(text)
+
+
+def _hire_date(rng):
+    if rng.random() < 0.05:
+        return REFERENCE_DATE - timedelta(days=rng.randint(1, 180))
+    days = min(int(rng.expovariate(1 / (4 * 365))), 30 * 365)
+    return REFERENCE_DATE - timedelta(days=days + 181)
+
+
+def _start_date(rng, earliest):
+    """
+    Inicio con peso por mes; ~70% se corre al lunes siguiente.
+    """
+    last_year = REFERENCE_DATE.year + 1
+    for _ in range(20):
+        year = rng.randint(FIRST_YEAR, last_year)
+        month = rng.choices(range(1, 13), MONTH_WEIGHTS)[0]
+        start = date(year, month, rng.randint(1, 28))
+        if rng.random() < 0.7:
+            start += timedelta(days=(7 - start.weekday()) % 7)
+        if start >= earliest:
+            return start
+    return earliest + timedelta(days=rng.randint(0, 365))
+
+
+def _status(rng, start):
+    if start < REFERENCE_DATE:
+        return rng.choices(("APPROVED", "REJECTED", "PENDING"), (82, 12, 6))[0]
+    return rng.choices(("PENDING", "APPROVED", "REJECTED"), (50, 45, 5))[0]
+
+
+def generate_holidays(first_year=FIRST_YEAR, last_year=REFERENCE_DATE.year + 2):
+    """
+    Lista de (fecha, descripción) de los festivos fijos de cada año.
+    """
+    return [(date(year, month, day), description)
+            for year in range(first_year, last_year + 1)
+            for month, day, description in FIXED_HOLIDAYS]
+
+
+def write_employees(path, rows, rng=None):
+    """
+    Escribe employees.csv y retorna [(employee_id, full_name, hire_date)].
+    """
+    rng = rng or random.Random()
+    weights = [weight for _, weight, _ in DEPARTMENTS]
+    employees = []
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        file.write(",".join(EMPLOYEE_CSV_HEADER) + "\n")
+        for i in range(rows):
+            employee_id = str(100000 + i)
+            full_name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            department, _, positions = rng.choices(DEPARTMENTS, weights)[0]
+            hire_date = _hire_date(rng)
+            file.write(f"{employee_id},{full_name},{rng.choice(positions)},"
+                       f"{department},{hire_date}\n")
+            employees.append((employee_id, full_name, hire_date))
+    return employees
+
+
+def write_vacations(path, rows, employees, holidays=None, rng=None):
+    """
+    Escribe vacations.csv con solicitudes de los empleados dados
+    [(employee_id, full_name, hire_date)]; cada una empieza después de los
+    6 meses de antigüedad del empleado.
+    """
+    rng = rng or random.Random()
+    holiday_dates = sorted(day for day, _ in holidays or [])
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        file.write(",".join(VACATION_CSV_HEADER) + "\n")
+        for _ in range(rows):
+            employee_id, full_name, hire_date = rng.choice(employees)
+            start = _start_date(rng, hire_date + timedelta(days=183))
+            length = rng.choices(LENGTHS, LENGTH_WEIGHTS)[0]
+            # días calendario aproximados para cubrir los domingos
+            end = start + timedelta(days=length + length // 6 - 1)
+            days = count_days_excluding_sundays(start, end, holiday_dates)
+            file.write(f"{employee_id},{full_name},{start},{end},{float(days)},"
+                       f"{_status(rng, start)},{start.month},{start.year}\n")
+
+
+def write_users(path, rows, rng=None):
+    rng = rng or random.Random()
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        file.write(",".join(USER_CSV_HEADER) + "\n")
+        for i in range(rows):
+            role = "admin" if rng.random() < 0.05 else "user"
+            file.write(f"user{i},secret{rng.randint(1000, 9999)},{role}\n")
+
+
+def write_holidays(path, holidays):
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        file.write(",".join(HOLIDAY_CSV_HEADER) + "\n")
+        for day, description in holidays:
+            file.write(f"{day},{description}\n")
+
+
+def generate_dataset(directory, rows, seed=42):
+    """
+    Genera los cuatro CSV en directory. Retorna {nombre: ruta}.
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    paths = {name: os.path.join(directory, f"{name}.csv")
+             for name in ("employees", "vacations", "users", "holidays")}
+    holidays = generate_holidays()
+    write_holidays(paths["holidays"], holidays)
+    employees = write_employees(paths["employees"], max(rows // 4, 10), rng)
+    write_vacations(paths["vacations"], rows, employees, holidays, rng)
+    write_users(paths["users"], max(rows // 100, 10), rng)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic CSV data files.")
+    parser.add_argument("size", help="vacation rows: 1k, 100k, 1m or a number")
+    parser.add_argument("--out", default=None, help="output directory (default: data_<size>)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rows = rows_for(args.size)
+    directory = args.out or f"data_{args.size.lower()}"
+    paths = generate_dataset(directory, rows, args.seed)
+    for name, path in paths.items():
+        print(f"{name}: {path}")
+
+
+if __name__ == "__main__":
+    main()
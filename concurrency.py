@@ -0,0 +1,78 @@
+# concurrency.py
+"""
+Varios operadores con la consola abierta sobre los mismos archivos.
+
+Los bloqueos son advisory (fcntl.flock) sobre un archivo <ruta>.lock al
+lado del archivo de datos y se toman solo mientras dura una sincronización
+o un guardado, nunca mientras el operador está escribiendo en la consola.
+En sistemas sin fcntl (Windows) no bloquean.
+"""
+import os
+import threading
+from contextlib import nullcontext
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class FileLock:
+    """
+    Bloqueo exclusivo entre procesos sobre <path>.lock. Es reentrante
+    dentro del mismo proceso (una transacción puede llamar a append, que
+    vuelve a tomar el bloqueo).
+    """
+
+    def __init__(self, path):
+        self.path = f"{path}.lock"
+        self._file = None
+        self._depth = 0
+        self._thread_lock = threading.RLock()
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        try:
+            if self._depth == 0 and fcntl is not None:
+                lock_file = open(self.path, "a")
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                except BaseException:
+                    lock_file.close()
+                    raise
+                self._file = lock_file
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0 and self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+        return False
+
+
+def file_stamp(path):
+    """
+    (inodo, mtime en ns, tamaño) del archivo, o None si no existe. Cambia
+    cada vez que otro proceso lo reescribe (la escritura atómica crea un
+    archivo nuevo).
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def transaction(journal):
+    """
+    Con journal: bloqueo + sincronización (ver Journal.transaction); sin
+    journal no hace nada (los conflictos se resuelven al guardar).
+    """
+    return journal.transaction() if journal is not None else nullcontext()
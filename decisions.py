@@ -0,0 +1,369 @@
+# decisions.py
+"""
+Aprobación/rechazo masivo de solicitudes PENDING.
+
+Una regla combina filtros (departamento, rango de fechas, empleado) con
+condiciones opcionales para aprobar:
+- min_remaining_balance: el saldo del empleado después de aprobar
+  sigue siendo >= N
+- no_overlap: la solicitud no se cruza con otra ya aprobada del mismo
+  empleado
+
+Archivo de reglas (JSON, lista en orden de prioridad; la primera regla
+que aplica decide y las solicitudes sin regla quedan PENDING):
+
+    [
+      {"department": "IT", "min_remaining_balance": 5, "no_overlap": true,
+       "decision": "APPROVED"},
+      {"from": "2026-12-20", "to": "2027-01-06", "decision": "REJECTED"}
+    ]
+
+    python decisions.py --rules rules.json [--dry-run]
+    python decisions.py --department IT --decision APPROVED --no-overlap
+"""
+import argparse
+import json
+from datetime import datetime
+
+from concurrency import transaction
+from records import Status, parse_date
+from storage import STORAGE_BACKENDS, open_storage
+from vacations import calculate_accrued_days, status_entry
+
+
+class DecisionRule:
+    """
+    Filtros + condiciones + decisión (Status.APPROVED o Status.REJECTED).
+    """
+    __slots__ = ('decision', 'department', 'employee_id', 'start_date', 'end_date',
+                 'min_remaining_balance', 'no_overlap')
+
+    def __init__(self, decision, department=None, employee_id=None, start_date=None,
+                 end_date=None, min_remaining_balance=None, no_overlap=False):
+        if decision not in (Status.APPROVED, Status.REJECTED):
+            raise ValueError("decision must be APPROVED or REJECTED")
+        self.decision = decision
+        self.department = department
+        self.employee_id = employee_id
+        self.start_date = start_date
+        self.end_date = end_date
+        self.min_remaining_balance = min_remaining_balance
+        self.no_overlap = no_overlap
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Construye la regla desde un objeto del archivo JSON.
+        Lanza ValueError si algún campo es inválido.
+        """
+        if not isinstance(data, dict):
+            raise ValueError("each rule must be a JSON object")
+        unknown = set(data) - {'decision', 'department', 'employee_id', 'from', 'to',
+                               'min_remaining_balance', 'no_overlap'}
+        if unknown:
+            raise ValueError(f"unknown rule fields: {', '.join(sorted(unknown))}")
+        if 'decision' not in data:
+            raise ValueError("missing field: decision")
+
+        min_balance = data.get('min_remaining_balance')
+        return cls(
+            Status.parse(str(data['decision'])),
+            department=data.get('department'),
+            employee_id=data.get('employee_id'),
+            start_date=parse_date(data['from']) if data.get('from') else None,
+            end_date=parse_date(data['to']) if data.get('to') else None,
+            min_remaining_balance=float(min_balance) if min_balance is not None else None,
+            no_overlap=bool(data.get('no_overlap', False)),
+        )
+
+    def matches(self, vacation, employee):
+        """
+        True si la solicitud pasa los filtros (no evalúa condiciones).
+        El rango de fechas se cumple si la solicitud toca algún día de él.
+        """
+        if self.employee_id is not None and vacation.employee_id != self.employee_id:
+            return False
+        if self.department is not None:
+            if employee is None or employee.department.lower() != self.department.lower():
+                return False
+        if self.start_date is not None and vacation.end_date < self.start_date:
+            return False
+        if self.end_date is not None and vacation.start_date > self.end_date:
+            return False
+        return True
+
+
+def load_rules(path):
+    """
+    Lee el archivo de reglas. Retorna la lista de DecisionRule o None si
+    el archivo no es válido.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        print(f"The rules file was not found: {path}")
+        return None
+    except ValueError as e:
+        print(f"Invalid rules file: {e}")
+        return None
+
+    if isinstance(data, dict):
+        data = [data]
+    if not isinstance(data, list):
+        print("Invalid rules file: expected a list of rules.")
+        return None
+
+    rules = []
+    for number, item in enumerate(data, start=1):
+        try:
+            rules.append(DecisionRule.from_dict(item))
+        except (ValueError, TypeError) as e:
+            print(f"Invalid rule #{number}: {e}")
+            return None
+    return rules
+
+
+def _overlaps(vacation, intervals):
+    return any(vacation.start_date <= end and start <= vacation.end_date
+               for start, end in intervals)
+
+
+class DecisionEngine:
+    """
+    Decide en una sola pasada sobre el índice de pendientes. Lleva por
+    empleado lo aprobado durante la pasada, de modo que el saldo y los
+    cruces de fechas consideran también las decisiones anteriores.
+    """
+
+    def __init__(self, employees, vacations, rules, today=None):
+        self.employees = employees
+        self.vacations = vacations
+        self.rules = rules
+        self.today = today or datetime.today().date()
+        self._available = {}
+        self._approved = {}
+
+    def _overlaps_approved(self, vacation):
+        for other in self.vacations.overlapping(vacation.employee_id,
+                                                vacation.start_date, vacation.end_date):
+            if other.status is Status.APPROVED and other.key != vacation.key:
+                return True
+        return _overlaps(vacation, self._approved.get(vacation.employee_id, ()))
+
+    def _available_days(self, employee):
+        available = self._available.get(employee.employee_id)
+        if available is None:
+            available = calculate_accrued_days(employee, self.today, self.vacations)[0]
+            self._available[employee.employee_id] = available
+        return available
+
+    def _conditions_hold(self, rule, vacation, employee):
+        if rule.decision is not Status.APPROVED:
+            return True
+        if rule.min_remaining_balance is not None:
+            if employee is None:
+                return False
+            remaining = self._available_days(employee) - vacation.total_days_taken
+            if remaining < rule.min_remaining_balance:
+                return False
+        if rule.no_overlap and self._overlaps_approved(vacation):
+            return False
+        return True
+
+    def _record_approval(self, vacation, employee):
+        # aprobadas en esta pasada: el índice aún las tiene como PENDING
+        self._approved.setdefault(vacation.employee_id, []).append(
+            (vacation.start_date, vacation.end_date)
+        )
+        if employee is not None:
+            self._available[employee.employee_id] = (
+                self._available_days(employee) - vacation.total_days_taken
+            )
+
+    def decide(self):
+        """
+        Retorna la lista de (solicitud, nuevo estado) sin modificar nada.
+        """
+        changes = []
+        for vacation in self.vacations.with_status(Status.PENDING):
+            employee = self.employees.get(vacation.employee_id)
+            for rule in self.rules:
+                if not rule.matches(vacation, employee):
+                    continue
+                if not self._conditions_hold(rule, vacation, employee):
+                    continue
+                changes.append((vacation, rule.decision))
+                if rule.decision is Status.APPROVED:
+                    self._record_approval(vacation, employee)
+                break
+        return changes
+
+
+def apply_decisions(vacations, changes, journal=None):
+    """
+    Persiste todas las decisiones de una vez: una sola escritura al journal
+    y después una actualización masiva del repositorio (si el journal no se
+    puede escribir no se cambia nada). Las solicitudes que otro operador
+    decidió mientras tanto (ya no están PENDING) se omiten.
+    Retorna cuántas solicitudes cambiaron.
+    """
+    if not changes:
+        return 0
+    with transaction(journal):
+        pending = [(v, status) for v, status in changes if v.status is Status.PENDING]
+        if len(pending) < len(changes):
+            print(f"{len(changes) - len(pending)} requests were already decided by another "
+                  f"operator and were skipped.")
+        if journal is not None and not journal.append_many(
+                "set_status", (status_entry(v, Status.PENDING, status) for v, status in pending)):
+            print("The decisions could not be saved; no request was changed.")
+            return 0
+        updated = vacations.update_status_many(pending)
+    return updated
+
+
+def print_decisions(changes, limit=20):
+    approved = sum(1 for _, status in changes if status is Status.APPROVED)
+    print(f"\nDecisions: {len(changes)} "
+          f"(APPROVED: {approved}, REJECTED: {len(changes) - approved})")
+    if not changes:
+        return
+    print("-" * 90)
+    for v, status in changes[:limit]:
+        print(f"{status.value:<9} {v.employee_id} - {v.full_name} | "
+              f"{v.start_date} to {v.end_date} | Days: {v.total_days_taken}")
+    if len(changes) > limit:
+        print(f"... and {len(changes) - limit} more")
+    print("-" * 90)
+
+
+def _read_optional_date(prompt):
+    text = input(prompt).strip()
+    if not text:
+        return None
+    return parse_date(text)
+
+
+def bulk_decide_interactive(employees, vacations, journal=None):
+    """
+    Opción del menú: arma una regla con lo que ingresa el usuario, muestra
+    las decisiones y las aplica tras confirmar.
+    """
+    if not vacations.with_status(Status.PENDING):
+        print("\nNo pending vacation requests.\n")
+        return
+
+    print("\nLeave a filter empty to match every pending request.")
+    department = input("Department: ").strip() or None
+    try:
+        start_date = _read_optional_date("From date (YYYY-MM-DD): ")
+        end_date = _read_optional_date("To date (YYYY-MM-DD): ")
+    except ValueError:
+        print("Invalid date format. Please use YYYY-MM-DD.")
+        return
+
+    print("1. APPROVE")
+    print("2. REJECT")
+    choice = input("Choose an option: ").strip()
+    if choice == "1":
+        decision = Status.APPROVED
+    elif choice == "2":
+        decision = Status.REJECTED
+    else:
+        print("Invalid option.")
+        return
+
+    min_balance = None
+    no_overlap = False
+    if decision is Status.APPROVED:
+        text = input("Minimum remaining balance after approval (empty for none): ").strip()
+        if text:
+            try:
+                min_balance = float(text)
+            except ValueError:
+                print("Invalid number.")
+                return
+        no_overlap = input("Skip requests that overlap approved ones? (y/n): ").strip().lower() == "y"
+
+    rule = DecisionRule(decision, department=department, start_date=start_date,
+                        end_date=end_date, min_remaining_balance=min_balance,
+                        no_overlap=no_overlap)
+    changes = DecisionEngine(employees, vacations, [rule]).decide()
+    print_decisions(changes)
+    if not changes:
+        return
+
+    if input("Apply these decisions? (y/n): ").strip().lower() != "y":
+        print("No changes applied.")
+        return
+    updated = apply_decisions(vacations, changes, journal)
+    print(f"{updated} requests updated.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk approve/reject pending vacation requests.")
+    parser.add_argument("--rules", help="JSON file with the decision rules")
+    parser.add_argument("--decision", choices=["APPROVED", "REJECTED"],
+                        help="decision for a single rule built from the flags below")
+    parser.add_argument("--department")
+    parser.add_argument("--employee-id")
+    parser.add_argument("--from", dest="start_date", help="YYYY-MM-DD")
+    parser.add_argument("--to", dest="end_date", help="YYYY-MM-DD")
+    parser.add_argument("--min-remaining-balance", type=float)
+    parser.add_argument("--no-overlap", action="store_true")
+    parser.add_argument("--dry-run", action="store_true", help="show the decisions only")
+    parser.add_argument("--backend", choices=STORAGE_BACKENDS, default="csv")
+    parser.add_argument("--db", default="vacations.db", help="SQLite database file")
+    parser.add_argument("--users", default="users.csv")
+    parser.add_argument("--employees", default="employees.csv")
+    parser.add_argument("--vacations", default="vacations.csv")
+    parser.add_argument("--journal", default="journal.jsonl")
+    parser.add_argument("--snapshot", default="data.snapshot")
+    args = parser.parse_args()
+
+    if args.rules:
+        rules = load_rules(args.rules)
+        if rules is None:
+            return
+    elif args.decision:
+        try:
+            rules = [DecisionRule.from_dict({
+                'decision': args.decision,
+                'department': args.department,
+                'employee_id': args.employee_id,
+                'from': args.start_date,
+                'to': args.end_date,
+                'min_remaining_balance': args.min_remaining_balance,
+                'no_overlap': args.no_overlap,
+            })]
+        except ValueError as e:
+            parser.error(str(e))
+    else:
+        parser.error("use --rules or --decision")
+
+    storage = open_storage(
+        args.backend,
+        args.users,
+        args.employees,
+        args.vacations,
+        args.db,
+        journal_path=args.journal,
+        snapshot_path=args.snapshot,
+    )
+    try:
+        _, employees, vacations = storage.load()
+        changes = DecisionEngine(employees, vacations, rules).decide()
+        print_decisions(changes)
+        if args.dry_run or not changes:
+            return
+        updated = apply_decisions(vacations, changes, storage.journal)
+        print(f"{updated} requests updated.")
+        storage.vacations_changed()
+    finally:
+        # la simulación no escribe nada (ni compacta lo reaplicado)
+        storage.close(save=not args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
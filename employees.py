@@ -1,65 +1,97 @@
 # employees.py
 import csv
-from datetime import datetime
+from datetime import date
+
+from concurrency import transaction
+from instrumentation import instrumented
+from pagination import PAGE_SIZE, lazy_sorted, paginate, read_filters
+from records import Employee
+from utils import atomic_write_csv
 
 EMPLOYEE_CSV_HEADER = ['employee_id', 'full_name', 'position', 'department', 'hire_date']
-DATE_FORMAT = "%Y-%m-%d" 
 
 
-def add_employee(employees, employee):
+def add_employee(employees, employee, journal=None):
     """
-    Agrega un empleado a la lista en memoria.
-    NO guarda en CSV, solo en la lista.
+    Agrega un empleado al repositorio en memoria.
+    NO guarda en CSV; si hay journal, registra el cambio en él.
+    Retorna False si otro operador ya agregó ese ID.
     """
-    employees.append(employee)
-    return employees
+    with transaction(journal):
+        if employees.exists(employee.employee_id):
+            print(f"Employee with ID {employee.employee_id} was already added by another operator.")
+            return False
+        # primero el journal: si no se puede escribir no se agrega
+        if journal is not None and not journal.append("add_employee",
+                                                      record=employee.to_row()):
+            print("The employee could not be saved.")
+            return False
+        employees.append(employee)
+    return True
+
+
+EMPLOYEE_SORTS = {
+    'id': None,
+    'name': lambda e: e.full_name.lower(),
+    # fechas inválidas al final
+    'hire': lambda e: e.hire_date or date.max,
+    'dept': lambda e: e.department.lower(),
+}
+
+
+def select_employees(employees, department=None, sort=None):
+    """
+    Empleados a listar: el filtro de departamento usa el índice del
+    repositorio y el orden (por defecto el de carga) se resuelve de forma
+    perezosa.
+    """
+    selected = employees if department is None else employees.in_department(department)
+    key = EMPLOYEE_SORTS.get(sort)
+    if key is None:
+        return iter(selected)
+    return lazy_sorted(selected, key)
 
 
-def view_all_employees(employees):
+def view_all_employees(employees, page_size=PAGE_SIZE):
     """
-    Muestra todos los empleados en formato de tabla simple.
+    Muestra los empleados en una tabla paginada, con filtro por
+    departamento y orden opcionales.
     """
     if not employees:
         print("\nNo hay empleados registrados.\n")
         return
 
-    print("\nListado de empleados:")
-    print("-" * 80)
-    print(f"{'ID':<10} {'Nombre completo':<25} {'Cargo':<20} {'Área':<15} {'Fecha inicio':<12}")
-    print("-" * 80)
-    for e in employees:
-        print(f"{e['employee_id']:<10} {e['full_name']:<25} {e['position']:<20} {e['department']:<15} {e['hire_date']:<12}")
-    print("-" * 80)
+    filters = read_filters(("dept", "sort"), tuple(EMPLOYEE_SORTS))
+    if filters is None:
+        return
+
+    selected = select_employees(employees, filters.get("dept"), filters.get("sort"))
+    lines = (
+        f"{e.employee_id:<10} {e.full_name:<25} {e.position:<20} {e.department:<15} {e.hire_date_text:<12}"
+        for e in selected
+    )
+    header = f"{'ID':<10} {'Nombre completo':<25} {'Cargo':<20} {'Área':<15} {'Fecha inicio':<12}"
+    if paginate(lines, "Listado de empleados", header, 80, page_size) == 0:
+        print("No employees match the filter.")
 
 
 def get_employee(employees, employee_id):
     """
-    Busca un empleado por ID en la lista.
-    Retorna el dict del empleado o None si no existe.
+    Busca un empleado por ID en el índice del repositorio.
+    Retorna el Employee o None si no existe.
     """
-    for e in employees:
-        if e['employee_id'] == employee_id:
-            return e
-    return None
+    return employees.get(employee_id)
 
 
 def build_employee_record(employee_id, full_name, position, department, hire_date):
     """
-    Construye el registro de empleado en forma de diccionario.
+    Construye el registro de empleado (Employee).
     Valida formato de fecha YYYY-MM-DD (solo para advertir).
     """
-    try:
-        datetime.strptime(hire_date, DATE_FORMAT)
-    except ValueError:
+    employee = Employee(employee_id, full_name, position, department, hire_date)
+    if employee.hire_date is None:
         print("Formato de fecha inválido, se esperaba YYYY-MM-DD. Se guardará tal cual.")
-
-    return {
-        'employee_id': employee_id,
-        'full_name': full_name,
-        'position': position,
-        'department': department,
-        'hire_date': hire_date,
-    }
+    return employee
 
 
 def collect_employee_data(employees):
@@ -69,10 +101,9 @@ def collect_employee_data(employees):
     o None si el ID ya existe.
     """
     employee_id = input("Enter Employee ID: ").strip()
-    for e in employees:
-        if employee_id == e['employee_id']:
-            print(f"Employee with ID {e['employee_id']} already exists.")
-            return None
+    if employees.exists(employee_id):
+        print(f"Employee with ID {employee_id} already exists.")
+        return None
 
     full_name = input("Enter the employee Full Name: ").strip()
     position = input("Enter the employee Position: ").strip()
@@ -81,11 +112,12 @@ def collect_employee_data(employees):
     return employee_id, full_name, position, department, hire_date
 
 
+@instrumented(rows="result")
 def load_data_employees(path):
     """
     Carga los empleados desde un CSV con cabecera:
     employee_id, full_name, position, department, hire_date
-    y devuelve una lista de dicts.
+    y devuelve una lista de Employee.
     """
     employees = []
     invalid_rows = 0
@@ -125,13 +157,7 @@ def load_data_employees(path):
                 hire_date = row[4].strip()
 
                 employees.append(
-                    {
-                        'employee_id': employee_id,
-                        'full_name': full_name,
-                        'position': position,
-                        'department': department,
-                        'hire_date': hire_date,
-                    }
+                    Employee(employee_id, full_name, position, department, hire_date)
                 )
 
         if not employees:
@@ -150,16 +176,16 @@ def load_data_employees(path):
     return employees
 
 
+@instrumented(rows=1)
 def save_data_employees(path, employees):
     """
-    Guarda la lista de empleados en el CSV, sobrescribiendo el archivo.
+    Guarda la lista de empleados en el CSV, sobrescribiendo el archivo
+    mediante escritura atómica (archivo temporal + rename).
     """
     try:
-        with open(path, "w", encoding="utf-8", newline="") as file:
-            writer = csv.DictWriter(file, fieldnames=EMPLOYEE_CSV_HEADER)
-            writer.writeheader()
-            for e in employees:
-                writer.writerow(e)
+        atomic_write_csv(path, EMPLOYEE_CSV_HEADER, (e.to_row() for e in employees))
         print(f"Employees saved to: {path}")
+        return True
     except Exception as e:
         print(f"Error while saving employees: {e}")
+        return False
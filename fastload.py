@@ -0,0 +1,295 @@
+# fastload.py
+import csv
+import io
+from itertools import chain
+from operator import methodcaller
+
+from employees import EMPLOYEE_CSV_HEADER
+from instrumentation import instrumented
+from records import Employee, Status, VacationRequest, parse_date
+from utils import USER_CSV_HEADER, gc_paused
+from vacations import VACATION_CSV_HEADER
+
+# caracteres leídos por bloque (~4 MB de texto)
+CHUNK_SIZE = 1 << 22
+# filas que csv.reader acumula antes de volcarlas a las columnas
+FALLBACK_BATCH = 50000
+
+
+_count_commas = methodcaller("count", ",")
+# espacios ASCII distintos de " " que str.strip también recorta
+_OTHER_WHITESPACE = "\t\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+
+def _needs_strip(text):
+    """
+    True si algún campo del bloque puede tener espacios al inicio o al
+    final. Son búsquedas de subcadena (en C), mucho más baratas que
+    recortar cada campo.
+    """
+    if not text.isascii():
+        return True
+    if any(ch in text for ch in _OTHER_WHITESPACE):
+        return True
+    return (", " in text or " ," in text or "\n " in text or " \n" in text
+            or text.startswith(" ") or text.endswith(" "))
+
+
+def _add_rows(columns, rows, width):
+    """
+    Agrega a las columnas las filas de ancho correcto (con strip por campo).
+    Retorna cuántas filas se descartaron por ancho inválido.
+    """
+    valid = [row for row in rows if len(row) == width]
+    if valid:
+        for column, values in zip(columns, zip(*valid)):
+            column.extend([value.strip() for value in values])
+    return len(rows) - len(valid)
+
+
+def _add_block(columns, text, width):
+    """
+    Camino rápido para un bloque de líneas completas sin comillas.
+    Si todas las líneas tienen width campos se parte el bloque entero con
+    un solo split y una rebanada por columna; si hay líneas vacías o de
+    ancho inválido se procesa línea por línea.
+    Retorna cuántas filas se descartaron por ancho inválido.
+    """
+    lines = text.split("\n")
+    if set(map(_count_commas, lines)) == {width - 1}:
+        fields = text.replace("\n", ",").split(",")
+        if _needs_strip(text):
+            fields = list(map(str.strip, fields))
+        # una fila con todos los campos vacíos tiene vacío el primero:
+        # si no hay ninguno, ninguna fila se debe ignorar
+        if "" not in fields[0::width]:
+            for idx, column in enumerate(columns):
+                column.extend(fields[idx::width])
+            return 0
+
+    rows = [line.split(",") for line in lines if line.replace(",", "").strip()]
+    return _add_rows(columns, rows, width)
+
+
+def _read_columns(file, width):
+    """
+    Lee el resto del archivo por bloques grandes y lo parte en columnas.
+    Si aparece una comilla se sigue con csv.reader, que sabe manejar
+    campos entre comillas (comas o saltos de línea dentro del campo).
+    """
+    columns = [[] for _ in range(width)]
+    invalid_rows = 0
+    carry = ""
+
+    while True:
+        chunk = file.read(CHUNK_SIZE)
+        if chunk:
+            text = carry + chunk
+            cut = text.rfind("\n")
+            if cut == -1:
+                carry = text
+                continue
+            text, carry = text[:cut], text[cut + 1:]
+        else:
+            text, carry = carry, ""
+            if not text:
+                break
+
+        if '"' in text:
+            rest = text + "\n" + carry + file.readline()
+            reader = csv.reader(chain(io.StringIO(rest), file))
+            batch = []
+            for row in reader:
+                if not row or all(col.strip() == "" for col in row):
+                    continue
+                batch.append(row)
+                if len(batch) >= FALLBACK_BATCH:
+                    invalid_rows += _add_rows(columns, batch, width)
+                    batch = []
+            invalid_rows += _add_rows(columns, batch, width)
+            break
+
+        invalid_rows += _add_block(columns, text, width)
+
+        if not chunk:
+            break
+
+    return columns, invalid_rows
+
+
+def load_columns(path: str, expected_header, label: str, empty_message: str):
+    """
+    Carga un CSV en columnas (una lista por campo de la cabecera).
+    Valida la cabecera igual que los loaders fila a fila (con sus mismos
+    mensajes) y retorna (columnas, filas_inválidas), o (None, 0) si no se
+    pudo leer.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        first_line = file.readline()
+        if not first_line:
+            print(empty_message)
+            return None, 0
+        header = next(csv.reader([first_line]))
+
+        normalized_header = [col.strip().lower() for col in header]
+        expected_normalized = [col.strip().lower() for col in expected_header]
+
+        if normalized_header != expected_normalized:
+            print(f"Invalid header on {label} file.")
+            print(f"Expected: {expected_header}")
+            print(f"Found:    {header}")
+            return None, 0
+
+        return _read_columns(file, len(expected_header))
+
+
+def _employee_records(columns):
+    return [Employee(*fields) for fields in zip(*columns)]
+
+
+def _vacation_from_fields(fields):
+    employee_id, full_name, start_date, end_date, total_days_taken, status, month, year = fields
+    return VacationRequest(employee_id, full_name, parse_date(start_date), parse_date(end_date),
+                           float(total_days_taken), Status.parse(status), int(month), int(year))
+
+
+def _vacation_records(columns):
+    """
+    Convierte las columnas en VacationRequest. Primero intenta convertir
+    columna por columna (map en C); si algún valor es inválido, repite
+    fila por fila para descartar y contar solo las filas inválidas.
+    Retorna (registros, filas_inválidas).
+    """
+    try:
+        converted = [
+            columns[0],
+            columns[1],
+            list(map(parse_date, columns[2])),
+            list(map(parse_date, columns[3])),
+            list(map(float, columns[4])),
+            list(map(Status.parse, columns[5])),
+            list(map(int, columns[6])),
+            list(map(int, columns[7])),
+        ]
+        return [VacationRequest(*fields) for fields in zip(*converted)], 0
+    except ValueError:
+        pass
+
+    records = []
+    invalid_rows = 0
+    for fields in zip(*columns):
+        try:
+            records.append(_vacation_from_fields(fields))
+        except ValueError:
+            invalid_rows += 1
+    return records, invalid_rows
+
+
+def _user_records(columns):
+    return [
+        {
+            'username': username,
+            'password': password,
+            'role': role,
+        }
+        for username, password, role in zip(*columns)
+    ]
+
+
+@instrumented(rows="result")
+def load_data_employees_fast(path):
+    """
+    Versión por columnas de employees.load_data_employees.
+    Mismos mensajes y mismo resultado (lista de Employee).
+    """
+    employees = []
+    invalid_rows = 0
+    print(f"Loading employees from: {path}")
+
+    try:
+        with gc_paused():
+            columns, invalid_rows = load_columns(path, EMPLOYEE_CSV_HEADER, "employees",
+                                                 "The CSV file is empty.")
+            if columns is None:
+                return employees
+            employees = _employee_records(columns)
+
+        if not employees:
+            print("No valid employees were found in the file.")
+            return employees
+
+    except FileNotFoundError:
+        print("The specified employees file was not found. A new one will be created on save.")
+    except UnicodeDecodeError:
+        print("Encoding error. Make sure it is a valid CSV file.")
+    except Exception as e:
+        print(f"An unexpected error occurred while loading employees: {e}")
+
+    print(f"Employees loaded: {len(employees)}")
+    print(f"Invalid rows skipped: {invalid_rows}")
+    return employees
+
+
+@instrumented(rows="result")
+def load_vacations_fast(path: str):
+    """
+    Versión por columnas de vacations.load_vacations.
+    Convierte fechas, números y estado columna por columna.
+    """
+    vacations = []
+    invalid_rows = 0
+    print(f"Loading vacations from: {path}")
+
+    try:
+        with gc_paused():
+            columns, invalid_rows = load_columns(path, VACATION_CSV_HEADER, "vacations",
+                                                 "The vacations CSV file is empty.")
+            if columns is None:
+                return vacations
+
+            vacations, invalid_values = _vacation_records(columns)
+            invalid_rows += invalid_values
+
+    except FileNotFoundError:
+        print("The specified vacations file was not found. A new one will be created on save.")
+    except UnicodeDecodeError:
+        print("Encoding error. Make sure it is a valid CSV file.")
+    except Exception as e:
+        print(f"An unexpected error occurred while loading vacations: {e}")
+
+    print(f"Vacations records loaded: {len(vacations)}")
+    print(f"Invalid rows skipped: {invalid_rows}")
+    return vacations
+
+
+@instrumented(rows="result")
+def load_users_fast(path: str):
+    """
+    Versión por columnas de utils.load_users.
+    """
+    users = []
+    invalid_rows = 0
+    print(f"Loading users from: {path}")
+
+    try:
+        with gc_paused():
+            columns, invalid_rows = load_columns(path, USER_CSV_HEADER, "users",
+                                                 "The CSV file is empty.")
+            if columns is None:
+                return users
+            users = _user_records(columns)
+
+        if not users:
+            print("No valid users were found in the file.")
+            return users
+
+    except FileNotFoundError:
+        print("The specified users file was not found.")
+    except UnicodeDecodeError:
+        print("Encoding error. Make sure it is a valid CSV file.")
+    except Exception as e:
+        print(f"An unexpected error occurred while loading users: {e}")
+
+    print(f"Users loaded: {len(users)}")
+    print(f"Invalid rows skipped: {invalid_rows}")
+    return users
@@ -0,0 +1,222 @@
+# instrumentation.py
+"""
+Métricas opcionales de tiempo: llamadas, latencias y filas por función.
+
+Desactivado por defecto; con enable() los decoradores y timer() empiezan
+a registrar. Desactivado, un decorado solo agrega una llamada y la
+lectura de un booleano.
+
+    @instrumented(rows="result")       # filas = len(resultado)
+    def load_vacations(path): ...
+
+    @instrumented(rows=1)              # filas = len(args[1])
+    def save_vacations(path, vacations): ...
+
+    with timer("session.menu_action") as t:
+        ...
+        t.rows = n
+"""
+import functools
+import json
+from time import perf_counter
+
+# latencias guardadas por métrica para calcular percentiles
+MAX_SAMPLES = 10_000
+
+_enabled = False
+_metrics = {}
+
+
+class Metric:
+    __slots__ = ('calls', 'errors', 'total', 'min', 'max', 'rows', 'samples')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.rows = None
+        self.samples = []
+
+    def add(self, elapsed, rows=None, error=False):
+        self.calls += 1
+        if error:
+            self.errors += 1
+        self.total += elapsed
+        if self.min is None or elapsed < self.min:
+            self.min = elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        if rows is not None:
+            self.rows = (self.rows or 0) + rows
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(elapsed)
+
+    def percentile(self, fraction):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+    def to_dict(self):
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'total_ms': round(self.total * 1000, 3),
+            'mean_ms': round(self.total * 1000 / self.calls, 3) if self.calls else 0.0,
+            'min_ms': round((self.min or 0.0) * 1000, 3),
+            'p50_ms': round(self.percentile(0.50) * 1000, 3),
+            'p95_ms': round(self.percentile(0.95) * 1000, 3),
+            'max_ms': round(self.max * 1000, 3),
+            'rows': self.rows,
+        }
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    _metrics.clear()
+
+
+def record(name, elapsed, rows=None, error=False):
+    metric = _metrics.get(name)
+    if metric is None:
+        metric = _metrics[name] = Metric()
+    metric.add(elapsed, rows, error)
+
+
+def _count_rows(rows, args, result):
+    """
+    rows: "result" (len del resultado), un índice de argumento (len de ese
+    argumento) o una función (args, result) -> int.
+    """
+    try:
+        if rows == "result":
+            return len(result)
+        if isinstance(rows, int):
+            return len(args[rows])
+        return rows(args, result)
+    except (TypeError, IndexError):
+        return None
+
+
+def instrumented(name=None, rows=None):
+    """
+    Decorador que registra la duración (y opcionalmente las filas) de
+    cada llamada bajo name (por defecto módulo.función).
+    """
+    def decorate(func):
+        metric_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                record(metric_name, perf_counter() - start, error=True)
+                raise
+            count = _count_rows(rows, args, result) if rows is not None else None
+            record(metric_name, perf_counter() - start, count)
+            return result
+
+        return wrapper
+    return decorate
+
+
+class _Timer:
+    __slots__ = ('name', 'rows', 'start')
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = None
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record(self.name, perf_counter() - self.start, self.rows, error=exc_type is not None)
+        return False
+
+
+class _NullTimer:
+    """
+    Lo que entrega timer() con la instrumentación apagada: acepta rows y
+    no registra nada.
+    """
+    __slots__ = ('rows',)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name):
+    """
+    Context manager para medir un bloque bajo name.
+    """
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(name)
+
+
+def metrics():
+    """
+    {nombre: dict con las estadísticas}, ordenado por tiempo total.
+    """
+    ordered = sorted(_metrics.items(), key=lambda item: item[1].total, reverse=True)
+    return {name: metric.to_dict() for name, metric in ordered}
+
+
+def print_summary():
+    data = metrics()
+    if not data:
+        print("No metrics recorded.")
+        return
+    print("\nTiming summary:")
+    print("-" * 110)
+    print(f"{'Operation':<45} {'Calls':>7} {'Total ms':>11} {'Mean ms':>10} "
+          f"{'p95 ms':>10} {'Max ms':>10} {'Rows':>10}")
+    print("-" * 110)
+    for name, m in data.items():
+        rows = "" if m['rows'] is None else m['rows']
+        print(f"{name:<45} {m['calls']:>7} {m['total_ms']:>11.2f} {m['mean_ms']:>10.2f} "
+              f"{m['p95_ms']:>10.2f} {m['max_ms']:>10.2f} {rows:>10}")
+    print("-" * 110)
+
+
+def write_metrics(path):
+    """
+    Guarda las métricas en un JSON. Retorna True si se pudo escribir.
+    """
+    try:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({'metrics': metrics()}, file, indent=2)
+            file.write("\n")
+        print(f"Metrics written to: {path}")
+        return True
+    except Exception as e:
+        print(f"Error while writing metrics: {e}")
+        return False
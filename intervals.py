@@ -0,0 +1,97 @@
+# intervals.py
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+
+
+class IntervalIndex:
+    """
+    Índice de intervalos cerrados [start, end] ordenado por inicio.
+
+    Guarda además la duración máxima vista: un intervalo que cruza
+    [start, end] tiene que empezar entre start - duración máxima y end,
+    así que la consulta es un bisect más el recorrido de esa ventana
+    (O(log n + k) mientras las duraciones sean acotadas, como las
+    vacaciones).
+    """
+
+    def __init__(self):
+        self._starts = []
+        self._ends = []
+        self._items = []
+        self._max_length = timedelta(0)
+
+    def __len__(self):
+        return len(self._items)
+
+    @classmethod
+    def from_items(cls, items):
+        """
+        Arma el índice de una vez desde [(start, end, item), ...] con un
+        solo sort (O(n log n)), en vez de un add por intervalo (cada uno
+        inserta en medio de las listas). Para la carga inicial.
+        """
+        index = cls()
+        # sort estable: los de mismo inicio quedan en orden de llegada, como con add
+        items = sorted(items, key=lambda entry: entry[0])
+        index._starts = [start for start, _, _ in items]
+        index._ends = [end for _, end, _ in items]
+        index._items = [item for _, _, item in items]
+        if items:
+            index._max_length = max(end - start for start, end, _ in items)
+        return index
+
+    def add(self, start, end, item):
+        # bisect_right: los intervalos con el mismo inicio quedan en orden de llegada
+        pos = bisect_right(self._starts, start)
+        self._starts.insert(pos, start)
+        self._ends.insert(pos, end)
+        self._items.insert(pos, item)
+        if end - start > self._max_length:
+            self._max_length = end - start
+
+    def remove(self, start, item):
+        """
+        Quita el item (comparado por identidad). Retorna False si no estaba.
+        """
+        pos = bisect_left(self._starts, start)
+        while pos < len(self._starts) and self._starts[pos] == start:
+            if self._items[pos] is item:
+                del self._starts[pos]
+                del self._ends[pos]
+                del self._items[pos]
+                return True
+            pos += 1
+        return False
+
+    def overlapping(self, start, end):
+        """
+        Items cuyos intervalos tocan algún día de [start, end].
+        """
+        low = bisect_left(self._starts, start - self._max_length)
+        high = bisect_right(self._starts, end)
+        ends = self._ends
+        items = self._items
+        return [items[i] for i in range(low, high) if ends[i] >= start]
+
+
+def peak_overlap(intervals, start, end):
+    """
+    Máximo de intervalos simultáneos en algún día de [start, end].
+    intervals: iterable de (inicio, fin); se recortan al rango.
+    """
+    events = []
+    for interval_start, interval_end in intervals:
+        first = max(interval_start, start)
+        last = min(interval_end, end)
+        if first > last:
+            continue
+        events.append((first.toordinal(), 1))
+        events.append((last.toordinal() + 1, -1))
+    # en el mismo día las salidas (-1) se procesan antes que las entradas
+    events.sort()
+    peak = current = 0
+    for _, delta in events:
+        current += delta
+        if current > peak:
+            peak = current
+    return peak
@@ -0,0 +1,314 @@
+# journal.py
+import json
+import os
+import uuid
+from contextlib import contextmanager
+
+from concurrency import FileLock
+from employees import save_data_employees
+from instrumentation import instrumented
+from records import Employee, Status, VacationRequest, parse_date
+from vacations import save_vacations
+
+JOURNAL_COMPACT_THRESHOLD = 200
+# primera línea del journal tras una compactación
+GENERATION_OP = "generation"
+
+
+class Journal:
+    """
+    Journal de solo-anexar (JSONL) con los cambios hechos desde la última
+    compactación. Cada mutación escribe una línea pequeña en lugar de
+    reescribir los CSV completos.
+
+    Operaciones registradas:
+    - add_employee: {'record': {...}}
+    - add_vacation: {'record': {...}}
+    - set_status:   {'employee_id', 'vacations_start_date',
+                     'vacations_end_date', 'approval_status',
+                     'previous_status'}
+
+    Una solicitud se identifica por (employee_id, inicio, fin) y puede
+    haber varias con la misma llave (una RECHAZADA y otra pedida después
+    para las mismas fechas): set_status cambia la que está en
+    previous_status.
+
+    El journal se comparte entre procesos (varios operadores): cada uno
+    recuerda hasta qué byte leyó y, con el bloqueo tomado, aplica solo las
+    líneas nuevas antes de escribir las suyas. La compactación empieza una
+    generación nueva (primera línea {'op': 'generation', 'id': ...}); un
+    proceso que ve otra generación llama a on_new_generation para
+    incorporar lo que quedó en los CSV y lee el journal nuevo desde el
+    principio.
+    """
+
+    def __init__(self, path: str, compact_threshold: int = JOURNAL_COMPACT_THRESHOLD,
+                 on_new_generation=None):
+        self.path = path
+        self.compact_threshold = compact_threshold
+        # entradas que escribió este proceso desde la última compactación
+        # (las de otros procesos o las reaplicadas al cargar no cuentan)
+        self.entries = 0
+        self.lock = FileLock(path)
+        self.on_new_generation = on_new_generation
+        self.generation = None
+        self.offset = 0
+        self.employees = None
+        self.vacations = None
+
+    def _write(self, lines):
+        """
+        Escribe las líneas al final (con el bloqueo ya tomado, después de
+        sincronizar) y las fuerza a disco.
+        """
+        with open(self.path, "ab") as file:
+            file.write("".join(lines).encode("utf-8"))
+            file.flush()
+            os.fsync(file.fileno())
+            self.offset = file.tell()
+        self.entries += len(lines)
+
+    @instrumented()
+    def append(self, op: str, **data):
+        """
+        Agrega una entrada al journal y la fuerza a disco.
+        Retorna False si no se pudo escribir (llamar antes de cambiar el
+        repositorio, para no aplicar un cambio que no quedó guardado).
+        """
+        entry = {'op': op}
+        entry.update(data)
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        try:
+            with self.lock:
+                self.sync()
+                self._write([line])
+            return True
+        except Exception as e:
+            print(f"Error while writing to journal: {e}")
+            return False
+
+    @instrumented()
+    def append_many(self, op: str, entries):
+        """
+        Agrega varias entradas de la misma operación con una sola
+        escritura y un solo fsync (cargas masivas).
+        entries: iterable de dicts con los datos de cada entrada.
+        Retorna False si no se pudo escribir.
+        """
+        return self.append_entries((op, data) for data in entries)
+
+    @instrumented()
+    def append_entries(self, entries):
+        """
+        Como append_many pero con operaciones mezcladas, en orden:
+        entries es un iterable de (op, dict con los datos).
+        """
+        lines = []
+        for op, data in entries:
+            entry = {'op': op}
+            entry.update(data)
+            lines.append(json.dumps(entry, ensure_ascii=False) + "\n")
+        if not lines:
+            return True
+        try:
+            with self.lock:
+                self.sync()
+                self._write(lines)
+            return True
+        except Exception as e:
+            print(f"Error while writing to journal: {e}")
+            return False
+
+    @contextmanager
+    def transaction(self):
+        """
+        Toma el bloqueo y aplica lo que escribieron otros procesos. Dentro
+        del bloque los repositorios están al día, así que se puede
+        verificar que el registro sigue como lo vio el operador antes de
+        cambiarlo y escribir la entrada sin que nadie se intercale.
+        """
+        with self.lock:
+            self.sync()
+            yield self
+
+    def _read_generation(self):
+        try:
+            with open(self.path, "rb") as file:
+                entry = json.loads(file.readline())
+        except FileNotFoundError:
+            return None
+        except (ValueError, UnicodeDecodeError):
+            return None
+        if isinstance(entry, dict) and entry.get('op') == GENERATION_OP:
+            return entry.get('id')
+        return None
+
+    def _read_entries(self, start):
+        """
+        Aplica las líneas desde el byte start y deja offset al final.
+        Retorna (aplicadas, sin efecto, inválidas).
+        """
+        applied = 0
+        skipped = 0
+        invalid_entries = 0
+        with open(self.path, "rb") as file:
+            file.seek(start)
+            for raw in file:
+                self.offset = file.tell()
+                if not raw.strip():
+                    continue
+                try:
+                    entry = json.loads(raw)
+                    op = entry['op']
+                except (ValueError, KeyError, TypeError):
+                    # típicamente la última línea, cortada por un fallo
+                    invalid_entries += 1
+                    continue
+
+                if op == GENERATION_OP:
+                    continue
+                try:
+                    if self._apply(op, entry, self.employees, self.vacations):
+                        applied += 1
+                    else:
+                        skipped += 1
+                except (ValueError, KeyError, TypeError):
+                    invalid_entries += 1
+        return applied, skipped, invalid_entries
+
+    @instrumented()
+    def replay(self, employees, vacations):
+        """
+        Reaplica sobre los repositorios cargados de los CSV las entradas
+        pendientes. Los repositorios quedan asociados al journal para las
+        sincronizaciones siguientes.
+        Es idempotente: un empleado que ya existe, una solicitud con una
+        activa (PENDING o APPROVED) de la misma llave o un cambio de estado
+        cuya solicitud ya no está en previous_status no tienen efecto, así
+        que es seguro reaplicar tras una compactación interrumpida.
+        """
+        self.employees = employees
+        self.vacations = vacations
+        applied = 0
+        skipped = 0
+        invalid_entries = 0
+
+        try:
+            with self.lock:
+                self.generation = self._read_generation()
+                self.offset = 0
+                applied, skipped, invalid_entries = self._read_entries(0)
+        except FileNotFoundError:
+            return applied
+        except Exception as e:
+            print(f"An unexpected error occurred while replaying the journal: {e}")
+
+        print(f"Journal entries replayed: {applied}")
+        if skipped:
+            print(f"Journal entries already applied (no effect): {skipped}")
+        if invalid_entries:
+            print(f"Invalid journal entries skipped: {invalid_entries}")
+        return applied
+
+    @instrumented()
+    def sync(self):
+        """
+        Aplica las entradas que otros procesos escribieron desde la última
+        lectura (solo esas líneas). Retorna cuántas cambiaron algo.
+        """
+        if self.vacations is None:
+            return 0
+        with self.lock:
+            generation = self._read_generation()
+            try:
+                size = os.path.getsize(self.path)
+            except FileNotFoundError:
+                size = 0
+            if generation != self.generation or size < self.offset:
+                # otro proceso compactó: lo anterior ya está en los CSV
+                if self.on_new_generation is not None:
+                    self.on_new_generation()
+                self.generation = generation
+                self.offset = 0
+                self.entries = 0
+            if size == self.offset:
+                return 0
+            applied, _, _ = self._read_entries(self.offset)
+            return applied
+
+    @staticmethod
+    def _apply(op, entry, employees, vacations):
+        """
+        Aplica una entrada; retorna True si cambió algo.
+        Lanza ValueError/KeyError si la entrada está mal formada.
+        """
+        if op == "add_employee":
+            record = Employee.from_row(entry['record'])
+            if employees.exists(record.employee_id):
+                return False
+            employees.add(record)
+            return True
+
+        if op == "add_vacation":
+            record = VacationRequest.from_row(entry['record'])
+            # una activa con la misma llave es esta misma solicitud ya
+            # aplicada (no puede haber dos activas que se crucen); las
+            # RECHAZADAS no cuentan: se puede volver a pedir esas fechas
+            existing = vacations.get(record.key)
+            if existing is not None and existing.status is not Status.REJECTED:
+                return False
+            return vacations.add(record) is not None
+
+        if op == "set_status":
+            key = (entry['employee_id'],
+                   parse_date(entry['vacations_start_date']),
+                   parse_date(entry['vacations_end_date']))
+            previous = entry.get('previous_status')
+            if previous is not None:
+                v = vacations.find(key, Status.parse(previous))
+            else:
+                # entradas anteriores a previous_status
+                v = vacations.get(key)
+            if v is None:
+                return False
+            return vacations.update_status(v, Status.parse(entry['approval_status']))
+
+        raise ValueError(f"unknown journal operation: {op}")
+
+    def needs_compaction(self):
+        return self.entries >= self.compact_threshold
+
+    @instrumented()
+    def compact(self, employees_path: str, employees, vacations_path: str, vacations,
+                employees_changed=True, vacations_changed=True):
+        """
+        Vuelca el estado completo a los CSV (escritura atómica) y empieza
+        una generación nueva del journal, con el bloqueo tomado. Si el
+        proceso muere antes, el siguiente arranque reaplica entradas que ya
+        están en los CSV, lo cual no tiene efecto.
+        employees_changed / vacations_changed en False omiten un archivo
+        que no tiene cambios respecto al CSV.
+        """
+        with self.lock:
+            self.sync()
+            if employees_changed and not save_data_employees(employees_path, employees):
+                return False
+            if vacations_changed and not save_vacations(vacations_path, vacations):
+                return False
+            generation = uuid.uuid4().hex
+            line = json.dumps({'op': GENERATION_OP, 'id': generation}) + "\n"
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, "wb") as file:
+                    file.write(line.encode("utf-8"))
+                    file.flush()
+                    os.fsync(file.fileno())
+                    offset = file.tell()
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                print(f"Error while truncating journal: {e}")
+                return False
+            self.generation = generation
+            self.offset = offset
+            self.entries = 0
+            return True
@@ -1,4 +1,4 @@
-from utils import load_users
+from auth import UserStore
 
 
 def validate_username(username: str):
@@ -24,8 +24,7 @@ def collect_username(users):
             if username is None:
                 continue
 
-            found = any(u['username'] == username for u in users)
-            if found:
+            if username in users:
                 return username
             else:
                 print("Username not found. Please try again.")
@@ -47,12 +46,7 @@ def collect_password(username, users):
             if password is None:
                 continue
 
-    
-            matched_user = None
-            for user in users:
-                if user['username'] == username and user['password'] == password:
-                    matched_user = user
-                    break
+            matched_user = users.verify(username, password)
 
             if matched_user is None:
                 print("Incorrect password. Please try again.")
@@ -78,6 +72,12 @@ def login(users):
     print("Welcome to the Vacations Manager System!\n"
           "Please enter your credentials to log in.\n")
 
+    if not isinstance(users, UserStore):
+        users = UserStore(users)
+    if users.plaintext_count:
+        print(f"Warning: {users.plaintext_count} users still have plaintext passwords. "
+              "Run 'python auth.py migrate' to hash them.\n")
+
     username = collect_username(users)
     if username is None:
         return False
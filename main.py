@@ -1,26 +1,68 @@
 from employees import (
-    load_data_employees,
-    save_data_employees,
     collect_employee_data,
     build_employee_record,
     add_employee,
     view_all_employees,
     get_employee,
 )
+from analytics import AbsenceAggregates, view_absence_by_department, view_absence_trend
+from auth import UserStore
 from login import login
-from utils import load_users, validate_menu_option
+from utils import validate_menu_option
 from vacations import (
-    load_vacations,
-    save_vacations,
     create_vacation_request,
+    load_holidays,
     approve_or_reject_request,
     show_employee_history,
 )
-from reports import export_approved_report
+from reports import (
+    export_approved_report,
+    export_approved_report_range,
+    export_balances_report,
+)
+from balances import view_all_balances
+from decisions import bulk_decide_interactive
+from instrumentation import enable, is_enabled, print_summary, write_metrics
+from occupancy import OccupancyCalendar, export_occupancy_report, view_absence_calendar
+from search import EmployeeSearchIndex, print_search_results
+from storage import open_storage
+from year_end_reports import export_year_end_report
 
 EMPLOYEE_FILE = "employees.csv"
 USERS_FILE = "users.csv"
 VACATIONS_FILE = "vacations.csv"
+HOLIDAYS_FILE = "holidays.csv"
+JOURNAL_FILE = "journal.jsonl"
+SNAPSHOT_FILE = "data.snapshot"
+DATABASE_FILE = "vacations.db"
+
+# "csv": datos en memoria, persistidos en los CSV (opciones de abajo).
+# "sqlite": datos en DATABASE_FILE con consultas indexadas
+# (crear con: python sqlite_storage.py migrate).
+STORAGE_BACKEND = "csv"
+
+# True: cada cambio se anexa al journal y los CSV se reescriben solo al
+# compactar. False: se reescribe el CSV completo después de cada cambio.
+USE_JOURNAL = True
+
+# Solo sin journal: segundos que se esperan para juntar varios cambios en
+# un solo guardado de los CSV (también se guarda al salir, incluso con
+# Ctrl+C). None: guardar después de cada cambio.
+WRITE_BEHIND_SECONDS = None
+
+# True: carga los CSV por bloques y columnas (fastload.py), mucho más
+# rápido con archivos grandes. False: carga fila a fila con csv.reader.
+USE_FAST_LOADER = True
+
+# True: arranca desde un snapshot binario de los tres CSV mientras éstos
+# no cambien (snapshot.py); se reconstruye solo cuando cambian.
+USE_SNAPSHOT = True
+
+# True: mide llamadas, tiempos y filas de carga, guardado, reportes y
+# aprobaciones (instrumentation.py); al salir muestra el resumen y lo
+# guarda en METRICS_FILE.
+INSTRUMENTATION = False
+METRICS_FILE = "metrics.json"
 
 
 def main_menu():
@@ -31,80 +73,175 @@ def main_menu():
           "4. Add Vacation Request\n"
           "5. Approve/Deny vacation requests\n"
           "6. View requests history by employee\n"
-          "7. Export data to CSV by month and year\n"
-          "8. Exit\n")
-    option = validate_menu_option(1, 8)
+          "7. Reports and exports\n"
+          "8. Bulk approve/reject pending requests\n"
+          "9. Exit\n")
+    option = validate_menu_option(1, 9)
     return option
 
 
-def main():
-    users = load_users(USERS_FILE)
-    employees = load_data_employees(EMPLOYEE_FILE)
-    vacations = load_vacations(VACATIONS_FILE)
-
-    sesion = login(users)
-
-    if sesion is True:
-        print("\nAccessing the Vacations Manager System...\n")
-        while True:
-            option = main_menu()
-
-            if option == 1:
-    
-                data = collect_employee_data(employees)
-                if data is not None:
-                    employee_id, full_name, position, department, hire_date = data
-                    employee = build_employee_record(
-                        employee_id,
-                        full_name,
-                        position,
-                        department,
-                        hire_date
-                    )
-                    add_employee(employees, employee)
-                    save_data_employees(EMPLOYEE_FILE, employees)
+def reports_menu():
+    print("\nReports Menu\n"
+          "\n1. Export approved vacations to CSV by month and year\n"
+          "2. Export approved vacations to CSV for a range of months\n"
+          "3. View vacation balances for all employees\n"
+          "4. Export vacation balances for all employees to CSV\n"
+          "5. Year-end closing: reports by month and department\n"
+          "6. Absence trend by month (one department or all)\n"
+          "7. Absence by department for a range of months\n"
+          "8. Absence calendar: employees out per day and who is out\n"
+          "9. Export employees out per day to CSV for a date range\n"
+          "10. Back\n")
+    option = validate_menu_option(1, 10)
+    return option
+
+
+def run_reports_menu(employees, vacations, holidays, aggregates, occupancy):
+    while True:
+        option = reports_menu()
+
+        if option == 1:
+            export_approved_report(vacations, employees, holidays)
+
+        elif option == 2:
+            export_approved_report_range(vacations, employees, holidays)
+
+        elif option == 3:
+            view_all_balances(employees, vacations)
+
+        elif option == 4:
+            export_balances_report(employees, vacations)
+
+        elif option == 5:
+            export_year_end_report(vacations, employees, holidays)
+
+        elif option == 6:
+            view_absence_trend(aggregates)
+
+        elif option == 7:
+            view_absence_by_department(aggregates)
+
+        elif option == 8:
+            view_absence_calendar(occupancy)
+
+        elif option == 9:
+            export_occupancy_report(occupancy)
+
+        elif option == 10:
+            break
+
+
+def run_main_menu(storage, employees, vacations, holidays):
+    journal = storage.journal
+    search_index = None
+    # los agregados se arman en la primera consulta y siguen las aprobaciones
+    aggregates = AbsenceAggregates(employees, vacations, holidays)
+    occupancy = OccupancyCalendar(employees, vacations)
+    while True:
+        option = main_menu()
+        # lo que guardaron otros operadores mientras tanto
+        storage.refresh()
+
+        if option == 1:
+
+            data = collect_employee_data(employees)
+            if data is not None:
+                employee_id, full_name, position, department, hire_date = data
+                employee = build_employee_record(
+                    employee_id,
+                    full_name,
+                    position,
+                    department,
+                    hire_date
+                )
+                if add_employee(employees, employee, journal):
+                    storage.employees_changed()
                     print("Employee added successfully.")
 
-            elif option == 2:
-                view_all_employees(employees)
-
-            elif option == 3:
-                emp_id = input("Enter Employee ID to search: ").strip()
-                emp = get_employee(employees, emp_id)
-                if emp:
-                    print("\nEmployee found:")
-                    print(f"ID: {emp['employee_id']}")
-                    print(f"Name: {emp['full_name']}")
-                    print(f"Position: {emp['position']}")
-                    print(f"Department: {emp['department']}")
-                    print(f"Hire date: {emp['hire_date']}")
+        elif option == 2:
+            view_all_employees(employees)
+
+        elif option == 3:
+            query = input("Enter Employee ID or name/position/department to search: ").strip()
+            emp = get_employee(employees, query)
+            if emp:
+                print("\nEmployee found:")
+                print(f"ID: {emp.employee_id}")
+                print(f"Name: {emp.full_name}")
+                print(f"Position: {emp.position}")
+                print(f"Department: {emp.department}")
+                print(f"Hire date: {emp.hire_date_text}")
+            else:
+                # el índice se arma en la primera búsqueda por texto
+                if search_index is None:
+                    search_index = EmployeeSearchIndex(employees)
                 else:
-                    print("Employee not found.")
+                    search_index.update(employees)
+                print_search_results(search_index.search(query))
+
+        elif option == 4:
+            
+            create_vacation_request(employees, vacations, journal, holidays)
+            storage.vacations_changed()
 
-            elif option == 4:
-                
-                create_vacation_request(employees, vacations)
-                save_vacations(VACATIONS_FILE, vacations)
+        elif option == 5:
+           
+            approve_or_reject_request(vacations, journal, employees)
+            storage.vacations_changed()
 
-            elif option == 5:
-               
-                approve_or_reject_request(vacations)
-                save_vacations(VACATIONS_FILE, vacations)
+        elif option == 6:
+            
+            show_employee_history(vacations, employees)
 
-            elif option == 6:
-                
-                show_employee_history(vacations, employees)
+        elif option == 7:
+            
+            run_reports_menu(employees, vacations, holidays, aggregates, occupancy)
 
-            elif option == 7:
-                
-                export_approved_report(vacations, employees)
+        elif option == 8:
 
-            elif option == 8:
-                print("Exiting system...")
-                break
+            bulk_decide_interactive(employees, vacations, journal)
+            storage.vacations_changed()
 
-    else:
-        print("Invalid credentials. Access denied.")
+        elif option == 9:
+            print("Exiting system...")
+            break
+
+
+def main():
+    if INSTRUMENTATION:
+        enable()
+
+    storage = open_storage(
+        STORAGE_BACKEND,
+        USERS_FILE,
+        EMPLOYEE_FILE,
+        VACATIONS_FILE,
+        DATABASE_FILE,
+        journal_path=JOURNAL_FILE if USE_JOURNAL else None,
+        snapshot_path=SNAPSHOT_FILE if USE_SNAPSHOT else None,
+        fast_loader=USE_FAST_LOADER,
+        write_behind=WRITE_BEHIND_SECONDS,
+    )
+    users, employees, vacations = storage.load()
+    users = UserStore(users)
+    holidays = load_holidays(HOLIDAYS_FILE)
+
+    try:
+        sesion = login(users)
+        if sesion is True:
+            print("\nAccessing the Vacations Manager System...\n")
+            run_main_menu(storage, employees, vacations, holidays)
+        else:
+            print("Invalid credentials. Access denied.")
+    except KeyboardInterrupt:
+        print("\nInterrupted. Saving pending changes...")
+    finally:
+        # guarda lo pendiente (write-behind / compactación) pase lo que pase
+        storage.close()
+
+    if is_enabled():
+        print_summary()
+        write_metrics(METRICS_FILE)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,381 @@
+# occupancy.py
+"""
+Ocupación diaria: cuántos empleados están de vacaciones cada día.
+
+Para cada departamento (y para el total) se guarda un arreglo de
+diferencias sobre un eje de días: una solicitud APROBADA de start a end
+suma 1 en start y resta 1 en end + 1. Con una suma acumulada se obtiene la
+cantidad de ausentes por día (consulta puntual O(1)) y con una segunda
+suma acumulada los días-persona de cualquier rango en O(1). Las sumas se
+recalculan solo si hubo cambios desde la última consulta.
+
+Se arma en una sola pasada la primera vez que se consulta y se mantiene
+con on_approval_change del repositorio, como analytics.py.
+"""
+import csv
+from calendar import Calendar, monthrange
+from datetime import date, timedelta
+from itertools import accumulate
+
+from analytics import NO_DEPARTMENT
+from instrumentation import instrumented
+from intervals import IntervalIndex
+from records import DATE_FORMAT, Status, parse_date
+from reports import read_period
+
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+CALENDAR_CELL = 10
+
+
+class OccupancyCalendar:
+    """
+    Ausentes por día, por departamento y en total, a partir de las
+    solicitudes aprobadas.
+    """
+
+    def __init__(self, employees, vacations):
+        self._employees = employees
+        self._vacations = vacations
+        self._origin = None
+        self._length = 0
+        # departamento en minúsculas o None para el total -> arreglo de diferencias
+        self._diff = {}
+        # cache de sumas acumuladas: key -> (ausentes por día, acumulado de ausentes)
+        self._sums = {}
+        self._names = {}
+        # solicitudes aprobadas: llave -> [solicitud, departamento, repeticiones],
+        # y sus intervalos por departamento, para "quién falta"
+        self._approved = {}
+        self._intervals = {}
+        self._built = False
+
+    @instrumented(rows=lambda args, result: len(args[0]._approved))
+    def build(self):
+        """
+        Arma los arreglos recorriendo una vez las solicitudes aprobadas y se
+        suscribe a los cambios de aprobación del repositorio.
+        """
+        approved = self._vacations.with_status(Status.APPROVED)
+        self._origin = None
+        self._length = 0
+        self._diff = {}
+        self._sums = {}
+        self._names = {}
+        self._approved = {}
+        self._intervals = {}
+        if approved:
+            first = min(v.start_date for v in approved).toordinal()
+            last = max(v.end_date for v in approved).toordinal()
+            self._origin = first
+            self._length = last - first + 1
+        # los intervalos se ordenan una sola vez al final
+        pending = {}
+        for vacation in approved:
+            self.apply(vacation, 1, pending)
+        for department, entries in pending.items():
+            self._intervals[department] = IntervalIndex.from_items(entries)
+        if not self._built:
+            self._vacations.on_approval_change(self.apply)
+            self._built = True
+
+    def _ensure_built(self):
+        if not self._built:
+            self.build()
+
+    def _department(self, employee_id):
+        employee = self._employees.get(employee_id)
+        name = employee.department.strip() if employee else ""
+        name = name or NO_DEPARTMENT
+        key = name.lower()
+        self._names.setdefault(key, name)
+        return key
+
+    def _ensure_axis(self, first, last):
+        """
+        Agranda el eje (ordinales) para que cubra [first, last].
+        """
+        if self._origin is None:
+            self._origin, self._length = first, last - first + 1
+            return
+        if first < self._origin:
+            pad = [0] * (self._origin - first)
+            for key, diff in self._diff.items():
+                self._diff[key] = pad + diff
+            self._length += len(pad)
+            self._origin = first
+        end = self._origin + self._length
+        if last >= end:
+            extra = last - end + 1
+            for diff in self._diff.values():
+                diff.extend([0] * extra)
+            self._length += extra
+        self._sums.clear()
+
+    def apply(self, vacation, sign, pending=None):
+        """
+        Suma (sign=1) o resta (sign=-1) una solicitud aprobada.
+        pending (solo en build): departamento -> intervalos que se indexan
+        juntos al terminar.
+        """
+        entry = self._approved.get(vacation.key)
+        if sign > 0:
+            if entry is not None:
+                # solicitud repetida en el CSV: el empleado falta una sola vez
+                entry[2] += 1
+                return
+            department = self._department(vacation.employee_id)
+            self._approved[vacation.key] = [vacation, department, 1]
+            if pending is not None:
+                pending.setdefault(department, []).append(
+                    (vacation.start_date, vacation.end_date, vacation))
+            else:
+                index = self._intervals.get(department)
+                if index is None:
+                    index = self._intervals[department] = IntervalIndex()
+                index.add(vacation.start_date, vacation.end_date, vacation)
+        else:
+            if entry is None:
+                return
+            entry[2] -= 1
+            if entry[2] > 0:
+                return
+            # con SQLite llega otro objeto: se quita el que se guardó
+            stored, department, _ = self._approved.pop(vacation.key)
+            self._intervals[department].remove(stored.start_date, stored)
+
+        first = vacation.start_date.toordinal()
+        last = vacation.end_date.toordinal()
+        if self._origin is None or first < self._origin or last >= self._origin + self._length:
+            self._ensure_axis(first, last)
+        for key in (department, None):
+            diff = self._diff.get(key)
+            if diff is None:
+                # una posición extra para el -1 del día siguiente al último
+                diff = self._diff[key] = [0] * (self._length + 1)
+            diff[first - self._origin] += sign
+            diff[last - self._origin + 1] -= sign
+            self._sums.pop(key, None)
+
+    def _key(self, department):
+        return department.strip().lower() if department else None
+
+    def _sums_for(self, key):
+        sums = self._sums.get(key)
+        if sums is None:
+            diff = self._diff.get(key)
+            if diff is None:
+                return None
+            counts = list(accumulate(diff[:self._length]))
+            cumulative = [0]
+            cumulative.extend(accumulate(counts))
+            sums = self._sums[key] = (counts, cumulative)
+        return sums
+
+    def _clip(self, start_date, end_date):
+        """
+        Rango [start_date, end_date] como posiciones del eje, recortado.
+        """
+        first = max(start_date.toordinal() - self._origin, 0)
+        last = min(end_date.toordinal() - self._origin, self._length - 1)
+        return first, last
+
+    def departments(self):
+        self._ensure_built()
+        return sorted(self._names.values(), key=str.lower)
+
+    def out_on(self, day, department=None):
+        """
+        Cantidad de ausentes el día dado.
+        """
+        self._ensure_built()
+        sums = self._sums_for(self._key(department))
+        if sums is None:
+            return 0
+        position = day.toordinal() - self._origin
+        if position < 0 or position >= self._length:
+            return 0
+        return sums[0][position]
+
+    def daily(self, start_date, end_date, department=None):
+        """
+        [(fecha, ausentes), ...] para cada día del rango.
+        """
+        self._ensure_built()
+        days = (end_date - start_date).days + 1
+        result = [0] * max(days, 0)
+        sums = self._sums_for(self._key(department))
+        if sums is not None:
+            first, last = self._clip(start_date, end_date)
+            offset = self._origin - start_date.toordinal()
+            for position in range(first, last + 1):
+                result[position + offset] = sums[0][position]
+        return [(start_date + timedelta(days=i), count) for i, count in enumerate(result)]
+
+    def person_days(self, start_date, end_date, department=None):
+        """
+        Suma de ausentes de todos los días del rango, en O(1).
+        """
+        self._ensure_built()
+        sums = self._sums_for(self._key(department))
+        if sums is None:
+            return 0
+        first, last = self._clip(start_date, end_date)
+        if first > last:
+            return 0
+        cumulative = sums[1]
+        return cumulative[last + 1] - cumulative[first]
+
+    def peak(self, start_date, end_date, department=None):
+        """
+        (día con más ausentes, cantidad) del rango; el primero si empatan.
+        (None, 0) si nadie falta en el rango.
+        """
+        self._ensure_built()
+        sums = self._sums_for(self._key(department))
+        if sums is None:
+            return None, 0
+        first, last = self._clip(start_date, end_date)
+        if first > last:
+            return None, 0
+        counts = sums[0]
+        best = max(range(first, last + 1), key=counts.__getitem__)
+        if counts[best] == 0:
+            return None, 0
+        return date.fromordinal(self._origin + best), counts[best]
+
+    def who_is_out(self, day, department=None):
+        """
+        Solicitudes aprobadas que cubren el día dado, ordenadas por nombre.
+        """
+        self._ensure_built()
+        key = self._key(department)
+        keys = [key] if key is not None else list(self._intervals)
+        result = []
+        for key in keys:
+            index = self._intervals.get(key)
+            if index is not None:
+                result.extend(index.overlapping(day, day))
+        result.sort(key=lambda v: (v.full_name.lower(), v.employee_id))
+        return result
+
+
+def _read_department(occupancy):
+    """
+    Pide un departamento (Enter para todos). Retorna (ok, nombre o None).
+    """
+    department = input("Department (Enter for all): ").strip()
+    if not department:
+        return True, None
+    names = {name.lower(): name for name in occupancy.departments()}
+    if department.lower() not in names:
+        print("No approved vacations found for that department.")
+        return False, None
+    return True, names[department.lower()]
+
+
+def print_who_is_out(occupancy, day, department=None):
+    absent = occupancy.who_is_out(day, department)
+    if not absent:
+        print(f"Nobody is out on {day.strftime(DATE_FORMAT)}.")
+        return
+    print(f"\nOut on {day.strftime(DATE_FORMAT)} ({len(absent)}):")
+    print(f"{'ID':<10} {'Nombre completo':<25} {'Desde':<12} {'Hasta':<12}")
+    print("-" * 62)
+    for v in absent:
+        print(f"{v.employee_id:<10} {v.full_name:<25} "
+              f"{v.start_date.strftime(DATE_FORMAT):<12} {v.end_date.strftime(DATE_FORMAT):<12}")
+    print("-" * 62)
+
+
+def view_absence_calendar(occupancy):
+    """
+    Calendario de un mes con la cantidad de ausentes por día, el día pico,
+    y el detalle de quién falta en un día a elección.
+    """
+    period = read_period("Enter month (YYYY-MM): ")
+    if period is None:
+        return
+    ok, department = _read_department(occupancy)
+    if not ok:
+        return
+
+    year, month = period
+    first_day = date(year, month, 1)
+    last_day = date(year, month, monthrange(year, month)[1])
+    counts = dict(occupancy.daily(first_day, last_day, department))
+
+    print(f"\nAbsence calendar {year}-{month:02} - {department or 'all departments'} "
+          f"(day: employees out)")
+    print("".join(f"{name:<{CALENDAR_CELL}}" for name in WEEKDAYS).rstrip())
+    for week in Calendar().monthdatescalendar(year, month):
+        cells = []
+        for day in week:
+            cell = f"{day.day:>2}: {counts[day]}" if day.month == month else ""
+            cells.append(f"{cell:<{CALENDAR_CELL}}")
+        print("".join(cells).rstrip())
+
+    peak_day, peak_count = occupancy.peak(first_day, last_day, department)
+    if peak_day is None:
+        print("\nNobody is out this month.")
+        return
+    print(f"\nPeak: {peak_day.strftime(DATE_FORMAT)} with {peak_count} employees out. "
+          f"Person-days: {occupancy.person_days(first_day, last_day, department)}")
+
+    while True:
+        text = input("Day of the month to list who is out (Enter to go back): ").strip()
+        if not text:
+            return
+        if not text.isdigit() or not 1 <= int(text) <= last_day.day:
+            print(f"Day must be between 1 and {last_day.day}.")
+            continue
+        print_who_is_out(occupancy, date(year, month, int(text)), department)
+
+
+def occupancy_filename(start_date, end_date):
+    return (f"reporte_ausencias_diarias_{start_date.strftime('%Y_%m_%d')}_"
+            f"{end_date.strftime('%Y_%m_%d')}.csv")
+
+
+@instrumented(rows="result")
+def export_occupancy(occupancy, start_date, end_date):
+    """
+    Escribe un CSV con una fila por día: fecha, ausentes de cada
+    departamento y total. Retorna las filas escritas (sin cabecera).
+    """
+    departments = occupancy.departments()
+    columns = [occupancy.daily(start_date, end_date, name) for name in departments]
+    columns.append(occupancy.daily(start_date, end_date))
+    rows = [[day.strftime(DATE_FORMAT), *(column[i][1] for column in columns)]
+            for i, (day, _) in enumerate(columns[-1])]
+
+    with open(occupancy_filename(start_date, end_date), "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(['date', *departments, 'total'])
+        writer.writerows(rows)
+    return rows
+
+
+def export_occupancy_report(occupancy):
+    """
+    Pide un rango de fechas y exporta la ocupación diaria a CSV.
+    """
+    try:
+        start_date = parse_date(input("Enter start date (YYYY-MM-DD): ").strip())
+        end_date = parse_date(input("Enter end date (YYYY-MM-DD): ").strip())
+    except ValueError:
+        print("Invalid date. Please use YYYY-MM-DD.")
+        return
+    if end_date < start_date:
+        print("End date cannot be before start date.")
+        return
+
+    try:
+        rows = export_occupancy(occupancy, start_date, end_date)
+    except Exception as e:
+        print(f"Error while generating report: {e}")
+        return
+    print(f"Report generated successfully: {occupancy_filename(start_date, end_date)} "
+          f"({len(rows)} rows)")
+    peak_day, peak_count = occupancy.peak(start_date, end_date)
+    if peak_day is not None:
+        print(f"Peak: {peak_day.strftime(DATE_FORMAT)} with {peak_count} employees out.")
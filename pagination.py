@@ -0,0 +1,135 @@
+# pagination.py
+"""
+Listados paginados para la consola.
+
+Las filas llegan como un generador que las formatea a medida que se
+muestran, y cada página se escribe con una sola llamada a write (en vez de
+un print por fila). Entre páginas: Enter sigue, q corta y un número cambia
+el tamaño de página.
+"""
+import heapq
+import shlex
+import sys
+from itertools import islice
+
+from records import Status, parse_date
+
+PAGE_SIZE = 20
+
+
+def lazy_sorted(items, key):
+    """
+    Genera items ordenados por key sin ordenar toda la lista: arma un heap
+    en O(n) y saca un elemento por fila mostrada, así la primera página
+    cuesta O(n + page_size log n). Los empates quedan en el orden original.
+    """
+    heap = [(key(item), seq, item) for seq, item in enumerate(items)]
+    heapq.heapify(heap)
+    while heap:
+        yield heapq.heappop(heap)[2]
+
+
+def parse_filters(text, allowed):
+    """
+    Convierte "dept=Sales status=pending from=2025-01-01 sort=date" en un
+    dict. Los valores con espacios van entre comillas (dept="Human
+    Resources"). status se convierte en Status y from/to en fechas.
+    Retorna None (con el mensaje ya impreso) si algo es inválido.
+    """
+    try:
+        tokens = shlex.split(text)
+    except ValueError:
+        print("Invalid filter: unbalanced quotes.")
+        return None
+
+    filters = {}
+    for token in tokens:
+        name, sep, value = token.partition("=")
+        name = name.strip().lower()
+        if not sep or name not in allowed or not value.strip():
+            print(f"Invalid filter '{token}'. Use: {', '.join(f'{k}=...' for k in allowed)}")
+            return None
+        value = value.strip()
+        try:
+            if name == "status":
+                value = Status.parse(value)
+            elif name in ("from", "to"):
+                value = parse_date(value)
+        except ValueError:
+            print(f"Invalid value for {name}: {value}")
+            return None
+        filters[name] = value
+
+    if "from" in filters and "to" in filters and filters["to"] < filters["from"]:
+        print("'to' date cannot be before 'from' date.")
+        return None
+    return filters
+
+
+def read_filters(allowed, sort_options):
+    """
+    Pide en una línea los filtros del listado (Enter para ninguno).
+    """
+    keys = " ".join(f"{k}=..." for k in allowed if k != "sort")
+    print(f"Filters: {keys}, sort={'|'.join(sort_options)}")
+    filters = parse_filters(input("Filter (Enter for none): "), allowed)
+    if filters is None:
+        return None
+    sort = filters.get("sort")
+    if sort is not None and sort.lower() not in sort_options:
+        print(f"Invalid sort. Options: {', '.join(sort_options)}")
+        return None
+    if sort is not None:
+        filters["sort"] = sort.lower()
+    return filters
+
+
+def _ask_next_page(page_size):
+    """
+    Retorna el tamaño de la siguiente página o None para terminar.
+    """
+    answer = input("Enter for next page, q to stop, or a number to change page size: ").strip()
+    if answer.lower() == "q":
+        return None
+    if answer.isdigit() and int(answer) > 0:
+        return int(answer)
+    return page_size
+
+
+def paginate(lines, title, header, width, page_size=PAGE_SIZE, out=None):
+    """
+    Muestra lines (iterable de filas ya formateadas, idealmente un
+    generador) de a page_size por página. Solo se formatean las filas que
+    se llegan a mostrar. Retorna cuántas filas se mostraron.
+    """
+    out = out or sys.stdout
+    lines = iter(lines)
+    rule = "-" * width
+    pending = next(lines, None)
+    if pending is None:
+        return 0
+
+    shown = 0
+    while pending is not None:
+        page = [pending]
+        page.extend(islice(lines, page_size - 1))
+        pending = next(lines, None)
+
+        first = shown + 1
+        shown += len(page)
+        last = "" if pending is not None else " (end)"
+        out.write("\n".join([
+            f"\n{title} - rows {first}-{shown}{last}",
+            rule,
+            header,
+            rule,
+            *page,
+            rule,
+        ]) + "\n")
+        out.flush()
+
+        if pending is not None:
+            page_size = _ask_next_page(page_size)
+            if page_size is None:
+                break
+    return shown
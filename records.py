@@ -0,0 +1,182 @@
+# records.py
+from array import array
+from datetime import date, datetime
+from enum import Enum
+from functools import lru_cache
+
+DATE_FORMAT = "%Y-%m-%d"
+
+
+@lru_cache(maxsize=4096)
+def parse_date(date_str: str):
+    # fromisoformat es varias veces más rápido que strptime; se usa solo
+    # con la forma exacta YYYY-MM-DD para aceptar lo mismo que strptime
+    if len(date_str) == 10 and date_str[4] == "-" and date_str[7] == "-":
+        try:
+            return date.fromisoformat(date_str)
+        except ValueError:
+            pass
+    return datetime.strptime(date_str, DATE_FORMAT).date()
+
+
+class Status(Enum):
+    """
+    Estados de una solicitud. Se normaliza una sola vez al cargar, así que
+    el resto del código compara con `is` en lugar de .upper() == "...".
+    """
+    PENDING = "PENDING"
+    APPROVED = "APPROVED"
+    REJECTED = "REJECTED"
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Convierte el texto del CSV (sin importar mayúsculas) en el estado.
+        Lanza ValueError si no es un estado conocido.
+        """
+        return cls(text.strip().upper())
+
+
+class Employee:
+    """
+    Registro de empleado. hire_date_text es el texto tal como se ingresó o
+    se leyó del CSV; hire_date es la fecha ya parseada (None si el formato
+    es inválido).
+    """
+    __slots__ = ('employee_id', 'full_name', 'position', 'department',
+                 'hire_date_text', 'hire_date')
+
+    def __init__(self, employee_id, full_name, position, department, hire_date_text):
+        self.employee_id = employee_id
+        self.full_name = full_name
+        self.position = position
+        self.department = department
+        self.hire_date_text = hire_date_text
+        try:
+            self.hire_date = parse_date(hire_date_text)
+        except ValueError:
+            self.hire_date = None
+
+    def to_row(self):
+        """
+        Dict con las columnas de employees.csv.
+        """
+        return {
+            'employee_id': self.employee_id,
+            'full_name': self.full_name,
+            'position': self.position,
+            'department': self.department,
+            'hire_date': self.hire_date_text,
+        }
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(row['employee_id'], row['full_name'], row['position'],
+                   row['department'], row['hire_date'])
+
+
+class VacationRequest:
+    """
+    Registro de solicitud de vacaciones con fechas ya parseadas y el
+    estado como Status. month/year son el período de la fecha de inicio.
+    saved_status es el sello del registro: el estado tal como se leyó o se
+    guardó por última vez en el CSV compartido; al guardar sin journal
+    permite distinguir un cambio propio de uno de otro operador.
+    """
+    __slots__ = ('employee_id', 'full_name', 'start_date', 'end_date',
+                 'total_days_taken', 'status', 'month', 'year', 'saved_status')
+
+    def __init__(self, employee_id, full_name, start_date, end_date,
+                 total_days_taken, status, month=None, year=None):
+        self.employee_id = employee_id
+        self.full_name = full_name
+        self.start_date = start_date
+        self.end_date = end_date
+        self.total_days_taken = total_days_taken
+        self.status = status
+        self.saved_status = status
+        self.month = start_date.month if month is None else month
+        self.year = start_date.year if year is None else year
+
+    @property
+    def key(self):
+        return (self.employee_id, self.start_date, self.end_date)
+
+    def to_row(self):
+        """
+        Dict con las columnas de vacations.csv.
+        """
+        return {
+            'employee_id': self.employee_id,
+            'full_name': self.full_name,
+            'vacations_start_date': self.start_date.strftime(DATE_FORMAT),
+            'vacations_end_date': self.end_date.strftime(DATE_FORMAT),
+            'total_days_taken': self.total_days_taken,
+            'approval_status': self.status.value,
+            'month': self.month,
+            'year': self.year,
+        }
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Construye el registro desde un dict con las columnas del CSV.
+        Lanza ValueError si una fecha, número o estado es inválido.
+        """
+        return cls(
+            row['employee_id'],
+            row['full_name'],
+            parse_date(row['vacations_start_date']),
+            parse_date(row['vacations_end_date']),
+            float(row['total_days_taken']),
+            Status.parse(row['approval_status']),
+            int(row['month']),
+            int(row['year']),
+        )
+
+
+STATUS_CODES = {status: code for code, status in enumerate(Status)}
+
+
+class VacationTable:
+    """
+    Almacén opcional estructura-de-arreglos para recorridos masivos:
+    una columna compacta por campo en lugar de un objeto por fila.
+    Las fechas se guardan como ordinales (date.toordinal) y el estado
+    como código (ver STATUS_CODES).
+    """
+
+    def __init__(self):
+        self.employee_ids = []
+        self.start_ordinals = array('l')
+        self.end_ordinals = array('l')
+        self.days = array('d')
+        self.status_codes = array('b')
+
+    def __len__(self):
+        return len(self.employee_ids)
+
+    def append(self, vacation):
+        self.employee_ids.append(vacation.employee_id)
+        self.start_ordinals.append(vacation.start_date.toordinal())
+        self.end_ordinals.append(vacation.end_date.toordinal())
+        self.days.append(vacation.total_days_taken)
+        self.status_codes.append(STATUS_CODES[vacation.status])
+
+    @classmethod
+    def from_records(cls, vacations):
+        table = cls()
+        for vacation in vacations:
+            table.append(vacation)
+        return table
+
+    def days_by_employee(self, status=Status.APPROVED):
+        """
+        Suma de días por employee_id para un estado, en una pasada.
+        """
+        code = STATUS_CODES[status]
+        totals = {}
+        for employee_id, days, status_code in zip(self.employee_ids, self.days, self.status_codes):
+            if status_code == code:
+                totals[employee_id] = totals.get(employee_id, 0) + days
+        return totals
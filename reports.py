@@ -1,4 +1,11 @@
 import csv
+from calendar import monthrange
+from datetime import date, datetime, timedelta
+
+from balances import compute_balances, iter_balance_rows
+from instrumentation import instrumented
+from records import DATE_FORMAT, Status
+from vacations import count_days_excluding_sundays
 
 REPORT_HEADER = [
     'employee_id',
@@ -12,59 +19,229 @@ REPORT_HEADER = [
     'year',
 ]
 
+REPORT_WRITE_BUFFER = 1 << 16
+
+BALANCE_REPORT_HEADER = [
+    'employee_id',
+    'full_name',
+    'department',
+    'hire_date',
+    'months_worked',
+    'accrued_days',
+    'used_days',
+    'available_days',
+    'eligible',
+]
+
+
+def month_segments(start_date, end_date):
+    """
+    Parte el rango [start_date, end_date] en tramos de un mes calendario.
+    Genera (year, month, inicio_tramo, fin_tramo).
+    """
+    current = start_date
+    while current <= end_date:
+        if current.month == 12:
+            next_month = date(current.year + 1, 1, 1)
+        else:
+            next_month = date(current.year, current.month + 1, 1)
+        segment_end = min(end_date, next_month - timedelta(days=1))
+        yield current.year, current.month, current, segment_end
+        current = next_month
+
 
-def export_approved_report(vacations, employees):
+def split_by_month(v, holidays=None):
     """
-    Exporta a CSV todas las solicitudes APROBADAS de un mes/año dado.
+    Genera (year, month, días) por cada mes que toca la solicitud v (sin
+    mirar su estado). Una solicitud que cruza de mes (p. ej. 2025-12-20 a
+    2026-01-02) se reparte entre ambos meses según los días hábiles de cada
+    tramo; el último tramo se ajusta para que la suma coincida con
+    total_days_taken.
     """
+    total = v.total_days_taken
+    segments = list(month_segments(v.start_date, v.end_date))
+    if len(segments) <= 1:
+        yield v.year, v.month, total
+        return
+
+    remaining = total
+    for year, month, seg_start, seg_end in segments[:-1]:
+        days = float(count_days_excluding_sundays(seg_start, seg_end, holidays))
+        days = min(days, remaining)
+        remaining -= days
+        yield year, month, days
+    year, month, _, _ = segments[-1]
+    yield year, month, remaining
+
+
+def iter_approved_segments(vacations, holidays=None):
+    """
+    Recorre vacations una sola vez y genera (year, month, v, días) por cada
+    mes que toca una solicitud APROBADA (ver split_by_month).
+    """
+    for v in vacations:
+        if v.status is not Status.APPROVED:
+            continue
+        for year, month, days in split_by_month(v, holidays):
+            yield year, month, v, days
+
+
+def report_filename(year, month):
+    return f"reporte_vacaciones_{year}_{month:02}.csv"
+
+
+@instrumented(rows=lambda args, counts: sum(counts.values()))
+def export_approved_reports(vacations, employees, first_period, last_period, holidays=None):
+    """
+    Exporta en una sola pasada un CSV por cada mes entre first_period y
+    last_period (tuplas (year, month), ambos incluidos).
+    Los archivos se abren a medida que aparece el primer registro de su
+    mes y se escribe fila a fila, sin acumular los datos en memoria.
+    Retorna {(year, month): filas escritas}.
+    """
+    files = {}
+    writers = {}
+    counts = {}
+
     try:
-        month = int(input("Enter month (1-12): ").strip())
+        first_day = date(first_period[0], first_period[1], 1)
+        last_day = date(last_period[0], last_period[1],
+                        monthrange(last_period[0], last_period[1])[1])
+        approved = vacations.approved_in_range(first_day, last_day)
+        for year, month, v, days in iter_approved_segments(approved, holidays):
+            period = (year, month)
+            if period < first_period or period > last_period:
+                continue
+
+            writer = writers.get(period)
+            if writer is None:
+                file = open(report_filename(year, month), "w", encoding="utf-8",
+                            newline="", buffering=REPORT_WRITE_BUFFER)
+                files[period] = file
+                writer = csv.writer(file)
+                writer.writerow(REPORT_HEADER)
+                writers[period] = writer
+                counts[period] = 0
+
+            emp = employees.get(v.employee_id)
+            writer.writerow([
+                v.employee_id,
+                v.full_name,
+                emp.position if emp else "",
+                emp.department if emp else "",
+                v.start_date.strftime(DATE_FORMAT),
+                v.end_date.strftime(DATE_FORMAT),
+                days,
+                month,
+                year,
+            ])
+            counts[period] += 1
+    finally:
+        for file in files.values():
+            file.close()
+
+    return counts
+
+
+def read_period(prompt):
+    """
+    Pide un período con formato YYYY-MM y devuelve (year, month) o None.
+    """
+    text = input(prompt).strip()
+    try:
+        year_text, month_text = text.split("-")
+        year, month = int(year_text), int(month_text)
+    except ValueError:
+        print("Invalid period. Please use YYYY-MM.")
+        return None
+
+    if month < 1 or month > 12:
+        print("Month must be between 1 and 12.")
+        return None
+    return year, month
+
+
+def print_export_summary(counts):
+    if not counts:
+        print("No approved vacations found for that period.")
+        return
+    for year, month in sorted(counts):
+        print(f"Report generated successfully: {report_filename(year, month)} "
+              f"({counts[(year, month)]} rows)")
+
+
+@instrumented()
+def export_approved_report(vacations, employees, holidays=None):
+    """
+    Exporta a CSV todas las solicitudes APROBADAS de un mes/año dado,
+    o de los 12 meses del año si el mes es 0.
+    """
+    try:
+        month = int(input("Enter month (1-12, 0 for the whole year): ").strip())
         year = int(input("Enter year (e.g. 2025): ").strip())
     except ValueError:
         print("Invalid month or year.")
         return
 
-    if month < 1 or month > 12:
-        print("Month must be between 1 and 12.")
+    if month < 0 or month > 12:
+        print("Month must be between 1 and 12, or 0 for the whole year.")
         return
 
-    employee_map = {e['employee_id']: e for e in employees}
+    if month == 0:
+        first_period, last_period = (year, 1), (year, 12)
+    else:
+        first_period = last_period = (year, month)
 
-    filtered = [
-        v for v in vacations
-        if v['approval_status'].upper() == "APPROVED"
-        and v['month'] == month
-        and v['year'] == year
-    ]
+    try:
+        counts = export_approved_reports(vacations, employees, first_period, last_period, holidays)
+    except Exception as e:
+        print(f"Error while generating report: {e}")
+        return
+    print_export_summary(counts)
 
-    if not filtered:
-        print("No approved vacations found for that period.")
+
+@instrumented()
+def export_approved_report_range(vacations, employees, holidays=None):
+    """
+    Exporta un CSV por mes para un rango de meses YYYY-MM a YYYY-MM.
+    """
+    first_period = read_period("Enter first month (YYYY-MM): ")
+    if first_period is None:
+        return
+    last_period = read_period("Enter last month (YYYY-MM): ")
+    if last_period is None:
         return
 
-    filename = f"reporte_vacaciones_{year}_{month:02}.csv"
+    if last_period < first_period:
+        print("Last month cannot be before first month.")
+        return
+
+    try:
+        counts = export_approved_reports(vacations, employees, first_period, last_period, holidays)
+    except Exception as e:
+        print(f"Error while generating report: {e}")
+        return
+    print_export_summary(counts)
+
+
+@instrumented()
+def export_balances_report(employees, vacations):
+    """
+    Exporta a CSV el saldo de vacaciones de todos los empleados a la fecha.
+    """
+    if not employees:
+        print("No employees registered.")
+        return
+
+    today = datetime.today().date()
+    balances = compute_balances(employees, vacations, today)
+    filename = f"reporte_saldos_{today.strftime('%Y_%m_%d')}.csv"
 
     try:
         with open(filename, "w", encoding="utf-8", newline="") as file:
-            writer = csv.DictWriter(file, fieldnames=REPORT_HEADER)
+            writer = csv.DictWriter(file, fieldnames=BALANCE_REPORT_HEADER)
             writer.writeheader()
-
-            for v in filtered:
-                emp = employee_map.get(v['employee_id'])
-                position = emp['position'] if emp else ""
-                department = emp['department'] if emp else ""
-
-                row = {
-                    'employee_id': v['employee_id'],
-                    'full_name': v['full_name'],
-                    'position': position,
-                    'department': department,
-                    'vacations_start_date': v['vacations_start_date'],
-                    'vacations_end_date': v['vacations_end_date'],
-                    'total_days_taken': v['total_days_taken'],
-                    'month': v['month'],
-                    'year': v['year'],
-                }
-                writer.writerow(row)
+            writer.writerows(iter_balance_rows(employees, balances))
 
         print(f"Report generated successfully: {filename}")
     except Exception as e:
@@ -0,0 +1,295 @@
+# repository.py
+from intervals import IntervalIndex
+from records import Status
+
+
+class EmployeeRepository:
+    """
+    Empleados en memoria con índice hash por employee_id y por
+    departamento (sin distinguir mayúsculas). Se puede recorrer como una lista (for e in employees).
+    version aumenta con cada cambio (para saber si hay algo sin guardar).
+    """
+
+    def __init__(self, employees=None):
+        self._records = []
+        self._by_id = {}
+        self._by_department = {}
+        self.version = 0
+        for employee in employees or []:
+            self.add(employee)
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __len__(self):
+        return len(self._records)
+
+    def add(self, employee):
+        self._records.append(employee)
+        # si el CSV trae IDs repetidos, gana el primero (como el scan lineal)
+        if self._by_id.setdefault(employee.employee_id, employee) is employee:
+            key = employee.department.strip().lower()
+            self._by_department.setdefault(key, []).append(employee)
+        self.version += 1
+        return employee
+
+    append = add
+
+    def get(self, employee_id):
+        return self._by_id.get(employee_id)
+
+    def exists(self, employee_id):
+        return employee_id in self._by_id
+
+    def in_department(self, department):
+        return self._by_department.get(department.strip().lower(), [])
+
+    def added_after(self, count):
+        """
+        Los empleados agregados después de los primeros count (en orden de
+        alta), sin recorrer los anteriores.
+        """
+        return self._records[count:]
+
+
+class VacationRepository:
+    """
+    Solicitudes de vacaciones en memoria con índices mantenidos en cada
+    inserción y cambio de estado:
+    - por employee_id
+    - por (employee_id, fecha inicio, fecha fin): puede haber varias con la
+      misma llave (una RECHAZADA y otra pedida después para las mismas
+      fechas), en orden de inserción
+    - por estado (Status)
+    - por (year, month)
+    - intervalos de fechas por empleado y por departamento, solo de
+      solicitudes activas (PENDING o APPROVED), para detectar cruces
+
+    Además lleva un libro de días usados (solicitudes APPROVED) por
+    empleado, para consultar el saldo en O(1), y avisa a los suscriptos
+    (on_approval_change) cada vez que una solicitud entra o sale de
+    APPROVED.
+
+    employees (opcional) es el EmployeeRepository del que se toma el
+    departamento de cada solicitud. version aumenta con cada inserción o
+    cambio de estado.
+    """
+
+    def __init__(self, vacations=None, employees=None):
+        self._records = []
+        self._by_key = {}
+        self._by_employee = {}
+        self._by_status = {}
+        self._by_period = {}
+        self._used_days = {}
+        self._employees = employees
+        self.version = 0
+        self._employee_intervals = {}
+        self._department_intervals = {}
+        self._approval_listeners = []
+        for vacation in vacations or []:
+            self._insert(vacation)
+        # los intervalos de la carga inicial se ordenan una sola vez
+        self._build_intervals()
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __len__(self):
+        return len(self._records)
+
+    def add(self, vacation):
+        self._insert(vacation)
+        if vacation.status is not Status.REJECTED:
+            self._index_interval(vacation)
+        return vacation
+
+    append = add
+
+    def _insert(self, vacation):
+        """
+        Agrega a todos los índices menos los de intervalos.
+        """
+        self._records.append(vacation)
+        self._by_key.setdefault(vacation.key, []).append(vacation)
+        self._by_employee.setdefault(vacation.employee_id, []).append(vacation)
+        self._status_bucket(vacation.status)[id(vacation)] = vacation
+        period = (vacation.year, vacation.month)
+        self._by_period.setdefault(period, []).append(vacation)
+        if vacation.status is Status.APPROVED:
+            self._approval_changed(vacation, 1)
+        self.version += 1
+
+    def add_many(self, vacations):
+        """
+        Agrega varias solicitudes; retorna las agregadas (todas).
+        """
+        return [self.add(vacation) for vacation in vacations]
+
+    def _status_bucket(self, status):
+        # dict (no set) para conservar el orden de inserción
+        return self._by_status.setdefault(status, {})
+
+    def on_approval_change(self, listener):
+        """
+        listener(solicitud, signo) se llama con +1 cuando una solicitud
+        entra a APPROVED (alta o cambio de estado) y con -1 cuando sale.
+        """
+        self._approval_listeners.append(listener)
+
+    def _approval_changed(self, vacation, sign):
+        employee_id = vacation.employee_id
+        used = self._used_days.get(employee_id, 0) + sign * vacation.total_days_taken
+        self._used_days[employee_id] = used
+        for listener in self._approval_listeners:
+            listener(vacation, sign)
+
+    def _department_key(self, employee_id):
+        if self._employees is None:
+            return None
+        employee = self._employees.get(employee_id)
+        if employee is None:
+            return None
+        return employee.department.strip().lower()
+
+    def _build_intervals(self):
+        by_employee = {}
+        by_department = {}
+        for vacation in self._records:
+            if vacation.status is Status.REJECTED:
+                continue
+            entry = (vacation.start_date, vacation.end_date, vacation)
+            by_employee.setdefault(vacation.employee_id, []).append(entry)
+            department = self._department_key(vacation.employee_id)
+            if department is not None:
+                by_department.setdefault(department, []).append(entry)
+        self._employee_intervals = {employee_id: IntervalIndex.from_items(entries)
+                                    for employee_id, entries in by_employee.items()}
+        self._department_intervals = {department: IntervalIndex.from_items(entries)
+                                      for department, entries in by_department.items()}
+
+    def _index_interval(self, vacation):
+        index = self._employee_intervals.get(vacation.employee_id)
+        if index is None:
+            index = self._employee_intervals[vacation.employee_id] = IntervalIndex()
+        index.add(vacation.start_date, vacation.end_date, vacation)
+        department = self._department_key(vacation.employee_id)
+        if department is not None:
+            index = self._department_intervals.get(department)
+            if index is None:
+                index = self._department_intervals[department] = IntervalIndex()
+            index.add(vacation.start_date, vacation.end_date, vacation)
+
+    def _unindex_interval(self, vacation):
+        index = self._employee_intervals.get(vacation.employee_id)
+        if index is not None:
+            index.remove(vacation.start_date, vacation)
+        index = self._department_intervals.get(self._department_key(vacation.employee_id))
+        if index is not None:
+            index.remove(vacation.start_date, vacation)
+
+    def overlapping(self, employee_id, start_date, end_date):
+        """
+        Solicitudes activas (PENDING o APPROVED) del empleado que tocan
+        algún día entre start_date y end_date.
+        """
+        index = self._employee_intervals.get(employee_id)
+        if index is None:
+            return []
+        return index.overlapping(start_date, end_date)
+
+    def department_overlapping(self, department, start_date, end_date):
+        """
+        Solicitudes activas del departamento que tocan algún día entre
+        start_date y end_date (vacío si no se dio el repositorio de
+        empleados).
+        """
+        index = self._department_intervals.get(department.strip().lower())
+        if index is None:
+            return []
+        return index.overlapping(start_date, end_date)
+
+    def used_days(self, employee_id):
+        """
+        Días ya aprobados para el empleado, según el libro.
+        """
+        return self._used_days.get(employee_id, 0)
+
+    def get(self, key):
+        """
+        La solicitud vigente con esa llave: la activa (PENDING o APPROVED)
+        si hay una, si no la última registrada. None si no hay ninguna.
+        """
+        rows = self._by_key.get(key)
+        if not rows:
+            return None
+        for vacation in rows:
+            if vacation.status is not Status.REJECTED:
+                return vacation
+        return rows[-1]
+
+    def find(self, key, status):
+        """
+        La primera solicitud con esa llave y ese estado, o None.
+        """
+        for vacation in self._by_key.get(key, ()):
+            if vacation.status is status:
+                return vacation
+        return None
+
+    def with_key(self, key):
+        """
+        Todas las solicitudes con esa llave, en orden de inserción.
+        """
+        return self._by_key.get(key, [])
+
+    def for_employee(self, employee_id):
+        return self._by_employee.get(employee_id, [])
+
+    def with_status(self, status):
+        return list(self._by_status.get(status, {}).values())
+
+    def in_period(self, year, month):
+        return self._by_period.get((year, month), [])
+
+    def approved_in_range(self, start_date, end_date):
+        """
+        Solicitudes APROBADAS que tocan algún día entre start_date y
+        end_date; recorre solo el índice de aprobadas.
+        """
+        return (
+            v for v in self._by_status.get(Status.APPROVED, {}).values()
+            if v.start_date <= end_date and v.end_date >= start_date
+        )
+
+    def update_status_many(self, changes):
+        """
+        Aplica varios cambios de estado [(solicitud, nuevo estado), ...].
+        Retorna cuántos cambiaron algo.
+        """
+        return sum(1 for vacation, new_status in changes
+                   if self.update_status(vacation, new_status))
+
+    def update_status(self, vacation, new_status):
+        """
+        Cambia el estado de una solicitud ya indexada y mueve su entrada
+        de índice. Retorna False si no hubo cambio.
+        """
+        old_status = vacation.status
+        if old_status is new_status:
+            return False
+        self._by_status.get(old_status, {}).pop(id(vacation), None)
+        vacation.status = new_status
+        self._status_bucket(new_status)[id(vacation)] = vacation
+        was_approved = old_status is Status.APPROVED
+        is_approved = new_status is Status.APPROVED
+        if is_approved and not was_approved:
+            self._approval_changed(vacation, 1)
+        elif was_approved and not is_approved:
+            self._approval_changed(vacation, -1)
+        if new_status is Status.REJECTED:
+            self._unindex_interval(vacation)
+        elif old_status is Status.REJECTED:
+            self._index_interval(vacation)
+        self.version += 1
+        return True
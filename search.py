@@ -0,0 +1,189 @@
+# search.py
+"""
+Búsqueda de empleados por nombre, cargo y departamento.
+
+El índice se construye una vez (y se actualiza con cada empleado nuevo):
+- lista ordenada de palabras: la búsqueda por prefijo es un bisect más el
+  recorrido de las palabras que empiezan igual
+- trigramas de cada palabra distinta: para tolerar errores de tipeo se
+  comparan los trigramas de la consulta solo contra las palabras que
+  comparten alguno, no contra todos los empleados
+
+Cada palabra de la consulta tiene que coincidir (exacta, prefijo o
+parecida) con alguna palabra del empleado; el puntaje suma la mejor
+coincidencia de cada palabra, pesada según el campo.
+"""
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from functools import lru_cache
+
+from instrumentation import instrumented
+
+SEARCH_LIMIT = 10
+# peso del campo donde aparece la palabra
+FIELD_WEIGHTS = (
+    ('full_name', 3.0),
+    ('position', 2.0),
+    ('department', 1.0),
+)
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.8
+FUZZY_SCORE = 0.6
+# coeficiente de Dice mínimo entre trigramas para aceptar una palabra parecida
+MIN_SIMILARITY = 0.4
+# las palabras más cortas solo se buscan por prefijo
+MIN_FUZZY_LENGTH = 3
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize(text):
+    """
+    Minúsculas y sin tildes: "José Peña" -> "jose pena".
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+@lru_cache(maxsize=65536)
+def words(text):
+    # cargos, departamentos y nombres se repiten mucho: se normalizan una vez
+    return tuple(_WORD.findall(normalize(text)))
+
+
+def trigrams(word):
+    padded = f" {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class EmployeeSearchIndex:
+    """
+    Índice de búsqueda sobre los empleados dados (un repositorio o una
+    lista). Los empleados agregados después se suman con add() o update().
+    """
+
+    def __init__(self, employees=()):
+        self._employees = []
+        # palabra -> {posición del empleado: peso del mejor campo}
+        self._postings = {}
+        self._words = []
+        self._trigrams = {}
+        self._word_trigrams = {}
+        # version del repositorio la última vez que se actualizó
+        self._version = getattr(employees, "version", None)
+        for employee in employees:
+            self.add(employee)
+
+    def __len__(self):
+        return len(self._employees)
+
+    def add(self, employee):
+        position = len(self._employees)
+        self._employees.append(employee)
+        for field, weight in FIELD_WEIGHTS:
+            for word in words(getattr(employee, field)):
+                postings = self._postings.get(word)
+                if postings is None:
+                    postings = self._postings[word] = {}
+                    self._index_word(word)
+                if postings.get(position, 0) < weight:
+                    postings[position] = weight
+
+    def update(self, employees):
+        """
+        Agrega los empleados del repositorio que todavía no están en el
+        índice (los nuevos quedan al final del repositorio). Con version
+        (repositorio en memoria) no hace nada si no hubo altas; si no,
+        pide solo las filas nuevas (added_after).
+        """
+        version = getattr(employees, "version", None)
+        if version is not None and version == self._version:
+            return
+        for employee in employees.added_after(len(self._employees)):
+            self.add(employee)
+        self._version = version
+
+    def _index_word(self, word):
+        insort(self._words, word)
+        grams = trigrams(word)
+        self._word_trigrams[word] = len(grams)
+        for gram in grams:
+            self._trigrams.setdefault(gram, []).append(word)
+
+    def _prefix_matches(self, term):
+        """
+        Genera (palabra, puntaje) de las palabras que empiezan con term.
+        """
+        start = bisect_left(self._words, term)
+        for i in range(start, len(self._words)):
+            word = self._words[i]
+            if not word.startswith(term):
+                break
+            yield word, EXACT_SCORE if word == term else PREFIX_SCORE * len(term) / len(word)
+
+    def _fuzzy_matches(self, term):
+        """
+        Genera (palabra, puntaje) de las palabras con trigramas parecidos.
+        """
+        grams = trigrams(term)
+        shared = {}
+        for gram in grams:
+            for word in self._trigrams.get(gram, ()):
+                shared[word] = shared.get(word, 0) + 1
+        for word, common in shared.items():
+            similarity = 2 * common / (len(grams) + self._word_trigrams[word])
+            if similarity >= MIN_SIMILARITY:
+                yield word, FUZZY_SCORE * similarity
+
+    def _term_scores(self, term):
+        """
+        {posición del empleado: mejor puntaje} para una palabra de la consulta.
+        """
+        matches = dict(self._prefix_matches(term))
+        if len(term) >= MIN_FUZZY_LENGTH:
+            for word, score in self._fuzzy_matches(term):
+                if score > matches.get(word, 0):
+                    matches[word] = score
+
+        scores = {}
+        for word, word_score in matches.items():
+            for position, weight in self._postings[word].items():
+                score = word_score * weight
+                if score > scores.get(position, 0):
+                    scores[position] = score
+        return scores
+
+    @instrumented()
+    def search(self, query, limit=SEARCH_LIMIT):
+        """
+        Retorna hasta limit pares (puntaje, Employee), de mayor a menor
+        puntaje (a igual puntaje, en orden de carga).
+        """
+        terms = words(query)
+        if not terms:
+            return []
+
+        # primero la palabra con menos candidatos, así la intersección es chica
+        per_term = sorted((self._term_scores(term) for term in terms), key=len)
+        totals = per_term[0]
+        for scores in per_term[1:]:
+            totals = {position: total + scores[position]
+                      for position, total in totals.items() if position in scores}
+            if not totals:
+                return []
+
+        best = heapq.nsmallest(limit, totals.items(), key=lambda item: (-item[1], item[0]))
+        return [(round(score, 3), self._employees[position]) for position, score in best]
+
+
+def print_search_results(results):
+    if not results:
+        print("No employees match the search.")
+        return
+    print(f"\n{'ID':<10} {'Nombre completo':<25} {'Cargo':<20} {'Área':<15} {'Score':>6}")
+    print("-" * 80)
+    for score, e in results:
+        print(f"{e.employee_id:<10} {e.full_name:<25} {e.position:<20} {e.department:<15} {score:>6}")
+    print("-" * 80)
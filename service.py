@@ -0,0 +1,543 @@
+# service.py
+"""
+Servicio HTTP/JSON local sobre los mismos datos que la consola (asyncio,
+solo biblioteca estándar).
+
+    python service.py [--host 127.0.0.1] [--port 8080] [--backend csv]
+
+Todas las rutas piden HTTP Basic con un usuario admin de users.csv (la
+verificación queda en caché, ver auth.UserStore).
+
+    GET  /health
+    GET  /employees?q=texto&limit=10        búsqueda (search.py)
+    GET  /employees/<id>
+    GET  /employees/<id>/balance
+    GET  /employees/<id>/requests
+    GET  /requests?status=PENDING&dept=IT&from=2026-01-01&to=2026-03-31&limit=50&offset=0
+    POST /requests            {"employee_id", "start_date", "end_date"}
+    POST /requests/decision   {"employee_id", "start_date", "end_date", "decision"}
+    GET  /reports/approved?year=2026&month=3
+
+Las lecturas se atienden en el hilo del event loop directo desde los
+índices, así que muchas conexiones se sirven a la vez. Los cambios van a
+una cola que consume una sola tarea: toma todo lo encolado, lo valida en
+orden con las mismas reglas que la importación masiva, lo persiste con
+una sola escritura al journal (commit en grupo) y recién entonces lo
+aplica en memoria, antes de responder. Eso (y lo que guardan los
+operadores de la consola, que se incorpora cada REFRESH_SECONDS) corre en
+un hilo aparte para que el bloqueo del journal, el fsync, la compactación
+y PBKDF2 no frenen el event loop; los repositorios solo cambian con
+state_lock tomado, que las lecturas también toman, así que ninguna ve un
+cambio a medias.
+"""
+import argparse
+import asyncio
+import base64
+import binascii
+import json
+import threading
+from calendar import monthrange
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import date, datetime
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from auth import UserStore
+from batch_import import BatchValidator
+from instrumentation import instrumented
+from records import DATE_FORMAT, Status, parse_date
+from reports import iter_approved_segments
+from search import EmployeeSearchIndex
+from storage import STORAGE_BACKENDS, open_storage
+from vacations import (
+    calculate_accrued_days,
+    load_holidays,
+    select_requests,
+    status_entry,
+)
+
+DEFAULT_PORT = 8080
+MAX_BODY_BYTES = 1 << 20
+# cambios que el escritor aplica y persiste juntos como máximo
+WRITE_BATCH_SIZE = 500
+# cada cuánto se incorpora lo que guardaron los operadores de la consola
+REFRESH_SECONDS = 1.0
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 1000
+
+REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    422: "Unprocessable Entity",
+    500: "Internal Server Error",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def employee_json(employee):
+    return {
+        'employee_id': employee.employee_id,
+        'full_name': employee.full_name,
+        'position': employee.position,
+        'department': employee.department,
+        'hire_date': employee.hire_date_text,
+    }
+
+
+def request_json(vacation):
+    return {
+        'employee_id': vacation.employee_id,
+        'full_name': vacation.full_name,
+        'start_date': vacation.start_date.strftime(DATE_FORMAT),
+        'end_date': vacation.end_date.strftime(DATE_FORMAT),
+        'total_days_taken': vacation.total_days_taken,
+        'status': vacation.status.value,
+    }
+
+
+def _query_value(query, name):
+    values = query.get(name)
+    return values[0] if values else None
+
+
+def _query_int(query, name, default, minimum=0, maximum=None):
+    text = _query_value(query, name)
+    if text is None:
+        return default
+    try:
+        value = int(text)
+    except ValueError:
+        raise HttpError(400, f"{name} must be an integer.")
+    if value < minimum or (maximum is not None and value > maximum):
+        raise HttpError(400, f"{name} is out of range.")
+    return value
+
+
+def _date_field(data, name):
+    text = data.get(name)
+    if not isinstance(text, str):
+        raise HttpError(400, f"{name} is required (YYYY-MM-DD).")
+    try:
+        return parse_date(text)
+    except ValueError:
+        raise HttpError(400, f"Invalid {name}. Please use YYYY-MM-DD.")
+
+
+def _request_key(data):
+    employee_id = data.get('employee_id')
+    if not isinstance(employee_id, str) or not employee_id.strip():
+        raise HttpError(400, "employee_id is required.")
+    return employee_id.strip(), _date_field(data, 'start_date'), _date_field(data, 'end_date')
+
+
+class VacationService:
+    """
+    Rutas y cola de escritura sobre un backend ya cargado (open_storage).
+    """
+
+    def __init__(self, storage, users, employees, vacations, holidays=None):
+        self.storage = storage
+        self.journal = storage.journal
+        self.users = users
+        self.employees = employees
+        self.vacations = vacations
+        self.holidays = holidays
+        self.search_index = None
+        self.queue = None
+        self._tasks = []
+        self._executor = None
+        # lo toman las lecturas (event loop) y los cambios (hilo escritor)
+        self.state_lock = threading.RLock()
+
+    # ---- cola de escritura ----
+
+    async def start(self):
+        self.queue = asyncio.Queue()
+        # un solo hilo: cambios y refrescos no se intercalan entre sí
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._tasks = [asyncio.create_task(self._writer()),
+                       asyncio.create_task(self._refresher())]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _journal_lock(self):
+        return self.journal.lock if self.journal is not None else nullcontext()
+
+    def refresh(self):
+        # primero el bloqueo del journal (puede esperar a otro proceso),
+        # después state_lock (solo mientras se aplica)
+        with self._journal_lock(), self.state_lock:
+            self.storage.refresh()
+
+    async def _refresher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(REFRESH_SECONDS)
+            try:
+                await loop.run_in_executor(self._executor, self.refresh)
+            except Exception as e:
+                print(f"Error while refreshing data: {e}")
+
+    async def submit(self, op, data):
+        """
+        Encola un cambio y espera su resultado (status, cuerpo), que llega
+        cuando ya quedó persistido.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((op, data, future))
+        return await future
+
+    async def _writer(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < WRITE_BATCH_SIZE and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, self.apply_batch, [(op, data) for op, data, _ in batch])
+            except Exception as e:
+                print(f"Error while applying changes: {e}")
+                results = [(500, {'error': "Could not apply the change."})] * len(batch)
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    @instrumented(rows=lambda args, result: len(result))
+    def apply_batch(self, batch):
+        """
+        Aplica en orden una lista de (op, datos) y la persiste de una vez.
+        Primero valida todo sin tocar los repositorios, después escribe el
+        journal y solo si se pudo aplica los cambios en memoria (si falla
+        no queda nada a medias). Corre en el hilo del escritor.
+        Retorna un (status, cuerpo) por cambio.
+        """
+        with self._journal_lock():
+            with self.state_lock:
+                if self.journal is not None:
+                    self.journal.sync()
+                planned = self._plan(batch)
+            entries = [entry for _, entry, _ in planned if entry is not None]
+            if self.journal is not None and not self.journal.append_entries(entries):
+                return [(500, {'error': "Could not write the change."})] * len(batch)
+            with self.state_lock:
+                results = [apply() if apply is not None else result
+                           for result, _, apply in planned]
+            # con el bloqueo del journal tomado la compactación no encuentra
+            # entradas nuevas de otros procesos: solo lee los repositorios
+            self.storage.vacations_changed()
+        return results
+
+    def _plan(self, batch):
+        """
+        [(resultado, entrada del journal, aplicar), ...]: los rechazados
+        traen el resultado y los aceptados la entrada y una función que
+        hace el cambio y retorna el resultado.
+        """
+        validator = BatchValidator(self.employees, self.vacations, self.holidays)
+        decided = {}
+        planned = []
+        for op, data in batch:
+            if op == "create":
+                planned.append(self._plan_create(validator, data))
+            else:
+                planned.append(self._plan_decision(data, decided))
+        return planned
+
+    def _plan_create(self, validator, data):
+        employee_id, start_date, end_date = data
+        # el validador recuerda lo aceptado en el lote hasta que se aplique
+        record, days, reason = validator.check(employee_id, start_date, end_date)
+        if record is None:
+            status = 404 if reason == "Employee not found." else 422
+            return (status, {'error': reason, 'days_requested': days}), None, None
+
+        def apply():
+            if self.vacations.add(record) is None:
+                # la base ya tenía una activa con esa llave
+                return 409, {'error': "Duplicate request.", 'days_requested': days}
+            body = request_json(record)
+            if reason:
+                body['warning'] = reason
+            return 201, body
+
+        return None, ("add_vacation", {'record': record.to_row()}), apply
+
+    def _plan_decision(self, data, decided):
+        key, decision = data
+        vacation = self.vacations.get(key)
+        if vacation is None:
+            return (404, {'error': "Request not found."}), None, None
+        # una decisión anterior del mismo lote todavía no se aplicó
+        status = decided.get(key, vacation.status)
+        if status is not Status.PENDING:
+            return (409, {'error': f"Request is already {status.value}.",
+                          'request': dict(request_json(vacation), status=status.value)}), None, None
+        decided[key] = decision
+        entry = status_entry(vacation, Status.PENDING, decision)
+
+        def apply():
+            if not self.vacations.update_status(vacation, decision):
+                return 409, {'error': "Request was changed by another operator."}
+            return 200, request_json(vacation)
+
+        return None, ("set_status", entry), apply
+
+    # ---- rutas ----
+
+    async def authorize(self, header):
+        if not header or not header.startswith("Basic "):
+            raise HttpError(401, "Authentication required.")
+        try:
+            username, _, password = base64.b64decode(header[6:]).decode("utf-8").partition(":")
+        except (binascii.Error, UnicodeDecodeError):
+            raise HttpError(401, "Invalid credentials.")
+        # PBKDF2 tarda; en otro hilo para no frenar las demás conexiones
+        user = await asyncio.to_thread(self.users.verify, username, password)
+        if user is None or user['role'].lower() != "admin":
+            raise HttpError(401, "Invalid credentials.")
+
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip("/").split("/") if part]
+        query = parse_qs(url.query)
+
+        if method == "GET":
+            with self.state_lock:
+                return self.read(parts, query)
+        if method == "POST":
+            try:
+                data = json.loads(body or b"{}")
+            except ValueError:
+                raise HttpError(400, "Body must be JSON.")
+            if not isinstance(data, dict):
+                raise HttpError(400, "Body must be a JSON object.")
+            if parts == ["requests"]:
+                return await self.submit("create", _request_key(data))
+            if parts == ["requests", "decision"]:
+                try:
+                    decision = Status.parse(str(data.get('decision', '')))
+                except ValueError:
+                    decision = None
+                if decision not in (Status.APPROVED, Status.REJECTED):
+                    raise HttpError(400, "decision must be APPROVED or REJECTED.")
+                return await self.submit("decide", (_request_key(data), decision))
+            raise HttpError(404, "Not found.")
+        raise HttpError(405, "Method not allowed.")
+
+    def read(self, parts, query):
+        """
+        Rutas de solo lectura; corren sin pausas (sin await) y con
+        state_lock tomado, así que ven los índices en un estado consistente.
+        """
+        if parts == ["health"]:
+            return 200, {'employees': len(self.employees), 'requests': len(self.vacations)}
+
+        if parts == ["employees"]:
+            text = _query_value(query, "q")
+            if not text:
+                raise HttpError(400, "q is required.")
+            limit = _query_int(query, "limit", 10, 1, MAX_PAGE_LIMIT)
+            if self.search_index is None:
+                self.search_index = EmployeeSearchIndex(self.employees)
+            else:
+                self.search_index.update(self.employees)
+            return 200, {'results': [dict(employee_json(e), score=score)
+                                     for score, e in self.search_index.search(text, limit)]}
+
+        if len(parts) in (2, 3) and parts[0] == "employees":
+            employee = self.employees.get(parts[1])
+            if employee is None:
+                raise HttpError(404, "Employee not found.")
+            if len(parts) == 2:
+                return 200, employee_json(employee)
+            if parts[2] == "balance":
+                available, months, used, accrued = calculate_accrued_days(
+                    employee, datetime.today().date(), self.vacations)
+                return 200, {'employee_id': employee.employee_id, 'months_worked': months,
+                             'accrued_days': accrued, 'used_days': used,
+                             'available_days': available}
+            if parts[2] == "requests":
+                return 200, {'requests': [request_json(v) for v in
+                                          self.vacations.for_employee(employee.employee_id)]}
+
+        if parts == ["requests"]:
+            return 200, self._list_requests(query)
+
+        if parts == ["reports", "approved"]:
+            return 200, self._approved_report(query)
+
+        raise HttpError(404, "Not found.")
+
+    def _list_requests(self, query):
+        status = _query_value(query, "status")
+        try:
+            status = Status.parse(status) if status else None
+            start_date = parse_date(_query_value(query, "from")) if "from" in query else None
+            end_date = parse_date(_query_value(query, "to")) if "to" in query else None
+        except ValueError:
+            raise HttpError(400, "Invalid status or date.")
+        limit = _query_int(query, "limit", DEFAULT_PAGE_LIMIT, 1, MAX_PAGE_LIMIT)
+        offset = _query_int(query, "offset", 0)
+
+        selected = select_requests(self.vacations, self.employees, status,
+                                   _query_value(query, "dept"), start_date, end_date)
+        page = []
+        for position, vacation in enumerate(selected):
+            if position >= offset + limit:
+                break
+            if position >= offset:
+                page.append(request_json(vacation))
+        return {'offset': offset, 'limit': limit, 'requests': page}
+
+    def _approved_report(self, query):
+        year = _query_int(query, "year", None, 1, 9999)
+        month = _query_int(query, "month", None, 1, 12)
+        if year is None or month is None:
+            raise HttpError(400, "year and month are required.")
+        first_day = date(year, month, 1)
+        last_day = date(year, month, monthrange(year, month)[1])
+
+        rows = []
+        by_department = {}
+        approved = self.vacations.approved_in_range(first_day, last_day)
+        for seg_year, seg_month, v, days in iter_approved_segments(approved, self.holidays):
+            if (seg_year, seg_month) != (year, month):
+                continue
+            employee = self.employees.get(v.employee_id)
+            department = employee.department if employee else ""
+            rows.append(dict(request_json(v), department=department, days_in_month=days))
+            by_department[department] = by_department.get(department, 0) + days
+        return {'year': year, 'month': month, 'total_days': sum(by_department.values()),
+                'by_department': by_department, 'rows': rows}
+
+    # ---- HTTP ----
+
+    async def handle_connection(self, reader, writer):
+        """
+        HTTP/1.1 mínimo con keep-alive: una petición a la vez por conexión.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                    if version != "HTTP/1.1":
+                        keep_alive = keep_alive and headers.get("connection", "").lower() == "keep-alive"
+                    length = int(headers.get("content-length") or 0)
+                    if length > MAX_BODY_BYTES:
+                        keep_alive = False
+                        raise HttpError(413, "Body too large.")
+                    body = await reader.readexactly(length) if length else b""
+                    # /health queda abierto para los chequeos del balanceador
+                    if urlsplit(target).path.rstrip("/") != "/health":
+                        await self.authorize(headers.get("authorization"))
+                    status, payload = await self.dispatch(method, target, body)
+                except HttpError as e:
+                    status, payload = e.status, {'error': e.message}
+                except ValueError:
+                    keep_alive = False
+                    status, payload = 400, {'error': "Malformed request."}
+                except Exception as e:
+                    print(f"Error while handling request: {e}")
+                    status, payload = 500, {'error': "Internal error."}
+
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                        f"Content-Type: application/json; charset=utf-8\r\n"
+                        f"Content-Length: {len(data)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n")
+                if status == 401:
+                    head += 'WWW-Authenticate: Basic realm="vacations"\r\n'
+                writer.write(head.encode("latin-1") + b"\r\n" + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(service, host, port):
+    await service.start()
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    address = server.sockets[0].getsockname()
+    print(f"Serving on http://{address[0]}:{address[1]} (Ctrl+C to stop)", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON service over the vacation data.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--backend", choices=STORAGE_BACKENDS, default="csv")
+    parser.add_argument("--db", default="vacations.db", help="SQLite database file")
+    parser.add_argument("--users", default="users.csv")
+    parser.add_argument("--employees", default="employees.csv")
+    parser.add_argument("--vacations", default="vacations.csv")
+    parser.add_argument("--holidays", default="holidays.csv")
+    parser.add_argument("--journal", default="journal.jsonl")
+    parser.add_argument("--snapshot", default="data.snapshot")
+    args = parser.parse_args()
+
+    storage = open_storage(
+        args.backend,
+        args.users,
+        args.employees,
+        args.vacations,
+        args.db,
+        journal_path=args.journal,
+        snapshot_path=args.snapshot,
+    )
+    try:
+        users, employees, vacations = storage.load()
+        holidays = load_holidays(args.holidays)
+        service = VacationService(storage, UserStore(users), employees, vacations, holidays)
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nStopping service...")
+    finally:
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
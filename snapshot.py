@@ -0,0 +1,249 @@
+# snapshot.py
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+from datetime import date
+
+from records import STATUS_CODES, Employee, VacationRequest
+from instrumentation import instrumented
+from utils import gc_paused
+
+SNAPSHOT_MAGIC = b"PVSNAP"
+SNAPSHOT_VERSION = 1
+# bytes del inicio y del final de cada CSV que entran en el hash
+FINGERPRINT_SAMPLE = 1 << 16
+
+_HEADER = struct.Struct("<6sH")
+_FINGERPRINT = struct.Struct("<QQ20s")
+_COUNT = struct.Struct("<Q")
+_SEPARATOR = "\x00"
+_STATUSES = {code: status for status, code in STATUS_CODES.items()}
+
+
+def file_fingerprint(path):
+    """
+    Huella de un CSV: tamaño, mtime (ns) y SHA-1 del primer y último
+    bloque. No se hashea el archivo entero para que validar el snapshot
+    no cueste lo mismo que leer el CSV; tamaño + mtime cubren el resto.
+    Retorna None si el archivo no existe.
+    """
+    try:
+        stat = os.stat(path)
+        digest = hashlib.sha1()
+        with open(path, "rb") as file:
+            digest.update(file.read(FINGERPRINT_SAMPLE))
+            if stat.st_size > FINGERPRINT_SAMPLE:
+                file.seek(max(stat.st_size - FINGERPRINT_SAMPLE, FINGERPRINT_SAMPLE))
+                digest.update(file.read(FINGERPRINT_SAMPLE))
+    except FileNotFoundError:
+        return None
+    return _FINGERPRINT.pack(stat.st_size, stat.st_mtime_ns, digest.digest())
+
+
+def _pack_strings(values):
+    blob = _SEPARATOR.join(values).encode("utf-8")
+    return _COUNT.pack(len(blob)) + blob
+
+
+def _pack_array(values):
+    blob = values.tobytes()
+    return _COUNT.pack(len(blob)) + blob
+
+
+class _Reader:
+    """
+    Lector secuencial sobre el snapshot mapeado en memoria.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.offset = 0
+
+    def unpack(self, layout):
+        values = layout.unpack_from(self.buffer, self.offset)
+        self.offset += layout.size
+        return values
+
+    def blob(self):
+        (size,) = self.unpack(_COUNT)
+        start = self.offset
+        self.offset += size
+        return self.buffer[start:self.offset]
+
+    def strings(self, count):
+        blob = self.blob()
+        if count == 0:
+            return []
+        values = str(blob, "utf-8").split(_SEPARATOR)
+        if len(values) != count:
+            raise ValueError("corrupt snapshot column")
+        return values
+
+    def array(self, typecode, count):
+        values = array(typecode)
+        values.frombytes(self.blob())
+        if len(values) != count:
+            raise ValueError("corrupt snapshot column")
+        return values
+
+
+@instrumented()
+def save_snapshot(path, fingerprints, users, employees, vacations):
+    """
+    Escribe el snapshot binario (sin pickle) de los tres archivos.
+    fingerprints son las huellas de los CSV de los que salieron los datos.
+    Retorna False (sin escribir) si algún texto contiene el separador.
+    """
+    if any(fingerprint is None for fingerprint in fingerprints):
+        return False
+
+    user_columns = [[u[key] for u in users] for key in ('username', 'password', 'role')]
+    employee_columns = [
+        [e.employee_id for e in employees],
+        [e.full_name for e in employees],
+        [e.position for e in employees],
+        [e.department for e in employees],
+        [e.hire_date_text for e in employees],
+    ]
+    vacation_columns = [
+        [v.employee_id for v in vacations],
+        [v.full_name for v in vacations],
+    ]
+    for column in user_columns + employee_columns + vacation_columns:
+        if any(_SEPARATOR in value for value in column):
+            return False
+
+    parts = [_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION)]
+    parts.extend(fingerprints)
+
+    parts.append(_COUNT.pack(len(users)))
+    parts.extend(_pack_strings(column) for column in user_columns)
+
+    parts.append(_COUNT.pack(len(employees)))
+    parts.extend(_pack_strings(column) for column in employee_columns)
+
+    parts.append(_COUNT.pack(len(vacations)))
+    parts.extend(_pack_strings(column) for column in vacation_columns)
+    parts.append(_pack_array(array('q', [v.start_date.toordinal() for v in vacations])))
+    parts.append(_pack_array(array('q', [v.end_date.toordinal() for v in vacations])))
+    parts.append(_pack_array(array('d', [v.total_days_taken for v in vacations])))
+    parts.append(_pack_array(array('b', [STATUS_CODES[v.status] for v in vacations])))
+    parts.append(_pack_array(array('q', [v.month for v in vacations])))
+    parts.append(_pack_array(array('q', [v.year for v in vacations])))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(b"".join(parts))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+    return True
+
+
+@instrumented()
+def load_snapshot(path, fingerprints):
+    """
+    Carga el snapshot si existe y sus huellas coinciden con las actuales.
+    Retorna (users, employees, vacations) o None si no es válido.
+    """
+    try:
+        with open(path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                with gc_paused():
+                    return _read_snapshot(buffer, fingerprints)
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def _read_snapshot(buffer, fingerprints):
+    reader = _Reader(buffer)
+    magic, version = reader.unpack(_HEADER)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        return None
+    for fingerprint in fingerprints:
+        stored = buffer[reader.offset:reader.offset + _FINGERPRINT.size]
+        reader.offset += _FINGERPRINT.size
+        if fingerprint is None or stored != fingerprint:
+            return None
+
+    (count,) = reader.unpack(_COUNT)
+    usernames, passwords, roles = (reader.strings(count) for _ in range(3))
+    users = [
+        {'username': username, 'password': password, 'role': role}
+        for username, password, role in zip(usernames, passwords, roles)
+    ]
+
+    (count,) = reader.unpack(_COUNT)
+    employee_columns = [reader.strings(count) for _ in range(5)]
+    employees = [Employee(*fields) for fields in zip(*employee_columns)]
+
+    (count,) = reader.unpack(_COUNT)
+    employee_ids = reader.strings(count)
+    full_names = reader.strings(count)
+    starts = reader.array('q', count)
+    ends = reader.array('q', count)
+    days = reader.array('d', count)
+    status_codes = reader.array('b', count)
+    months = reader.array('q', count)
+    years = reader.array('q', count)
+
+    # las fechas se repiten mucho: una sola instancia por ordinal
+    dates = {}
+    for ordinal in set(starts).union(ends):
+        dates[ordinal] = date.fromordinal(ordinal)
+    vacations = [
+        VacationRequest(employee_id, full_name, dates[start], dates[end],
+                        total, _STATUSES[code], month, year)
+        for employee_id, full_name, start, end, total, code, month, year
+        in zip(employee_ids, full_names, starts, ends, days, status_codes, months, years)
+    ]
+
+    return users, employees, vacations
+
+
+def load_with_snapshot(snapshot_path, users_path, employees_path, vacations_path,
+                       load_users, load_employees, load_vacations):
+    """
+    Usa el snapshot si sigue vigente; si no, carga los CSV con los loaders
+    dados y reconstruye el snapshot para el próximo arranque.
+    """
+    paths = (users_path, employees_path, vacations_path)
+    fingerprints = [file_fingerprint(p) for p in paths]
+
+    data = load_snapshot(snapshot_path, fingerprints)
+    if data is not None:
+        users, employees, vacations = data
+        print(f"Loaded from snapshot: {snapshot_path}")
+        print(f"Users loaded: {len(users)}")
+        print(f"Employees loaded: {len(employees)}")
+        print(f"Vacations records loaded: {len(vacations)}")
+        return users, employees, vacations
+
+    users = load_users(users_path)
+    employees = load_employees(employees_path)
+    vacations = load_vacations(vacations_path)
+
+    # si un CSV cambió mientras se leía, no se guarda un snapshot mezclado
+    if fingerprints == [file_fingerprint(p) for p in paths]:
+        try:
+            save_snapshot(snapshot_path, fingerprints, users, employees, vacations)
+        except Exception as e:
+            print(f"Error while saving snapshot: {e}")
+    return users, employees, vacations
+
+
+def refresh_snapshot(snapshot_path, users_path, employees_path, vacations_path,
+                     users, employees, vacations):
+    """
+    Reescribe el snapshot justo después de guardar los CSV desde memoria
+    (p. ej. al compactar el journal), para que el siguiente arranque no
+    tenga que volver a leerlos.
+    """
+    fingerprints = [file_fingerprint(p) for p in (users_path, employees_path, vacations_path)]
+    try:
+        return save_snapshot(snapshot_path, fingerprints, users, employees, vacations)
+    except Exception as e:
+        print(f"Error while saving snapshot: {e}")
+        return False
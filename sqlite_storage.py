@@ -0,0 +1,443 @@
+# sqlite_storage.py
+"""
+Backend SQLite (archivo local, sin servidor) para empleados y solicitudes.
+
+Migración desde los CSV y exportación de vuelta:
+    python sqlite_storage.py migrate [--db vacations.db]
+    python sqlite_storage.py export [--db vacations.db]
+"""
+import argparse
+import sqlite3
+
+from employees import load_data_employees, save_data_employees
+from instrumentation import instrumented
+from records import DATE_FORMAT, Employee, Status, VacationRequest, parse_date
+from vacations import load_vacations, save_vacations
+
+DATABASE_FILE = "vacations.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    employee_id TEXT PRIMARY KEY,
+    full_name TEXT NOT NULL,
+    position TEXT NOT NULL,
+    department TEXT NOT NULL,
+    hire_date TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS vacations (
+    employee_id TEXT NOT NULL,
+    full_name TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    total_days_taken REAL NOT NULL,
+    status TEXT NOT NULL,
+    month INTEGER NOT NULL,
+    year INTEGER NOT NULL
+);
+-- una sola solicitud activa por llave; las RECHAZADAS se pueden volver a
+-- pedir para las mismas fechas (como en los CSV)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_vacations_active_key
+    ON vacations (employee_id, start_date, end_date) WHERE status != 'REJECTED';
+CREATE INDEX IF NOT EXISTS idx_vacations_status ON vacations (status, start_date);
+CREATE INDEX IF NOT EXISTS idx_vacations_period ON vacations (year, month);
+CREATE INDEX IF NOT EXISTS idx_vacations_employee ON vacations (employee_id, start_date);
+CREATE INDEX IF NOT EXISTS idx_employees_department ON employees (department COLLATE NOCASE);
+"""
+
+_EMPLOYEE_COLUMNS = "employee_id, full_name, position, department, hire_date"
+_VACATION_COLUMNS = ("employee_id, full_name, start_date, end_date, "
+                     "total_days_taken, status, month, year")
+# columnas calificadas para consultas con JOIN a employees
+_JOINED_VACATION_COLUMNS = ", ".join("v." + c for c in _VACATION_COLUMNS.split(", "))
+
+
+def connect(db_path):
+    # el servicio la usa desde el event loop y desde su hilo escritor
+    # (nunca a la vez: ver service.VacationService.state_lock)
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _employee_params(employee):
+    return (employee.employee_id, employee.full_name, employee.position,
+            employee.department, employee.hire_date_text)
+
+
+def _vacation_params(vacation):
+    return (vacation.employee_id, vacation.full_name,
+            vacation.start_date.strftime(DATE_FORMAT),
+            vacation.end_date.strftime(DATE_FORMAT),
+            vacation.total_days_taken, vacation.status.value,
+            vacation.month, vacation.year)
+
+
+def _vacation_from_row(row):
+    employee_id, full_name, start_date, end_date, total, status, month, year = row
+    return VacationRequest(employee_id, full_name, parse_date(start_date), parse_date(end_date),
+                           total, Status(status), month, year)
+
+
+class SqliteEmployeeRepository:
+    """
+    Misma interfaz que repository.EmployeeRepository, sobre la tabla
+    employees (búsqueda por la llave primaria).
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __iter__(self):
+        cursor = self.conn.execute(f"SELECT {_EMPLOYEE_COLUMNS} FROM employees ORDER BY rowid")
+        return (Employee(*row) for row in cursor)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0]
+
+    def __bool__(self):
+        return self.conn.execute("SELECT 1 FROM employees LIMIT 1").fetchone() is not None
+
+    def add(self, employee):
+        with self.conn:
+            self.conn.execute(
+                f"INSERT OR IGNORE INTO employees ({_EMPLOYEE_COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+                _employee_params(employee),
+            )
+        return employee
+
+    append = add
+
+    def get(self, employee_id):
+        row = self.conn.execute(
+            f"SELECT {_EMPLOYEE_COLUMNS} FROM employees WHERE employee_id = ?",
+            (employee_id,),
+        ).fetchone()
+        return Employee(*row) if row else None
+
+    def exists(self, employee_id):
+        row = self.conn.execute(
+            "SELECT 1 FROM employees WHERE employee_id = ?", (employee_id,)
+        ).fetchone()
+        return row is not None
+
+    def in_department(self, department):
+        cursor = self.conn.execute(
+            f"SELECT {_EMPLOYEE_COLUMNS} FROM employees "
+            f"WHERE department = ? COLLATE NOCASE ORDER BY rowid",
+            (department.strip(),),
+        )
+        return [Employee(*row) for row in cursor]
+
+    def added_after(self, count):
+        # no se borran filas: las primeras count por rowid son las de antes
+        cursor = self.conn.execute(
+            f"SELECT {_EMPLOYEE_COLUMNS} FROM employees ORDER BY rowid LIMIT -1 OFFSET ?",
+            (count,),
+        )
+        return [Employee(*row) for row in cursor]
+
+
+class SqliteVacationRepository:
+    """
+    Misma interfaz que repository.VacationRepository, resuelta con
+    consultas sobre índices; los cambios de estado son un UPDATE de una
+    sola fila.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._approval_listeners = []
+
+    def on_approval_change(self, listener):
+        """
+        Como VacationRepository.on_approval_change: solo ve los cambios
+        hechos por este proceso.
+        """
+        self._approval_listeners.append(listener)
+
+    def _approval_changed(self, vacation, sign):
+        for listener in self._approval_listeners:
+            listener(vacation, sign)
+
+    def _select(self, where="", params=()):
+        cursor = self.conn.execute(
+            f"SELECT {_VACATION_COLUMNS} FROM vacations {where}", params
+        )
+        return [_vacation_from_row(row) for row in cursor]
+
+    def __iter__(self):
+        cursor = self.conn.execute(f"SELECT {_VACATION_COLUMNS} FROM vacations ORDER BY rowid")
+        return (_vacation_from_row(row) for row in cursor)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM vacations").fetchone()[0]
+
+    def __bool__(self):
+        return self.conn.execute("SELECT 1 FROM vacations LIMIT 1").fetchone() is not None
+
+    def add(self, vacation):
+        """
+        Retorna la solicitud, o None si ya había una activa con la misma
+        llave (la base no la inserta).
+        """
+        with self.conn:
+            cursor = self.conn.execute(
+                f"INSERT OR IGNORE INTO vacations ({_VACATION_COLUMNS}) "
+                f"VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                _vacation_params(vacation),
+            )
+        if cursor.rowcount == 0:
+            return None
+        if vacation.status is Status.APPROVED:
+            self._approval_changed(vacation, 1)
+        return vacation
+
+    append = add
+
+    def add_many(self, vacations):
+        """
+        Inserta varias solicitudes en una sola transacción. Retorna las que
+        se insertaron (quedan afuera las que ya tenían una activa con la
+        misma llave).
+        """
+        inserted = []
+        with self.conn:
+            for vacation in vacations:
+                cursor = self.conn.execute(
+                    f"INSERT OR IGNORE INTO vacations ({_VACATION_COLUMNS}) "
+                    f"VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    _vacation_params(vacation),
+                )
+                if cursor.rowcount:
+                    inserted.append(vacation)
+        for vacation in inserted:
+            if vacation.status is Status.APPROVED:
+                self._approval_changed(vacation, 1)
+        return inserted
+
+    def with_key(self, key):
+        employee_id, start_date, end_date = key
+        return self._select(
+            "WHERE employee_id = ? AND start_date = ? AND end_date = ? ORDER BY rowid",
+            (employee_id, start_date.strftime(DATE_FORMAT), end_date.strftime(DATE_FORMAT)),
+        )
+
+    def get(self, key):
+        # como VacationRepository.get: la activa, si no la última
+        rows = self.with_key(key)
+        for vacation in rows:
+            if vacation.status is not Status.REJECTED:
+                return vacation
+        return rows[-1] if rows else None
+
+    def find(self, key, status):
+        for vacation in self.with_key(key):
+            if vacation.status is status:
+                return vacation
+        return None
+
+    def for_employee(self, employee_id):
+        return self._select("WHERE employee_id = ? ORDER BY rowid", (employee_id,))
+
+    def with_status(self, status):
+        return self._select("WHERE status = ? ORDER BY rowid", (status.value,))
+
+    def in_period(self, year, month):
+        return self._select("WHERE year = ? AND month = ? ORDER BY rowid", (year, month))
+
+    def approved_in_range(self, start_date, end_date):
+        # se itera el cursor sin materializar la lista (exportes grandes)
+        cursor = self.conn.execute(
+            f"SELECT {_VACATION_COLUMNS} FROM vacations "
+            f"WHERE status = ? AND start_date <= ? AND end_date >= ? ORDER BY rowid",
+            (Status.APPROVED.value, end_date.strftime(DATE_FORMAT),
+             start_date.strftime(DATE_FORMAT)),
+        )
+        return (_vacation_from_row(row) for row in cursor)
+
+    def overlapping(self, employee_id, start_date, end_date):
+        return self._select(
+            "WHERE employee_id = ? AND status != ? AND start_date <= ? AND end_date >= ? "
+            "ORDER BY start_date",
+            (employee_id, Status.REJECTED.value, end_date.strftime(DATE_FORMAT),
+             start_date.strftime(DATE_FORMAT)),
+        )
+
+    def department_overlapping(self, department, start_date, end_date):
+        cursor = self.conn.execute(
+            f"SELECT {_JOINED_VACATION_COLUMNS} "
+            f"FROM vacations v JOIN employees e ON e.employee_id = v.employee_id "
+            f"WHERE e.department = ? COLLATE NOCASE AND v.status != ? "
+            f"AND v.start_date <= ? AND v.end_date >= ? ORDER BY v.start_date",
+            (department.strip(), Status.REJECTED.value, end_date.strftime(DATE_FORMAT),
+             start_date.strftime(DATE_FORMAT)),
+        )
+        return [_vacation_from_row(row) for row in cursor]
+
+    def used_days(self, employee_id):
+        row = self.conn.execute(
+            "SELECT COALESCE(SUM(total_days_taken), 0) FROM vacations "
+            "WHERE employee_id = ? AND status = ?",
+            (employee_id, Status.APPROVED.value),
+        ).fetchone()
+        return row[0]
+
+    def update_status(self, vacation, new_status):
+        """
+        UPDATE de una sola fila por su llave, solo si sigue en el estado
+        que tiene el registro (otro operador pudo cambiarla). Retorna False
+        si no hubo cambio.
+        """
+        if vacation.status is new_status:
+            return False
+        with self.conn:
+            cursor = self.conn.execute(
+                "UPDATE vacations SET status = ? "
+                "WHERE employee_id = ? AND start_date = ? AND end_date = ? AND status = ?",
+                (new_status.value, vacation.employee_id,
+                 vacation.start_date.strftime(DATE_FORMAT),
+                 vacation.end_date.strftime(DATE_FORMAT), vacation.status.value),
+            )
+        if cursor.rowcount == 0:
+            return False
+        self._status_changed(vacation, new_status)
+        return True
+
+    def update_status_many(self, changes):
+        """
+        Varios cambios de estado [(solicitud, nuevo estado), ...] en una
+        sola transacción, cada uno condicionado al estado que tiene el
+        registro (como update_status). Retorna cuántos cambiaron algo.
+        """
+        updated = []
+        with self.conn:
+            for vacation, new_status in changes:
+                if vacation.status is new_status:
+                    continue
+                cursor = self.conn.execute(
+                    "UPDATE vacations SET status = ? "
+                    "WHERE employee_id = ? AND start_date = ? AND end_date = ? AND status = ?",
+                    (new_status.value, vacation.employee_id,
+                     vacation.start_date.strftime(DATE_FORMAT),
+                     vacation.end_date.strftime(DATE_FORMAT), vacation.status.value),
+                )
+                if cursor.rowcount:
+                    updated.append((vacation, new_status))
+        for vacation, new_status in updated:
+            self._status_changed(vacation, new_status)
+        return len(updated)
+
+    def _status_changed(self, vacation, new_status):
+        was_approved = vacation.status is Status.APPROVED
+        vacation.status = new_status
+        if new_status is Status.APPROVED and not was_approved:
+            self._approval_changed(vacation, 1)
+        elif was_approved and new_status is not Status.APPROVED:
+            self._approval_changed(vacation, -1)
+
+
+class SqliteStorage:
+    """
+    Backend SQLite. Cada cambio ya queda guardado en la base, así que no
+    hay journal ni volcado a CSV.
+    """
+    journal = None
+
+    def __init__(self, db_path, users_path, load_users):
+        self.db_path = db_path
+        self.users_path = users_path
+        self.load_users = load_users
+        self.conn = None
+
+    @instrumented()
+    def load(self):
+        users = self.load_users(self.users_path)
+        print(f"Using SQLite database: {self.db_path}")
+        self.conn = connect(self.db_path)
+        employees = SqliteEmployeeRepository(self.conn)
+        vacations = SqliteVacationRepository(self.conn)
+        if not employees:
+            print("The database has no employees. "
+                  "Run 'python sqlite_storage.py migrate' to import the CSV files.")
+        return users, employees, vacations
+
+    def refresh(self):
+        # cada consulta ya lee la base, con lo que guardaron los demás
+        pass
+
+    def employees_changed(self):
+        pass
+
+    def vacations_changed(self):
+        pass
+
+    def flush(self):
+        return False
+
+    def close(self, save=True):
+        # cada cambio ya se guardó en la base
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+def migrate_csv_to_sqlite(db_path, employees_path, vacations_path):
+    """
+    Importa employees.csv y vacations.csv a la base (las filas que ya
+    están, con la misma llave y estado, se ignoran, así que se puede correr
+    más de una vez).
+    """
+    employees = load_data_employees(employees_path)
+    vacations = load_vacations(vacations_path)
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.executemany(
+                f"INSERT OR IGNORE INTO employees ({_EMPLOYEE_COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+                map(_employee_params, employees),
+            )
+            conn.executemany(
+                f"INSERT OR IGNORE INTO vacations ({_VACATION_COLUMNS}) "
+                f"SELECT ?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8 WHERE NOT EXISTS ("
+                f"SELECT 1 FROM vacations WHERE employee_id = ?1 AND start_date = ?3 "
+                f"AND end_date = ?4 AND status = ?6)",
+                map(_vacation_params, vacations),
+            )
+        employee_count = conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0]
+        vacation_count = conn.execute("SELECT COUNT(*) FROM vacations").fetchone()[0]
+    finally:
+        conn.close()
+    print(f"Database {db_path} now has {employee_count} employees "
+          f"and {vacation_count} vacation records.")
+
+
+def export_sqlite_to_csv(db_path, employees_path, vacations_path):
+    """
+    Escribe el contenido de la base en los CSV (mismo formato de siempre).
+    """
+    conn = connect(db_path)
+    try:
+        save_data_employees(employees_path, SqliteEmployeeRepository(conn))
+        save_vacations(vacations_path, SqliteVacationRepository(conn))
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite storage for the Vacations Manager System.")
+    parser.add_argument("command", choices=["migrate", "export"],
+                        help="migrate: import the CSV files into the database; "
+                             "export: write the database back to the CSV files")
+    parser.add_argument("--db", default=DATABASE_FILE, help="SQLite database file")
+    parser.add_argument("--employees", default="employees.csv", help="employees CSV file")
+    parser.add_argument("--vacations", default="vacations.csv", help="vacations CSV file")
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        migrate_csv_to_sqlite(args.db, args.employees, args.vacations)
+    else:
+        export_sqlite_to_csv(args.db, args.employees, args.vacations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+# storage.py
+import threading
+
+from concurrency import FileLock, file_stamp
+from employees import load_data_employees, save_data_employees
+from fastload import load_data_employees_fast, load_users_fast, load_vacations_fast
+from instrumentation import instrumented
+from journal import Journal
+from repository import EmployeeRepository, VacationRepository
+from snapshot import load_with_snapshot, refresh_snapshot
+from sqlite_storage import SqliteStorage
+from utils import load_users
+from vacations import load_vacations, save_vacations
+
+STORAGE_BACKENDS = ("csv", "sqlite")
+
+
+class CsvStorage:
+    """
+    Backend CSV: carga los tres archivos (opcionalmente con fastload y el
+    snapshot) en repositorios en memoria y guarda con journal o
+    reescribiendo el CSV completo.
+
+    Solo se guarda lo que cambió desde el último guardado (se compara el
+    version de cada repositorio). Sin journal, write_behind (segundos)
+    junta los cambios y los guarda en un solo volcado cuando se cumple el
+    plazo o al cerrar; None guarda enseguida. El temporizador corre en otro
+    hilo y solo escribe: si otro proceso reescribió el CSV, el merge (que
+    cambia los repositorios) queda para el próximo refresh() del hilo
+    principal.
+
+    Varios operadores pueden trabajar a la vez sobre los mismos archivos:
+    - con journal, cada cambio se escribe con el bloqueo del journal tomado
+      y después de aplicar lo que escribieron los demás (ver
+      concurrency.transaction), y una compactación de otro proceso se
+      incorpora releyendo los CSV
+    - sin journal, cada CSV se guarda con su bloqueo tomado; si otro
+      proceso lo reescribió desde la última lectura, primero se incorporan
+      sus cambios (merge) y, si los dos cambiaron la misma solicitud, queda
+      la que se guardó primero
+
+    Todos los backends exponen:
+    - load() -> (users, employees, vacations)
+    - journal: Journal o None (lo reciben las funciones que modifican datos)
+    - refresh(): incorporar lo que guardaron otros operadores
+    - employees_changed() / vacations_changed(): llamar después de cada cambio
+    - flush(): guardar ya lo pendiente
+    - close(): al salir (siempre, también tras Ctrl+C)
+    """
+
+    def __init__(self, users_path, employees_path, vacations_path,
+                 journal_path=None, snapshot_path=None, fast_loader=True,
+                 write_behind=None):
+        self.users_path = users_path
+        self.employees_path = employees_path
+        self.vacations_path = vacations_path
+        self.snapshot_path = snapshot_path
+        self.journal = None
+        if journal_path:
+            self.journal = Journal(journal_path, on_new_generation=self._merge_compacted)
+        if fast_loader:
+            self.loaders = (load_users_fast, load_data_employees_fast, load_vacations_fast)
+        else:
+            self.loaders = (load_users, load_data_employees, load_vacations)
+        self.write_behind = write_behind
+        self.users = []
+        self.employees = None
+        self.vacations = None
+        self._saved_employees = 0
+        self._saved_vacations = 0
+        self._timer = None
+        # el temporizador no pudo guardar porque había que incorporar antes
+        self._flush_deferred = False
+        self._lock = threading.RLock()
+        self._employees_lock = FileLock(employees_path)
+        self._vacations_lock = FileLock(vacations_path)
+        self._employees_stamp = None
+        self._vacations_stamp = None
+
+    @instrumented()
+    def load(self):
+        # antes de leer: si otro proceso guarda mientras tanto, el próximo
+        # guardado lo incorpora
+        self._employees_stamp = file_stamp(self.employees_path)
+        self._vacations_stamp = file_stamp(self.vacations_path)
+        if self.snapshot_path:
+            users, employee_rows, vacation_rows = load_with_snapshot(
+                self.snapshot_path, self.users_path, self.employees_path,
+                self.vacations_path, *self.loaders
+            )
+        else:
+            users = self.loaders[0](self.users_path)
+            employee_rows = self.loaders[1](self.employees_path)
+            vacation_rows = self.loaders[2](self.vacations_path)
+
+        self.users = users
+        self.employees = EmployeeRepository(employee_rows)
+        self.vacations = VacationRepository(vacation_rows, self.employees)
+        # lo que está en los CSV; lo reaplicado del journal cuenta como
+        # pendiente hasta la próxima compactación
+        self._saved_employees = self.employees.version
+        self._saved_vacations = self.vacations.version
+        if self.journal is not None:
+            self.journal.replay(self.employees, self.vacations)
+        return self.users, self.employees, self.vacations
+
+    def employees_dirty(self):
+        return self.employees.version != self._saved_employees
+
+    def vacations_dirty(self):
+        return self.vacations.version != self._saved_vacations
+
+    def _merge_employees(self, rows):
+        """
+        Agrega los empleados que otro proceso guardó. Retorna cuántos.
+        """
+        added = 0
+        for employee in rows:
+            if not self.employees.exists(employee.employee_id):
+                self.employees.add(employee)
+                added += 1
+        return added
+
+    def _merge_vacations(self, rows, committed=False):
+        """
+        Incorpora las solicitudes del CSV que otro proceso guardó: agrega
+        las nuevas y toma su estado cuando cambió respecto de saved_status
+        (el estado que este proceso leyó o guardó por última vez). Si este
+        proceso también la cambió, gana la del archivo y se avisa.
+        committed: el CSV ya incluye todos los cambios de este proceso
+        (compactación del journal), así que manda el archivo sin comparar.
+        Retorna (cambios incorporados, conflictos).
+        """
+        merged = 0
+        conflicts = []
+        # varias solicitudes pueden compartir llave: la n-ésima del archivo
+        # con esa llave es la n-ésima de memoria (ambas en orden de alta)
+        seen = {}
+        for record in rows:
+            key = record.key
+            position = seen.get(key, 0)
+            seen[key] = position + 1
+            same_key = self.vacations.with_key(key)
+            mine = same_key[position] if position < len(same_key) else None
+            if mine is None:
+                self.vacations.add(record)
+                merged += 1
+                continue
+            if committed:
+                merged += self.vacations.update_status(mine, record.status)
+                continue
+            if record.status is mine.saved_status:
+                continue
+            if mine.status is not mine.saved_status and mine.status is not record.status:
+                conflicts.append((mine, mine.status))
+            self.vacations.update_status(mine, record.status)
+            mine.saved_status = record.status
+            merged += 1
+
+        for vacation, discarded in conflicts:
+            print(f"Conflict: request {vacation.employee_id} {vacation.start_date} to "
+                  f"{vacation.end_date} was set to {vacation.status.value} by another "
+                  f"operator; your change to {discarded.value} was discarded.")
+        return merged, conflicts
+
+    def _refresh_employees(self):
+        """
+        Con el bloqueo del CSV tomado: si otro proceso lo reescribió, lo
+        incorpora.
+        """
+        stamp = file_stamp(self.employees_path)
+        if stamp == self._employees_stamp:
+            return
+        was_dirty = self.employees_dirty()
+        self._merge_employees(self.loaders[1](self.employees_path))
+        self._employees_stamp = stamp
+        if not was_dirty:
+            # lo incorporado ya está en el archivo
+            self._saved_employees = self.employees.version
+
+    def _refresh_vacations(self):
+        stamp = file_stamp(self.vacations_path)
+        if stamp == self._vacations_stamp:
+            return
+        was_dirty = self.vacations_dirty()
+        self._merge_vacations(self.loaders[2](self.vacations_path))
+        self._vacations_stamp = stamp
+        if not was_dirty:
+            self._saved_vacations = self.vacations.version
+
+    def _merge_compacted(self):
+        """
+        Otro proceso compactó el journal: todo lo confirmado quedó en los
+        CSV, que pasan a coincidir con la memoria una vez incorporados.
+        """
+        self._merge_employees(self.loaders[1](self.employees_path))
+        self._merge_vacations(self.loaders[2](self.vacations_path), committed=True)
+        self._employees_stamp = file_stamp(self.employees_path)
+        self._vacations_stamp = file_stamp(self.vacations_path)
+        self._saved_employees = self.employees.version
+        self._saved_vacations = self.vacations.version
+
+    @instrumented()
+    def refresh(self):
+        """
+        Incorpora lo que guardaron otros operadores desde la última
+        lectura (con journal, solo las líneas nuevas del journal).
+        """
+        if self.employees is None:
+            return
+        if self.journal is not None:
+            self.journal.sync()
+            return
+        with self._lock:
+            with self._employees_lock:
+                self._refresh_employees()
+            with self._vacations_lock:
+                self._refresh_vacations()
+            if self._flush_deferred:
+                self._flush_deferred = False
+                self.flush()
+
+    def _compact(self):
+        with self._lock, self.journal.lock:
+            # primero lo que escribieron otros, para decidir qué archivo cambió
+            self.journal.sync()
+            employees_version = self.employees.version
+            vacations_version = self.vacations.version
+            if not self.journal.compact(self.employees_path, self.employees,
+                                        self.vacations_path, self.vacations,
+                                        employees_changed=self.employees_dirty(),
+                                        vacations_changed=self.vacations_dirty()):
+                return False
+            self._saved_employees = employees_version
+            self._saved_vacations = vacations_version
+            self._employees_stamp = file_stamp(self.employees_path)
+            self._vacations_stamp = file_stamp(self.vacations_path)
+            return True
+
+    def _save_employees(self, merge=True):
+        with self._employees_lock:
+            if not self._merge_before_save(merge, self._refresh_employees,
+                                           self.employees_path, self._employees_stamp):
+                return False
+            # version se lee antes de copiar: un cambio que llegue durante
+            # el guardado deja el repositorio sucio para el siguiente
+            version = self.employees.version
+            if not save_data_employees(self.employees_path, list(self.employees)):
+                return False
+            self._employees_stamp = file_stamp(self.employees_path)
+            self._saved_employees = version
+            return True
+
+    def _save_vacations(self, merge=True):
+        with self._vacations_lock:
+            if not self._merge_before_save(merge, self._refresh_vacations,
+                                           self.vacations_path, self._vacations_stamp):
+                return False
+            version = self.vacations.version
+            records = list(self.vacations)
+            # el estado que se guarda, tomado antes de escribir (el hilo
+            # principal puede cambiarlo mientras tanto)
+            statuses = [v.status for v in records]
+            if not save_vacations(self.vacations_path, records):
+                return False
+            self._vacations_stamp = file_stamp(self.vacations_path)
+            self._saved_vacations = version
+            for vacation, status in zip(records, statuses):
+                vacation.saved_status = status
+            return True
+
+    def _merge_before_save(self, merge, refresh, path, stamp):
+        """
+        Con el bloqueo del CSV tomado: incorpora lo que guardó otro proceso
+        (merge=True, hilo principal). Con merge=False (temporizador) no
+        toca los repositorios: si el archivo cambió retorna False y el
+        guardado queda para el próximo refresh().
+        """
+        if merge:
+            refresh()
+            return True
+        if file_stamp(path) != stamp:
+            self._flush_deferred = True
+            return False
+        return True
+
+    def _changed(self):
+        if self.journal is not None:
+            # cada cambio ya quedó en el journal; solo falta compactar
+            if self.journal.needs_compaction():
+                self._compact()
+        elif self.write_behind:
+            self._schedule_flush()
+        else:
+            self.flush()
+
+    @instrumented()
+    def employees_changed(self):
+        if self.employees_dirty():
+            self._changed()
+
+    @instrumented()
+    def vacations_changed(self):
+        if self.vacations_dirty():
+            self._changed()
+
+    def _schedule_flush(self):
+        with self._lock:
+            if self._timer is None:
+                self._timer = threading.Timer(self.write_behind, self._timer_flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _timer_flush(self):
+        with self._lock:
+            self._timer = None
+            self.flush(merge=False)
+
+    def _cancel_timer(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    @instrumented()
+    def flush(self, merge=True):
+        """
+        Sin journal, reescribe los CSV que tienen cambios sin guardar.
+        merge=False (temporizador) no incorpora cambios de otros procesos
+        (ver _merge_before_save).
+        Retorna True si guardó algo.
+        """
+        if self.journal is not None or self.employees is None:
+            return False
+        with self._lock:
+            saved = False
+            if self.employees_dirty():
+                saved = self._save_employees(merge) or saved
+            if self.vacations_dirty():
+                saved = self._save_vacations(merge) or saved
+            return saved
+
+    @instrumented()
+    def close(self, save=True):
+        """
+        Guarda lo pendiente y compacta el journal si hay algo que no está en
+        los CSV (también lo reaplicado o lo que escribieron otros).
+        save=False solo cierra, sin escribir nada (simulaciones).
+        """
+        self._cancel_timer()
+        if self.employees is None or not save:
+            return
+        saved = self.flush()
+        if self.journal is not None and (self.journal.entries or self.employees_dirty()
+                                         or self.vacations_dirty()):
+            saved = self._compact()
+        if saved and self.snapshot_path:
+            refresh_snapshot(self.snapshot_path, self.users_path, self.employees_path,
+                             self.vacations_path, self.users, self.employees, self.vacations)
+
+
+def open_storage(backend, users_path, employees_path, vacations_path, database_path,
+                 journal_path=None, snapshot_path=None, fast_loader=True, write_behind=None):
+    """
+    Crea el backend configurado ("csv" o "sqlite").
+    Con SQLite los usuarios se siguen leyendo de users.csv.
+    """
+    if backend == "sqlite":
+        load_users_file = load_users_fast if fast_loader else load_users
+        return SqliteStorage(database_path, users_path, load_users_file)
+    if backend == "csv":
+        return CsvStorage(users_path, employees_path, vacations_path,
+                          journal_path, snapshot_path, fast_loader, write_behind)
+    raise ValueError(f"Unknown storage backend: {backend}. Expected one of {STORAGE_BACKENDS}")
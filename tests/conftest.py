@@ -0,0 +1,71 @@
+# conftest.py
+"""
+Datos de prueba chicos en un directorio temporal: dos departamentos, un
+empleado recién ingresado y solicitudes en los tres estados.
+"""
+from datetime import date
+
+import pytest
+
+from records import Status, VacationRequest
+from storage import CsvStorage
+
+USERS = """username,password,role
+admin,secret,admin
+"""
+
+EMPLOYEES = """employee_id,full_name,position,department,hire_date
+E1,Ana Uno,Developer,IT,2020-01-15
+E2,Bruno Dos,Analyst,IT,2019-03-01
+E3,Carla Tres,Recruiter,HR,2018-07-31
+E4,Diego Cuatro,Developer,IT,2026-09-01
+"""
+
+VACATIONS = """employee_id,full_name,vacations_start_date,vacations_end_date,total_days_taken,approval_status,month,year
+E1,Ana Uno,2026-03-02,2026-03-06,5.0,APPROVED,3,2026
+E1,Ana Uno,2026-11-02,2026-11-06,5.0,REJECTED,11,2026
+E2,Bruno Dos,2026-11-03,2026-11-04,2.0,PENDING,11,2026
+E3,Carla Tres,2026-12-07,2026-12-11,5.0,PENDING,12,2026
+"""
+
+HOLIDAYS = """date,description
+2026-12-25,Navidad
+"""
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    (tmp_path / "users.csv").write_text(USERS, encoding="utf-8")
+    (tmp_path / "employees.csv").write_text(EMPLOYEES, encoding="utf-8")
+    (tmp_path / "vacations.csv").write_text(VACATIONS, encoding="utf-8")
+    (tmp_path / "holidays.csv").write_text(HOLIDAYS, encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def open_csv(data_dir, journal=True, write_behind=None):
+    """
+    Un operador: CsvStorage cargado sobre los archivos de data_dir.
+    Retorna (storage, employees, vacations).
+    """
+    storage = CsvStorage(
+        str(data_dir / "users.csv"),
+        str(data_dir / "employees.csv"),
+        str(data_dir / "vacations.csv"),
+        journal_path=str(data_dir / "journal.jsonl") if journal else None,
+        write_behind=write_behind,
+    )
+    _, employees, vacations = storage.load()
+    return storage, employees, vacations
+
+
+def new_request(employee_id, full_name, start_date, end_date, days, status=Status.PENDING):
+    return VacationRequest(employee_id, full_name, start_date, end_date, float(days), status)
+
+
+def statuses(vacations, employee_id, start_date, end_date):
+    return [v.status for v in vacations.with_key((employee_id, start_date, end_date))]
+
+
+NOV_2 = date(2026, 11, 2)
+NOV_6 = date(2026, 11, 6)
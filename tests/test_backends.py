@@ -0,0 +1,91 @@
+# test_backends.py
+"""
+Las mismas operaciones sobre los mismos datos dan el mismo resultado con
+el backend CSV (journal) y con SQLite, también después de reabrir.
+"""
+from datetime import date
+
+import pytest
+
+from conftest import NOV_2, NOV_6, new_request
+from decisions import apply_decisions
+from employees import add_employee
+from records import Employee, Status
+from sqlite_storage import migrate_csv_to_sqlite
+from storage import open_storage
+from vacations import create_vacation_request
+
+EMPLOYEE_IDS = ("E1", "E2", "E3", "E4", "E5")
+RANGES = [(date(2026, 1, 1), date(2026, 12, 31)),
+          (date(2026, 11, 4), date(2026, 11, 9)),
+          (date(2027, 2, 3), date(2027, 2, 3))]
+
+
+def open_backend(data_dir, backend):
+    storage = open_storage(backend, str(data_dir / "users.csv"), str(data_dir / "employees.csv"),
+                           str(data_dir / "vacations.csv"), str(data_dir / "vacations.db"),
+                           journal_path=str(data_dir / "journal.jsonl"))
+    _, employees, vacations = storage.load()
+    return storage, employees, vacations
+
+
+def operate(storage, employees, vacations, monkeypatch):
+    journal = storage.journal
+    assert add_employee(employees, Employee("E5", "Eva Cinco", "Tester", "QA", "2019-05-02"),
+                        journal)
+    storage.employees_changed()
+
+    # las fechas RECHAZADAS de E1 se vuelven a pedir, por consola
+    answers = iter(["E1", "", NOV_2.isoformat(), NOV_6.isoformat()])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    create_vacation_request(employees, vacations, journal)
+    record = new_request("E5", "Eva Cinco", date(2027, 2, 1), date(2027, 2, 5), 5)
+    if journal is not None:
+        assert journal.append("add_vacation", record=record.to_row())
+    vacations.append(record)
+    storage.vacations_changed()
+
+    changes = [(vacations.find(("E1", NOV_2, NOV_6), Status.PENDING), Status.APPROVED),
+               (vacations.get(("E2", date(2026, 11, 3), date(2026, 11, 4))), Status.REJECTED),
+               (vacations.get(("E5", date(2027, 2, 1), date(2027, 2, 5))), Status.APPROVED)]
+    assert apply_decisions(vacations, changes, journal) == 3
+    storage.vacations_changed()
+
+
+def summarize(employees, vacations):
+    def rows(requests):
+        return sorted((v.employee_id, v.start_date, v.end_date, v.total_days_taken, v.status.value)
+                      for v in requests)
+
+    return {
+        'employees': sorted(e.employee_id for e in employees),
+        'IT': sorted(e.employee_id for e in employees.in_department("IT")),
+        'requests': rows(vacations),
+        'by_status': {s.value: rows(vacations.with_status(s)) for s in Status},
+        'used': {e: vacations.used_days(e) for e in EMPLOYEE_IDS},
+        'history': {e: rows(vacations.for_employee(e)) for e in EMPLOYEE_IDS},
+        'overlapping': {(e, start): rows(vacations.overlapping(e, start, end))
+                        for e in EMPLOYEE_IDS for start, end in RANGES},
+        'department': {(d, start): rows(vacations.department_overlapping(d, start, end))
+                       for d in ("IT", "HR", "QA") for start, end in RANGES},
+        'refiled': [v.status.value for v in vacations.with_key(("E1", NOV_2, NOV_6))],
+    }
+
+
+@pytest.mark.parametrize("reopen", [False, True])
+def test_csv_and_sqlite_agree(data_dir, monkeypatch, reopen):
+    migrate_csv_to_sqlite(str(data_dir / "vacations.db"), str(data_dir / "employees.csv"),
+                          str(data_dir / "vacations.csv"))
+    results = {}
+    for backend in ("csv", "sqlite"):
+        storage, employees, vacations = open_backend(data_dir, backend)
+        operate(storage, employees, vacations, monkeypatch)
+        if reopen:
+            storage.close()
+            storage, employees, vacations = open_backend(data_dir, backend)
+        results[backend] = summarize(employees, vacations)
+        storage.close()
+
+    assert results["csv"] == results["sqlite"]
+    assert results["csv"]['refiled'] == ["REJECTED", "APPROVED"]
+    assert results["csv"]['used']["E1"] == 10.0
@@ -0,0 +1,139 @@
+# test_journal.py
+import os
+import subprocess
+import sys
+from datetime import date
+from pathlib import Path
+
+from concurrency import transaction
+from conftest import NOV_2, NOV_6, new_request, open_csv, statuses
+from employees import add_employee
+from records import Employee, Status
+from vacations import load_vacations, status_entry
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def file_vacation(journal, vacations, record):
+    """
+    Lo que hace create_vacation_request una vez validada la solicitud.
+    """
+    with transaction(journal):
+        assert journal.append("add_vacation", record=record.to_row())
+        assert vacations.append(record) is not None
+
+
+def decide(journal, vacations, vacation, new_status):
+    """
+    Lo que hace approve_or_reject_request con la solicitud elegida.
+    """
+    with transaction(journal):
+        assert journal.append("set_status", **status_entry(vacation, Status.PENDING, new_status))
+        assert vacations.update_status(vacation, new_status)
+
+
+def test_replay_after_crash(data_dir, capsys):
+    storage, employees, vacations = open_csv(data_dir)
+    assert add_employee(employees, Employee("E5", "Eva Cinco", "Tester", "QA", "2019-05-02"),
+                        storage.journal)
+    file_vacation(storage.journal, vacations,
+                  new_request("E5", "Eva Cinco", date(2026, 11, 16), date(2026, 11, 20), 5))
+    decide(storage.journal, vacations, vacations.get(("E3", date(2026, 12, 7), date(2026, 12, 11))),
+           Status.APPROVED)
+    # el proceso muere sin close() y a mitad de escribir la última línea
+    with open(data_dir / "journal.jsonl", "a", encoding="utf-8") as file:
+        file.write('{"op": "set_status", "employee_id": "E2"')
+
+    _, employees, vacations = open_csv(data_dir)
+
+    out = capsys.readouterr().out
+    assert "Journal entries replayed: 3" in out
+    assert "Invalid journal entries skipped: 1" in out
+    assert employees.exists("E5")
+    assert statuses(vacations, "E5", date(2026, 11, 16), date(2026, 11, 20)) == [Status.PENDING]
+    assert statuses(vacations, "E3", date(2026, 12, 7), date(2026, 12, 11)) == [Status.APPROVED]
+    assert statuses(vacations, "E2", date(2026, 11, 3), date(2026, 11, 4)) == [Status.PENDING]
+    assert vacations.used_days("E3") == 5.0
+
+
+def test_replay_is_idempotent_after_interrupted_compaction(data_dir, capsys):
+    storage, employees, vacations = open_csv(data_dir)
+    decide(storage.journal, vacations, vacations.get(("E2", date(2026, 11, 3), date(2026, 11, 4))),
+           Status.REJECTED)
+    journal_text = (data_dir / "journal.jsonl").read_text(encoding="utf-8")
+    storage.close()
+    # la compactación escribió los CSV pero murió antes de empezar la
+    # generación nueva: el journal viejo sigue ahí
+    (data_dir / "journal.jsonl").write_text(journal_text, encoding="utf-8")
+
+    _, _, vacations = open_csv(data_dir)
+
+    assert "Journal entries already applied (no effect): 1" in capsys.readouterr().out
+    assert statuses(vacations, "E2", date(2026, 11, 3), date(2026, 11, 4)) == [Status.REJECTED]
+
+
+def test_rejected_dates_refiled_by_second_operator(data_dir):
+    first, _, first_vacations = open_csv(data_dir)
+    second, _, second_vacations = open_csv(data_dir)
+
+    # el segundo operador vuelve a pedir las fechas que estaban RECHAZADAS
+    refiled = new_request("E1", "Ana Uno", NOV_2, NOV_6, 5)
+    file_vacation(second.journal, second_vacations, refiled)
+
+    # el primero la ve al sincronizar, junto a la rechazada, y la aprueba
+    first.refresh()
+    assert statuses(first_vacations, "E1", NOV_2, NOV_6) == [Status.REJECTED, Status.PENDING]
+    decide(first.journal, first_vacations,
+           first_vacations.find(("E1", NOV_2, NOV_6), Status.PENDING), Status.APPROVED)
+
+    second.refresh()
+    assert statuses(second_vacations, "E1", NOV_2, NOV_6) == [Status.REJECTED, Status.APPROVED]
+    assert second_vacations.used_days("E1") == 10.0
+
+    # tras reiniciar sin compactar (replay) y después de compactar (CSV)
+    _, _, replayed = open_csv(data_dir)
+    assert statuses(replayed, "E1", NOV_2, NOV_6) == [Status.REJECTED, Status.APPROVED]
+    first.close()
+    second.close()
+    saved = [v for v in load_vacations(str(data_dir / "vacations.csv"))
+             if v.key == ("E1", NOV_2, NOV_6)]
+    assert [v.status for v in saved] == [Status.REJECTED, Status.APPROVED]
+    _, _, reloaded = open_csv(data_dir)
+    assert statuses(reloaded, "E1", NOV_2, NOV_6) == [Status.REJECTED, Status.APPROVED]
+    assert reloaded.used_days("E1") == 10.0
+
+
+HOLD_LOCK = """
+import sys, time
+from journal import Journal
+journal = Journal(sys.argv[1])
+with journal.lock:
+    print("locked", flush=True)
+    time.sleep(0.5)
+    journal.append("add_employee", record={
+        'employee_id': 'E6', 'full_name': 'Fede Seis', 'position': 'Analyst',
+        'department': 'HR', 'hire_date': '2021-02-01'})
+"""
+
+
+def test_compaction_waits_for_another_process(data_dir):
+    storage, employees, _ = open_csv(data_dir)
+    assert add_employee(employees, Employee("E5", "Eva Cinco", "Tester", "QA", "2019-05-02"),
+                        storage.journal)
+
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    other = subprocess.Popen([sys.executable, "-c", HOLD_LOCK, str(data_dir / "journal.jsonl")],
+                             stdout=subprocess.PIPE, text=True, env=env, cwd=data_dir)
+    try:
+        assert other.stdout.readline().strip() == "locked"
+        # espera el bloqueo y compacta también la entrada del otro proceso
+        storage.close()
+    finally:
+        assert other.wait(timeout=10) == 0
+        other.stdout.close()
+
+    csv_text = (data_dir / "employees.csv").read_text(encoding="utf-8")
+    assert "E5,Eva Cinco" in csv_text
+    assert "E6,Fede Seis" in csv_text
+    journal_lines = (data_dir / "journal.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(journal_lines) == 1 and '"generation"' in journal_lines[0]
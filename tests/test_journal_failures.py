@@ -0,0 +1,108 @@
+# test_journal_failures.py
+"""
+Si el journal no se puede escribir (disco lleno) no se cambia nada en
+memoria: el operador no ve un cambio que se perdería al reiniciar.
+"""
+import csv
+import errno
+import json
+from datetime import date
+
+import pytest
+
+from batch_import import import_requests
+from conftest import open_csv, statuses
+from decisions import apply_decisions
+from employees import add_employee
+from journal import Journal
+from records import Employee, Status
+from service import VacationService
+from vacations import approve_or_reject_request, create_vacation_request
+
+E2_KEY = ("E2", date(2026, 11, 3), date(2026, 11, 4))
+E3_KEY = ("E3", date(2026, 12, 7), date(2026, 12, 11))
+
+
+@pytest.fixture
+def full_disk(monkeypatch):
+    def write(self, lines):
+        raise OSError(errno.ENOSPC, "No space left on device")
+    monkeypatch.setattr(Journal, "_write", write)
+
+
+def answer(monkeypatch, *answers):
+    replies = iter(answers)
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(replies))
+
+
+def test_add_employee(data_dir, full_disk, capsys):
+    storage, employees, _ = open_csv(data_dir)
+
+    assert not add_employee(employees, Employee("E5", "Eva Cinco", "Tester", "QA", "2019-05-02"),
+                            storage.journal)
+
+    assert "The employee could not be saved." in capsys.readouterr().out
+    assert not employees.exists("E5")
+
+
+def test_create_request(data_dir, full_disk, monkeypatch, capsys):
+    storage, employees, vacations = open_csv(data_dir)
+    answer(monkeypatch, "E2", "", "2027-02-01", "2027-02-05")
+
+    create_vacation_request(employees, vacations, storage.journal)
+
+    assert "The vacation request could not be saved." in capsys.readouterr().out
+    assert vacations.with_key(("E2", date(2027, 2, 1), date(2027, 2, 5))) == []
+
+
+def test_approve_request(data_dir, full_disk, monkeypatch, capsys):
+    storage, employees, vacations = open_csv(data_dir)
+    answer(monkeypatch, "", "1", "1")
+
+    approve_or_reject_request(vacations, storage.journal, employees)
+
+    assert "the request is still PENDING" in capsys.readouterr().out
+    assert len(vacations.with_status(Status.PENDING)) == 2
+    assert vacations.used_days("E2") == 0
+
+
+def test_apply_decisions(data_dir, full_disk, capsys):
+    storage, _, vacations = open_csv(data_dir)
+    changes = [(vacations.get(E2_KEY), Status.APPROVED), (vacations.get(E3_KEY), Status.REJECTED)]
+
+    assert apply_decisions(vacations, changes, storage.journal) == 0
+
+    assert "no request was changed" in capsys.readouterr().out
+    assert statuses(vacations, *E2_KEY) == [Status.PENDING]
+    assert statuses(vacations, *E3_KEY) == [Status.PENDING]
+
+
+def test_batch_import(data_dir, full_disk):
+    storage, employees, vacations = open_csv(data_dir)
+    lines = [{'employee_id': "E2", 'start_date': "2027-02-01", 'end_date': "2027-02-05"},
+             {'employee_id': "E9", 'start_date': "2027-02-01", 'end_date': "2027-02-05"}]
+    (data_dir / "requests.jsonl").write_text("".join(json.dumps(line) + "\n" for line in lines),
+                                             encoding="utf-8")
+
+    result = import_requests(str(data_dir / "requests.jsonl"), str(data_dir / "results.csv"),
+                             employees, vacations, storage.journal)
+
+    assert result == (0, 1, 1)
+    with open(data_dir / "results.csv", newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert [row['result'] for row in rows] == ["FAILED", "REJECTED"]
+    assert vacations.with_key(("E2", date(2027, 2, 1), date(2027, 2, 5))) == []
+
+
+def test_service_batch(data_dir, full_disk):
+    storage, employees, vacations = open_csv(data_dir)
+    service = VacationService(storage, storage.users, employees, vacations)
+
+    results = service.apply_batch([
+        ("create", ("E2", date(2027, 2, 1), date(2027, 2, 5))),
+        ("decide", (E3_KEY, Status.APPROVED)),
+    ])
+
+    assert [status for status, _ in results] == [500, 500]
+    assert vacations.with_key(("E2", date(2027, 2, 1), date(2027, 2, 5))) == []
+    assert statuses(vacations, *E3_KEY) == [Status.PENDING]
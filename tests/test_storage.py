@@ -0,0 +1,37 @@
+# test_storage.py
+from datetime import date
+
+from conftest import new_request, open_csv, statuses
+from records import Status
+from vacations import load_vacations
+
+E2_KEY = ("E2", date(2026, 11, 3), date(2026, 11, 4))
+
+
+def test_write_behind_timer_does_not_merge(data_dir):
+    first, _, first_vacations = open_csv(data_dir, journal=False, write_behind=60)
+    second, _, second_vacations = open_csv(data_dir, journal=False)
+
+    first_vacations.add(new_request("E1", "Ana Uno", date(2027, 2, 1), date(2027, 2, 5), 5))
+    first.vacations_changed()
+    # otro operador (sin write-behind) guarda enseguida
+    second_vacations.update_status(second_vacations.get(E2_KEY), Status.APPROVED)
+    second.vacations_changed()
+
+    # el temporizador no toca los repositorios: ve el archivo cambiado y
+    # deja el guardado para el próximo refresh del hilo principal
+    first._cancel_timer()
+    first._timer_flush()
+    assert statuses(first_vacations, *E2_KEY) == [Status.PENDING]
+    assert first.vacations_dirty()
+    saved = load_vacations(str(data_dir / "vacations.csv"))
+    assert len(saved) == 4
+
+    first.refresh()
+    assert statuses(first_vacations, *E2_KEY) == [Status.APPROVED]
+    assert not first.vacations_dirty()
+    saved = {v.key: v.status for v in load_vacations(str(data_dir / "vacations.csv"))}
+    assert saved[E2_KEY] is Status.APPROVED
+    assert saved[("E1", date(2027, 2, 1), date(2027, 2, 5))] is Status.PENDING
+    first.close()
+    second.close()
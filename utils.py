@@ -1,6 +1,14 @@
 import csv
+import gc
+import os
+from contextlib import contextmanager
 
+from instrumentation import instrumented
 
+USER_CSV_HEADER = ['username', 'password', 'role']
+
+
+@instrumented(rows="result")
 def load_users(path: str):
     """
     Carga usuarios desde un CSV con cabecera:
@@ -18,7 +26,7 @@ def load_users(path: str):
                 print("The CSV file is empty.")
                 return users
 
-            expected_header = ['username', 'password', 'role']
+            expected_header = USER_CSV_HEADER
             normalized_header = [col.strip().lower() for col in header]
             expected_normalized = [col.strip().lower() for col in expected_header]
 
@@ -64,6 +72,21 @@ def load_users(path: str):
     return users
 
 
+@contextmanager
+def gc_paused():
+    """
+    Pausa el recolector cíclico mientras se crean millones de registros:
+    cada lote de objetos nuevos lo dispara sin que haya ciclos que recoger.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
 def validate_menu_option(min_option: int, max_option: int) -> int:
     """
     Pide una opción de menú entre min_option y max_option (ambos incluidos).
@@ -77,3 +100,18 @@ def validate_menu_option(min_option: int, max_option: int) -> int:
                 return option
         except ValueError:
             print("Invalid input. Please enter a valid number.")
+
+
+def atomic_write_csv(path: str, fieldnames, rows):
+    """
+    Escribe el CSV en un archivo temporal y lo renombra sobre el destino.
+    Si el proceso muere a mitad de escritura, el archivo original queda intacto.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
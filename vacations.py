@@ -1,6 +1,16 @@
 # vacations.py
 import csv
-from datetime import datetime, timedelta
+from bisect import bisect_left, bisect_right
+from calendar import monthrange
+from datetime import MAXYEAR, date, datetime, timedelta
+from math import ceil
+
+from concurrency import transaction
+from instrumentation import instrumented
+from intervals import peak_overlap
+from pagination import PAGE_SIZE, lazy_sorted, paginate, read_filters
+from records import DATE_FORMAT, Status, VacationRequest, parse_date
+from utils import atomic_write_csv
 
 VACATION_CSV_HEADER = [
     'employee_id',
@@ -13,13 +23,19 @@ VACATION_CSV_HEADER = [
     'year',
 ]
 
-DATE_FORMAT = "%Y-%m-%d"
+HOLIDAY_CSV_HEADER = ['date', 'description']
+
 DAYS_PER_MONTH = 1.5
 MIN_MONTHS_FOR_VACATION = 6
+# ausencias simultáneas por departamento a partir de las cuales se avisa
+MAX_CONCURRENT_ABSENCES = 3
 
-
-def parse_date(date_str: str):
-    return datetime.strptime(date_str, DATE_FORMAT).date()
+# ventanas de fechas sugeridas al crear una solicitud, y cuántos días
+# hacia adelante se buscan
+SUGGESTED_WINDOWS = 3
+SUGGESTION_SEARCH_DAYS = 366
+# máximo de días que se pueden pedir para sugerir fechas
+MAX_SUGGESTED_DAYS = 365
 
 
 def full_months_between(start_date, end_date):
@@ -36,22 +52,86 @@ def full_months_between(start_date, end_date):
     return max(total_months, 0)
 
 
-def count_days_excluding_sundays(start_date, end_date):
+def count_days_excluding_sundays(start_date, end_date, holidays=None):
     """
-    Cuenta días entre start_date y end_date (inclusive), excluyendo domingos.
+    Cuenta días entre start_date y end_date (inclusive), excluyendo domingos
+    y, si se pasa el calendario, los festivos.
+    Semanas completas * 6 + resto, en O(1); los festivos (lista ordenada,
+    ver load_holidays) se descuentan con bisect en O(log H).
     """
     if end_date < start_date:
         return 0
 
-    current = start_date
-    days = 0
-    while current <= end_date:
-        if current.weekday() != 6:  # 6 = Sunday
-            days += 1
-        current += timedelta(days=1)
+    total = (end_date - start_date).days + 1
+    full_weeks, remainder = divmod(total, 7)
+    days = full_weeks * 6 + remainder
+    # el resto cae en domingo si el próximo domingo está dentro de él
+    if (6 - start_date.weekday()) % 7 < remainder:  # 6 = Sunday
+        days -= 1
+
+    if holidays:
+        days -= bisect_right(holidays, end_date) - bisect_left(holidays, start_date)
     return days
 
 
+@instrumented(rows="result")
+def load_holidays(path: str):
+    """
+    Carga el calendario de festivos desde un CSV con cabecera:
+    date,description
+    y devuelve una lista ordenada y sin duplicados de fechas.
+    Los festivos en domingo se descartan porque ya no se cuentan.
+    """
+    holidays = set()
+    invalid_rows = 0
+    print(f"Loading holidays from: {path}")
+
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+
+            if header is None:
+                print("The holidays CSV file is empty.")
+                return []
+
+            normalized_header = [col.strip().lower() for col in header]
+            if normalized_header != HOLIDAY_CSV_HEADER:
+                print("Invalid header on holidays file.")
+                print(f"Expected: {HOLIDAY_CSV_HEADER}")
+                print(f"Found:    {header}")
+                return []
+
+            for row in reader:
+                if not row or all(col.strip() == "" for col in row):
+                    continue
+
+                if len(row) != len(HOLIDAY_CSV_HEADER):
+                    invalid_rows += 1
+                    continue
+
+                try:
+                    holiday = parse_date(row[0].strip())
+                except ValueError:
+                    invalid_rows += 1
+                    continue
+
+                if holiday.weekday() != 6:
+                    holidays.add(holiday)
+
+    except FileNotFoundError:
+        print("No holidays file found. Only Sundays will be excluded.")
+    except UnicodeDecodeError:
+        print("Encoding error. Make sure it is a valid CSV file.")
+    except Exception as e:
+        print(f"An unexpected error occurred while loading holidays: {e}")
+
+    print(f"Holidays loaded: {len(holidays)}")
+    print(f"Invalid rows skipped: {invalid_rows}")
+    return sorted(holidays)
+
+
+@instrumented(rows="result")
 def load_vacations(path: str):
     vacations = []
     invalid_rows = 0
@@ -84,16 +164,21 @@ def load_vacations(path: str):
                     invalid_rows += 1
                     continue
 
-                record = {
-                    'employee_id': row[0].strip(),
-                    'full_name': row[1].strip(),
-                    'vacations_start_date': row[2].strip(),
-                    'vacations_end_date': row[3].strip(),
-                    'total_days_taken': float(row[4].strip()),
-                    'approval_status': row[5].strip(),
-                    'month': int(row[6].strip()),
-                    'year': int(row[7].strip()),
-                }
+                try:
+                    record = VacationRequest(
+                        row[0].strip(),
+                        row[1].strip(),
+                        parse_date(row[2].strip()),
+                        parse_date(row[3].strip()),
+                        float(row[4].strip()),
+                        Status.parse(row[5]),
+                        int(row[6].strip()),
+                        int(row[7].strip()),
+                    )
+                except ValueError:
+                    # fecha, número o estado inválido
+                    invalid_rows += 1
+                    continue
                 vacations.append(record)
 
     except FileNotFoundError:
@@ -108,49 +193,266 @@ def load_vacations(path: str):
     return vacations
 
 
+@instrumented(rows=1)
 def save_vacations(path: str, vacations):
     try:
-        with open(path, "w", encoding="utf-8", newline="") as file:
-            writer = csv.DictWriter(file, fieldnames=VACATION_CSV_HEADER)
-            writer.writeheader()
-            for v in vacations:
-                writer.writerow(v)
+        atomic_write_csv(path, VACATION_CSV_HEADER, (v.to_row() for v in vacations))
         print(f"Vacations saved to: {path}")
+        return True
     except Exception as e:
         print(f"Error while saving vacations: {e}")
+        return False
 
 
+def month_completed(hire_date, months):
+    """
+    Día en que se cumplen months meses completos desde hire_date, con la
+    misma regla que full_months_between: si el día de ingreso no existe en
+    ese mes (31 de enero -> febrero), se cumplen el día 1 del siguiente.
+    None si cae después del año 9999.
+    """
+    year, month = divmod(hire_date.month - 1 + months, 12)
+    year += hire_date.year
+    month += 1
+    if year > MAXYEAR:
+        return None
+    last_day = monthrange(year, month)[1]
+    if hire_date.day <= last_day:
+        return date(year, month, hire_date.day)
+    if (year, month) == (MAXYEAR, 12):
+        return None
+    return date(year, month, last_day) + timedelta(days=1)
+
+
+@instrumented()
 def calculate_accrued_days(employee, today=None, vacations=None):
     """
     Días acumulados de vacaciones para un empleado:
     meses completos * 1.5 - días ya aprobados.
+    today puede ser una fecha futura: proyecta el saldo a ese día con los
+    días aprobados hasta ahora.
     """
     if today is None:
         today = datetime.today().date()
-    if vacations is None:
-        vacations = []
-
-    hire_date = parse_date(employee['hire_date'])
-    months = full_months_between(hire_date, today)
+    # hire_date ya viene parseada; None si el formato era inválido
+    months = 0
+    if employee.hire_date is not None:
+        months = full_months_between(employee.hire_date, today)
     accrued = months * DAYS_PER_MONTH
 
-    # días ya usados en solicitudes APROBADAS
+    # días ya usados en solicitudes APROBADAS (libro del repositorio)
     used = 0
-    for v in vacations:
-        if v['employee_id'] == employee['employee_id'] and v['approval_status'].upper() == "APPROVED":
-            used += float(v['total_days_taken'])
+    if vacations is not None:
+        used = vacations.used_days(employee.employee_id)
 
     available = accrued - used
     return max(available, 0), months, used, accrued
 
 
-def create_vacation_request(employees, vacations):
+def earliest_available_date(employee, days, vacations=None, today=None):
+    """
+    Primer día, desde today, en que el empleado tiene los meses mínimos y
+    al menos days días disponibles (con los días aprobados hasta ahora).
+    None si la fecha de ingreso es inválida o el día cae después del año
+    9999.
+    """
+    if today is None:
+        today = datetime.today().date()
+    if employee.hire_date is None:
+        return None
+    used = vacations.used_days(employee.employee_id) if vacations is not None else 0
+    # round: 7.5 / 1.5 no debe quedar en 5.000000001 meses
+    months_needed = max(ceil(round((days + used) / DAYS_PER_MONTH, 9)), MIN_MONTHS_FOR_VACATION)
+    day = month_completed(employee.hire_date, months_needed)
+    if day is None:
+        return None
+    return max(day, today)
+
+
+def _is_working_day(day, holidays=None):
+    if day.weekday() == 6:  # 6 = Sunday
+        return False
+    if holidays:
+        i = bisect_left(holidays, day)
+        return i == len(holidays) or holidays[i] != day
+    return True
+
+
+def window_end(start_date, days, holidays=None):
+    """
+    Último día de una solicitud que empieza en start_date y usa days días
+    hábiles (sin domingos ni festivos).
+    """
+    end_date = start_date
+    counted = 1 if _is_working_day(start_date, holidays) else 0
+    while counted < days:
+        end_date += timedelta(days=1)
+        if _is_working_day(end_date, holidays):
+            counted += 1
+    return end_date
+
+
+def suggest_vacation_windows(employee, days, vacations, holidays=None, start_from=None,
+                             count=SUGGESTED_WINDOWS):
+    """
+    Hasta count ventanas (inicio, fin, ausentes del departamento) de days
+    días hábiles desde start_from, que no se cruzan con solicitudes activas
+    del empleado ni entre sí, ordenadas por inicio. Primero las que no
+    superan MAX_CONCURRENT_ABSENCES en el departamento; si no alcanzan, se
+    completan con las menos concurridas. Busca hasta
+    SUGGESTION_SEARCH_DAYS días hacia adelante.
+    """
+    if start_from is None:
+        start_from = datetime.today().date()
+    last_start = start_from + timedelta(days=SUGGESTION_SEARCH_DAYS)
+    windows = []
+    crowded = []
+    start_date = start_from
+    while len(windows) < count and start_date <= last_start:
+        if not _is_working_day(start_date, holidays):
+            start_date += timedelta(days=1)
+            continue
+        end_date = window_end(start_date, days, holidays)
+        overlaps = vacations.overlapping(employee.employee_id, start_date, end_date)
+        if overlaps:
+            # la próxima ventana posible empieza después de la que se cruza
+            start_date = max(v.end_date for v in overlaps) + timedelta(days=1)
+            continue
+        absences = department_peak_absences(employee, vacations, start_date, end_date)
+        if absences > MAX_CONCURRENT_ABSENCES:
+            crowded.append((start_date, end_date, absences))
+            start_date += timedelta(days=1)
+            continue
+        windows.append((start_date, end_date, absences))
+        start_date = end_date + timedelta(days=1)
+
+    crowded.sort(key=lambda window: (window[2], window[0]))
+    for window in crowded:
+        if len(windows) >= count:
+            break
+        if all(window[1] < other[0] or window[0] > other[1] for other in windows):
+            windows.append(window)
+    windows.sort()
+    return windows
+
+
+def validate_vacation_dates(start_date, end_date, available, holidays=None):
+    """
+    Valida el rango de fechas contra el saldo disponible.
+    Retorna (días solicitados sin domingos ni festivos, mensaje de error
+    o None si la solicitud es válida).
+    """
+    if end_date < start_date:
+        return 0, "End date cannot be before start date."
+
+    days_requested = count_days_excluding_sundays(start_date, end_date, holidays)
+    if days_requested <= 0:
+        return days_requested, "Requested days must be greater than 0."
+
+    if days_requested > available:
+        return days_requested, "Requested days exceed the available vacation balance."
+
+    return days_requested, None
+
+
+def department_peak_absences(employee, vacations, start_date, end_date, extra=()):
+    """
+    Máximo de empleados del departamento ausentes el mismo día dentro del
+    rango, contando la nueva solicitud. extra: intervalos (inicio, fin)
+    aún no guardados en el repositorio.
+    """
+    others = vacations.department_overlapping(employee.department, start_date, end_date)
+    intervals = [(v.start_date, v.end_date) for v in others
+                 if v.employee_id != employee.employee_id]
+    intervals.extend(extra)
+    intervals.append((start_date, end_date))
+    return peak_overlap(intervals, start_date, end_date)
+
+
+def print_vacation_suggestions(employee, days, vacations, available, holidays=None, today=None):
+    """
+    Muestra desde cuándo el empleado tiene days días y las ventanas
+    sugeridas. Retorna las ventanas que se pueden pedir hoy (vacío si el
+    saldo todavía no alcanza).
+    """
+    if today is None:
+        today = datetime.today().date()
+    try:
+        return _print_vacation_suggestions(employee, days, vacations, available,
+                                           holidays, today)
+    except OverflowError:
+        # la ventana terminaría después del año 9999
+        print(f"{days} days cannot be projected for this employee.")
+        return []
+
+
+def _print_vacation_suggestions(employee, days, vacations, available, holidays, today):
+    earliest = earliest_available_date(employee, days, vacations, today)
+    if earliest is None:
+        print(f"{days} days cannot be projected for this employee.")
+        return []
+
+    if days > available:
+        windows = suggest_vacation_windows(employee, days, vacations, holidays, earliest)
+        print(f"{days} days will be available on {earliest.strftime(DATE_FORMAT)}; "
+              f"the request can be made from that date.")
+        for start_date, end_date, absences in windows:
+            print(f"  - {start_date.strftime(DATE_FORMAT)} to {end_date.strftime(DATE_FORMAT)} "
+                  f"({absences} out in {employee.department})")
+        return []
+
+    windows = suggest_vacation_windows(employee, days, vacations, holidays, today)
+    if not windows:
+        print(f"No free {days}-day window found in the next {SUGGESTION_SEARCH_DAYS} days.")
+        return []
+    print(f"\nSuggested dates for {days} days:")
+    for i, (start_date, end_date, absences) in enumerate(windows, start=1):
+        print(f"{i}. {start_date.strftime(DATE_FORMAT)} to {end_date.strftime(DATE_FORMAT)} "
+              f"({absences} out in {employee.department})")
+    return windows
+
+
+def read_vacation_dates(employee, vacations, available, holidays=None, today=None):
+    """
+    Pide las fechas de la solicitud; con una cantidad de días ofrece
+    ventanas sugeridas para elegir. Retorna (inicio, fin) o None.
+    """
+    text = input("Days wanted, to get suggested dates (Enter to type the dates): ").strip()
+    if text:
+        if not text.isdigit() or int(text) <= 0:
+            print("Days must be a whole number greater than 0.")
+            return None
+        if int(text) > MAX_SUGGESTED_DAYS:
+            print(f"Days cannot be more than {MAX_SUGGESTED_DAYS}.")
+            return None
+        windows = print_vacation_suggestions(employee, int(text), vacations, available,
+                                             holidays, today)
+        if windows:
+            choice = input(f"Choose dates (1-{len(windows)}) or press Enter to type them: ").strip()
+            if choice.isdigit() and 1 <= int(choice) <= len(windows):
+                return windows[int(choice) - 1][:2]
+
+    start_str = input("Enter vacation START date (YYYY-MM-DD): ").strip()
+    end_str = input("Enter vacation END date (YYYY-MM-DD): ").strip()
+
+    try:
+        return parse_date(start_str), parse_date(end_str)
+    except ValueError:
+        print("Invalid date format. Please use YYYY-MM-DD.")
+        return None
+
+
+@instrumented()
+def create_vacation_request(employees, vacations, journal=None, holidays=None):
     """
     Registra una nueva solicitud de vacaciones:
     - Seleccionar empleado
     - Validar >= 6 meses trabajados
-    - Calcular días sin domingos
+    - Sugerir fechas libres para una cantidad de días (opcional)
+    - Calcular días sin domingos ni festivos
     - Validar balance
+    - Rechazar si se cruza con otra solicitud activa del empleado
+    - Avisar si el departamento supera MAX_CONCURRENT_ABSENCES
     - Guardar en estado PENDING
     """
     if not employees:
@@ -158,11 +460,7 @@ def create_vacation_request(employees, vacations):
         return
 
     employee_id = input("Enter Employee ID for vacation request: ").strip()
-    employee = None
-    for e in employees:
-        if e['employee_id'] == employee_id:
-            employee = e
-            break
+    employee = employees.get(employee_id)
 
     if employee is None:
         print("Employee not found.")
@@ -171,7 +469,7 @@ def create_vacation_request(employees, vacations):
     today = datetime.today().date()
     available, months_worked, used, accrued = calculate_accrued_days(employee, today, vacations)
 
-    print(f"\nEmployee: {employee['full_name']}")
+    print(f"\nEmployee: {employee.full_name}")
     print(f"Months worked: {months_worked}")
     print(f"Accrued days: {accrued:.2f}")
     print(f"Used days: {used:.2f}")
@@ -180,66 +478,169 @@ def create_vacation_request(employees, vacations):
     
     if months_worked < MIN_MONTHS_FOR_VACATION:
         print("This employee has less than 6 full months of work. Vacation request is not allowed.")
+        eligible = earliest_available_date(employee, 0, vacations, today)
+        if eligible is not None:
+            print(f"Vacations can be requested from {eligible.strftime(DATE_FORMAT)}.")
         return
 
-    start_str = input("Enter vacation START date (YYYY-MM-DD): ").strip()
-    end_str = input("Enter vacation END date (YYYY-MM-DD): ").strip()
-
-    try:
-        start_date = parse_date(start_str)
-        end_date = parse_date(end_str)
-    except ValueError:
-        print("Invalid date format. Please use YYYY-MM-DD.")
+    dates = read_vacation_dates(employee, vacations, available, holidays, today)
+    if dates is None:
         return
-
-    if end_date < start_date:
-        print("End date cannot be before start date.")
+    start_date, end_date = dates
+
+    days_requested, error = validate_vacation_dates(start_date, end_date, available, holidays)
+    if end_date >= start_date:
+        print(f"Days requested (excluding Sundays and holidays): {days_requested}")
+    if error is not None:
+        print(error)
+        if days_requested > available:
+            earliest = earliest_available_date(employee, days_requested, vacations, today)
+            if earliest is not None:
+                print(f"{days_requested} days will be available on {earliest.strftime(DATE_FORMAT)}.")
         return
 
-    days_requested = count_days_excluding_sundays(start_date, end_date)
-    print(f"Days requested (excluding Sundays): {days_requested}")
-
-    if days_requested <= 0:
-        print("Requested days must be greater than 0.")
+    overlaps = vacations.overlapping(employee.employee_id, start_date, end_date)
+    if overlaps:
+        other = overlaps[0]
+        print(f"This request overlaps an existing {other.status.value} request "
+              f"({other.start_date} to {other.end_date}).")
         return
 
-    if days_requested > available:
-        print("Requested days exceed the available vacation balance.")
-        return
+    absences = department_peak_absences(employee, vacations, start_date, end_date)
+    if absences > MAX_CONCURRENT_ABSENCES:
+        print(f"Warning: {absences} employees from {employee.department} would be on "
+              f"vacation at the same time (limit: {MAX_CONCURRENT_ABSENCES}).")
+
+    record = VacationRequest(
+        employee.employee_id,
+        employee.full_name,
+        start_date,
+        end_date,
+        float(days_requested),
+        Status.PENDING,
+    )
+
+    with transaction(journal):
+        # otro operador pudo registrar una solicitud que se cruza mientras
+        # se ingresaban los datos
+        overlaps = vacations.overlapping(employee.employee_id, start_date, end_date)
+        if overlaps:
+            other = overlaps[0]
+            print(f"Another operator registered an overlapping {other.status.value} request "
+                  f"({other.start_date} to {other.end_date}) in the meantime.")
+            return
+        # primero el journal: si no se puede escribir no se agrega
+        if journal is not None and not journal.append("add_vacation", record=record.to_row()):
+            print("The vacation request could not be saved.")
+            return
+        if vacations.append(record) is None:
+            print("An active request for the same dates already exists. Nothing was saved.")
+            return
+    print("Vacation request created successfully with status PENDING.")
+
 
-    record = {
-        'employee_id': employee['employee_id'],
-        'full_name': employee['full_name'],
-        'vacations_start_date': start_date.strftime(DATE_FORMAT),
-        'vacations_end_date': end_date.strftime(DATE_FORMAT),
-        'total_days_taken': float(days_requested),
-        'approval_status': "PENDING",
-        'month': start_date.month,
-        'year': start_date.year,
+def status_entry(vacation, previous_status, new_status=None):
+    """
+    Campos de la entrada set_status del journal para una solicitud que
+    pasa de previous_status a new_status (por defecto, su estado actual:
+    para escribir la entrada antes de aplicar el cambio, pasar new_status).
+    """
+    row = vacation.to_row()
+    return {
+        'employee_id': row['employee_id'],
+        'vacations_start_date': row['vacations_start_date'],
+        'vacations_end_date': row['vacations_end_date'],
+        'approval_status': (new_status or vacation.status).value,
+        'previous_status': previous_status.value,
     }
 
-    vacations.append(record)
-    print("Vacation request created successfully with status PENDING.")
 
+REQUEST_SORTS = {
+    'id': None,
+    'date': lambda v: (v.start_date, v.end_date),
+    'name': lambda v: v.full_name.lower(),
+}
+
+
+def select_requests(vacations, employees, status=None, department=None,
+                    start_date=None, end_date=None):
+    """
+    Solicitudes que cumplen los filtros partiendo del índice más
+    chico disponible, sin recorrer todas las solicitudes:
+    - departamento + rango completo, estado activo: intervalos del departamento
+    - departamento: solicitudes de cada empleado del departamento
+    - estado: índice por estado
+    El rango de fechas deja las solicitudes que tocan algún día del rango.
+    """
+    active = status is Status.PENDING or status is Status.APPROVED
+    if department is not None and start_date and end_date and active:
+        candidates = vacations.department_overlapping(department, start_date, end_date)
+    elif department is not None:
+        candidates = (v for e in employees.in_department(department)
+                      for v in vacations.for_employee(e.employee_id))
+    elif status is not None:
+        candidates = vacations.with_status(status)
+    else:
+        candidates = vacations
+    return filter_requests(candidates, status, start_date, end_date)
 
-def list_pending_requests(vacations):
-    pending = [v for v in vacations if v['approval_status'].upper() == "PENDING"]
+
+def filter_requests(requests, status=None, start_date=None, end_date=None):
+    for v in requests:
+        if status is not None and v.status is not status:
+            continue
+        if start_date is not None and v.end_date < start_date:
+            continue
+        if end_date is not None and v.start_date > end_date:
+            continue
+        yield v
+
+
+def sort_requests(requests, sort):
+    key = REQUEST_SORTS.get(sort)
+    return iter(requests) if key is None else lazy_sorted(requests, key)
+
+
+def list_pending_requests(vacations, employees, page_size=PAGE_SIZE):
+    """
+    Muestra las solicitudes pendientes paginadas (filtros opcionales por
+    departamento y fechas) y retorna las que se llegaron a mostrar, en el
+    orden de su número en pantalla.
+    """
+    pending = vacations.with_status(Status.PENDING)
     if not pending:
         print("\nNo pending vacation requests.\n")
         return []
 
-    print("\nPending vacation requests:")
-    print("-" * 90)
-    for idx, v in enumerate(pending, start=1):
-        print(f"{idx}. {v['employee_id']} - {v['full_name']} | "
-              f"{v['vacations_start_date']} to {v['vacations_end_date']} | "
-              f"Days: {v['total_days_taken']}")
-    print("-" * 90)
-    return pending
+    filters = read_filters(("dept", "from", "to", "sort"), tuple(REQUEST_SORTS))
+    if filters is None:
+        return []
+    if filters.get("dept") is not None:
+        pending = select_requests(vacations, employees, Status.PENDING, filters["dept"],
+                                  filters.get("from"), filters.get("to"))
+    else:
+        pending = filter_requests(pending, None, filters.get("from"), filters.get("to"))
+
+    shown = []
+
+    def lines():
+        for idx, v in enumerate(sort_requests(pending, filters.get("sort")), start=1):
+            shown.append(v)
+            yield (f"{idx}. {v.employee_id} - {v.full_name} | "
+                   f"{v.start_date} to {v.end_date} | "
+                   f"Days: {v.total_days_taken}")
+
+    count = paginate(lines(), "Pending vacation requests", "#. Employee | Dates | Days",
+                     90, page_size)
+    if count == 0:
+        print("No pending requests match the filter.")
+    # paginate lee una fila de más para saber si hay otra página
+    return shown[:count]
 
 
-def approve_or_reject_request(vacations):
-    pending = list_pending_requests(vacations)
+@instrumented()
+def approve_or_reject_request(vacations, journal=None, employees=None):
+    pending = list_pending_requests(vacations, employees)
     if not pending:
         return
 
@@ -263,47 +664,56 @@ def approve_or_reject_request(vacations):
     decision = input("Choose an option: ").strip()
 
     if decision == "1":
-        new_status = "APPROVED"
+        new_status = Status.APPROVED
     elif decision == "2":
-        new_status = "REJECTED"
+        new_status = Status.REJECTED
     else:
         print("Invalid option.")
         return
 
-    # actualizar en la lista original de vacations
-    for v in vacations:
-        if (v['employee_id'] == selected['employee_id'] and
-                v['vacations_start_date'] == selected['vacations_start_date'] and
-                v['vacations_end_date'] == selected['vacations_end_date'] and
-                v['approval_status'].upper() == "PENDING"):
-            v['approval_status'] = new_status
-            break
+    with transaction(journal):
+        # selected es el mismo registro del repositorio: tras sincronizar
+        # refleja lo que hayan hecho otros operadores
+        if selected.status is not Status.PENDING:
+            print(f"This request was already set to {selected.status.value} by another operator.")
+            return
+        if journal is not None and not journal.append(
+                "set_status", **status_entry(selected, Status.PENDING, new_status)):
+            print("The change could not be saved; the request is still PENDING.")
+            return
+        if not vacations.update_status(selected, new_status):
+            print("This request was changed by another operator; nothing was updated.")
+            return
 
-    print(f"Request updated to {new_status}.")
+    print(f"Request updated to {new_status.value}.")
 
 
-def show_employee_history(vacations, employees):
+def show_employee_history(vacations, employees, page_size=PAGE_SIZE):
     employee_id = input("Enter Employee ID to view vacation history: ").strip()
-    employee = None
-    for e in employees:
-        if e['employee_id'] == employee_id:
-            employee = e
-            break
+    employee = employees.get(employee_id)
 
     if employee is None:
         print("Employee not found.")
         return
 
-    history = [v for v in vacations if v['employee_id'] == employee_id]
+    history = vacations.for_employee(employee_id)
     if not history:
         print("No vacation requests found for this employee.")
         return
 
-    print(f"\nVacation history for {employee['full_name']} (ID: {employee_id})")
-    print("-" * 100)
-    for v in history:
-        print(f"{v['vacations_start_date']} to {v['vacations_end_date']} | "
-              f"Days: {v['total_days_taken']} | "
-              f"Status: {v['approval_status']} | "
-              f"Month/Year: {v['month']}/{v['year']}")
-    print("-" * 100)
+    filters = read_filters(("status", "from", "to", "sort"), tuple(REQUEST_SORTS))
+    if filters is None:
+        return
+
+    selected = filter_requests(history, filters.get("status"),
+                               filters.get("from"), filters.get("to"))
+    lines = (
+        f"{v.start_date} to {v.end_date} | "
+        f"Days: {v.total_days_taken} | "
+        f"Status: {v.status.value} | "
+        f"Month/Year: {v.month}/{v.year}"
+        for v in sort_requests(selected, filters.get("sort"))
+    )
+    title = f"Vacation history for {employee.full_name} (ID: {employee_id})"
+    if paginate(lines, title, "Dates | Days | Status | Month/Year", 100, page_size) == 0:
+        print("No requests match the filter.")
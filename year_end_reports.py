@@ -0,0 +1,218 @@
+# year_end_reports.py
+"""
+Cierre de año: un CSV de vacaciones aprobadas por mes y departamento,
+escritos en paralelo, más un manifest.csv con el detalle de cada archivo.
+
+    python year_end_reports.py 2026 [--workers 4] [--executor thread]
+"""
+import argparse
+import csv
+import hashlib
+import io
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+
+from records import DATE_FORMAT
+from reports import REPORT_HEADER, iter_approved_segments
+from storage import STORAGE_BACKENDS, open_storage
+from vacations import load_holidays
+
+# None: un worker por CPU
+YEAR_END_WORKERS = None
+YEAR_END_EXECUTORS = ("process", "thread")
+
+MANIFEST_FILE = "manifest.csv"
+MANIFEST_HEADER = [
+    'year',
+    'month',
+    'department',
+    'file',
+    'rows',
+    'total_days',
+    'sha256',
+]
+
+NO_DEPARTMENT = "sin_departamento"
+
+
+def year_end_directory(year):
+    return f"cierre_vacaciones_{year}"
+
+
+def department_slug(department):
+    slug = re.sub(r"[^0-9A-Za-z]+", "_", department.strip()).strip("_").lower()
+    return slug or NO_DEPARTMENT
+
+
+def partition_year(vacations, employees, year, holidays=None):
+    """
+    Una pasada sobre las APROBADAS del año: agrupa las filas del reporte
+    por (month, department). Las solicitudes que cruzan de mes se reparten
+    igual que en reports.export_approved_reports.
+    Retorna {(month, department): [fila, ...]} con filas ordenadas por
+    fecha de inicio y employee_id.
+    """
+    partitions = {}
+    approved = vacations.approved_in_range(date(year, 1, 1), date(year, 12, 31))
+    for seg_year, month, v, days in iter_approved_segments(approved, holidays):
+        if seg_year != year:
+            continue
+        emp = employees.get(v.employee_id)
+        department = emp.department if emp else ""
+        partitions.setdefault((month, department), []).append([
+            v.employee_id,
+            v.full_name,
+            emp.position if emp else "",
+            department,
+            v.start_date.strftime(DATE_FORMAT),
+            v.end_date.strftime(DATE_FORMAT),
+            days,
+            month,
+            year,
+        ])
+    for rows in partitions.values():
+        rows.sort(key=lambda row: (row[4], row[0], row[5]))
+    return partitions
+
+
+def write_partition(path, rows):
+    """
+    Escribe un archivo del cierre (corre dentro del pool).
+    Retorna (filas, días totales, sha256 del contenido).
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(REPORT_HEADER)
+    writer.writerows(rows)
+    data = buffer.getvalue().encode("utf-8")
+    with open(path, "wb") as file:
+        file.write(data)
+    total_days = sum(row[6] for row in rows)
+    return len(rows), total_days, hashlib.sha256(data).hexdigest()
+
+
+def _partition_files(partitions, year):
+    """
+    Nombre de archivo para cada partición, en orden (mes, departamento).
+    Dos departamentos con el mismo slug reciben un sufijo numérico.
+    """
+    files = []
+    used = set()
+    for month, department in sorted(partitions):
+        base = f"reporte_vacaciones_{year}_{month:02}_{department_slug(department)}"
+        name = f"{base}.csv"
+        suffix = 2
+        while name in used:
+            name = f"{base}_{suffix}.csv"
+            suffix += 1
+        used.add(name)
+        files.append((month, department, name))
+    return files
+
+
+def export_year_end_reports(vacations, employees, year, holidays=None,
+                            workers=YEAR_END_WORKERS, executor="process"):
+    """
+    Genera el cierre del año en year_end_directory(year) repartiendo la
+    escritura de los archivos en un pool (procesos o hilos).
+    El manifest queda ordenado por mes y departamento, así que es el mismo
+    sin importar el orden en que terminen los workers.
+    Retorna la ruta del manifest o None si no hay aprobadas en el año.
+    """
+    if executor not in YEAR_END_EXECUTORS:
+        raise ValueError(f"Unknown executor: {executor}. Expected one of {YEAR_END_EXECUTORS}")
+
+    partitions = partition_year(vacations, employees, year, holidays)
+    if not partitions:
+        return None
+
+    directory = year_end_directory(year)
+    os.makedirs(directory, exist_ok=True)
+    files = _partition_files(partitions, year)
+    paths = [os.path.join(directory, name) for _, _, name in files]
+    row_groups = [partitions[(month, department)] for month, department, _ in files]
+
+    pool_class = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    with pool_class(max_workers=workers) as pool:
+        results = list(pool.map(write_partition, paths, row_groups))
+
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    with open(manifest_path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(MANIFEST_HEADER)
+        for (month, department, name), (rows, total_days, digest) in zip(files, results):
+            writer.writerow([year, month, department, name, rows, total_days, digest])
+    return manifest_path
+
+
+def export_year_end_report(vacations, employees, holidays=None):
+    """
+    Opción del menú de reportes: pide el año y genera el cierre.
+    """
+    try:
+        year = int(input("Enter year for the year-end closing (e.g. 2025): ").strip())
+    except ValueError:
+        print("Invalid year.")
+        return
+
+    try:
+        manifest_path = export_year_end_reports(vacations, employees, year, holidays)
+    except Exception as e:
+        print(f"Error while generating report: {e}")
+        return
+
+    if manifest_path is None:
+        print("No approved vacations found for that year.")
+        return
+    print(f"Year-end reports generated in: {os.path.dirname(manifest_path)}")
+    print(f"Manifest: {manifest_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write the approved-vacations reports for every month and department of a year."
+    )
+    parser.add_argument("year", type=int)
+    parser.add_argument("--workers", type=int, default=YEAR_END_WORKERS,
+                        help="pool size (default: one per CPU)")
+    parser.add_argument("--executor", choices=YEAR_END_EXECUTORS, default="process")
+    parser.add_argument("--backend", choices=STORAGE_BACKENDS, default="csv")
+    parser.add_argument("--db", default="vacations.db", help="SQLite database file")
+    parser.add_argument("--users", default="users.csv")
+    parser.add_argument("--employees", default="employees.csv")
+    parser.add_argument("--vacations", default="vacations.csv")
+    parser.add_argument("--holidays", default="holidays.csv")
+    parser.add_argument("--journal", default="journal.jsonl")
+    parser.add_argument("--snapshot", default="data.snapshot")
+    args = parser.parse_args()
+
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    storage = open_storage(
+        args.backend,
+        args.users,
+        args.employees,
+        args.vacations,
+        args.db,
+        journal_path=args.journal,
+        snapshot_path=args.snapshot,
+    )
+    try:
+        _, employees, vacations = storage.load()
+        holidays = load_holidays(args.holidays)
+        manifest_path = export_year_end_reports(vacations, employees, args.year, holidays,
+                                                args.workers, args.executor)
+    finally:
+        storage.close()
+
+    if manifest_path is None:
+        print("No approved vacations found for that year.")
+    else:
+        print(f"Manifest: {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()